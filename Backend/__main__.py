@@ -9,7 +9,8 @@ from Backend.logger import LOGGER
 from Backend.fastapi import server
 from Backend.helper.pyro import restart_notification, setup_bot_commands
 from Backend.pyrofork.bot import Helper, StreamBot
-from Backend.pyrofork.clients import initialize_clients
+from Backend.pyrofork.clients import initialize_clients, monitor_clients
+from Backend.helper.link_checker import link_check_loop
 
 loop = get_event_loop()
 
@@ -42,6 +43,9 @@ async def start_services():
         await restart_notification()
         loop.create_task(server.serve())
         loop.create_task(ping())
+        loop.create_task(monitor_clients())
+        loop.create_task(link_check_loop())
+        loop.create_task(db.counter_reconcile_loop())
         
         LOGGER.info("Telegram-Stremio Started Successfully!")
         await idle()
@@ -16,6 +16,8 @@ class Telegram:
     DATABASE = [db.strip() for db in (getenv("DATABASE") or "").split(",") if db.strip()]
 
     TMDB_API = getenv("TMDB_API", "")
+    TMDB_RATE_LIMIT = float(getenv("TMDB_RATE_LIMIT", "30"))
+    CINEMETA_RATE_LIMIT = float(getenv("CINEMETA_RATE_LIMIT", "10"))
 
     UPSTREAM_REPO = getenv("UPSTREAM_REPO", "")
     UPSTREAM_BRANCH = getenv("UPSTREAM_BRANCH", "")
@@ -23,6 +25,19 @@ class Telegram:
     OWNER_ID = int(getenv("OWNER_ID", "5422223708"))
     REPLACE_MODE = getenv("REPLACE_MODE", "true").lower() == "true"
 
+    HEALTH_CHECK_INTERVAL = int(getenv("HEALTH_CHECK_INTERVAL", "60"))
+    HEALTH_MAX_FAILURES = int(getenv("HEALTH_MAX_FAILURES", "3"))
+
+    TG_RATE_LIMIT = float(getenv("TG_RATE_LIMIT", "20"))
+    TG_MAX_FLOOD_WAIT = int(getenv("TG_MAX_FLOOD_WAIT", "60"))
+
+    LINK_CHECK_INTERVAL = int(getenv("LINK_CHECK_INTERVAL", "24"))
+    LINK_CHECK_AUTO_REMOVE = getenv("LINK_CHECK_AUTO_REMOVE", "false").lower() == "true"
+
+    COUNTER_RECONCILE_INTERVAL = int(getenv("COUNTER_RECONCILE_INTERVAL", "6"))
+    SPLIT_EPISODES = getenv("SPLIT_EPISODES", "false").lower() == "true"
+    INGEST_WORKERS = int(getenv("INGEST_WORKERS", "4"))
+
     ADMIN_USERNAME = getenv("ADMIN_USERNAME", "fyvio")
     ADMIN_PASSWORD = getenv("ADMIN_PASSWORD", "fyvio")
     
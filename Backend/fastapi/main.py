@@ -86,9 +86,10 @@ async def list_media(
     page: int = Query(1, ge=1),
     page_size: int = Query(24, ge=1, le=100),
     search: str = Query("", max_length=100),
+    cursor: str = Query("", max_length=2000),
     _: bool = Depends(require_auth)
 ):
-    return await list_media_api(media_type, page, page_size, search)
+    return await list_media_api(media_type, page, page_size, search, cursor)
 
 @app.delete("/api/media/delete")
 async def delete_media(tmdb_id: int, db_index: int, media_type: str, _: bool = Depends(require_auth)):
@@ -118,16 +119,46 @@ async def delete_tv_season(tmdb_id: int, db_index: int, season: int, _: bool = D
 async def get_workloads(_: bool = Depends(require_auth)):
     try:
         from Backend.pyrofork.bot import work_loads
+        from Backend.pyrofork.clients import get_clients_health
         return {
             "loads": {
                 f"bot{c + 1}": l
                 for c, (_, l) in enumerate(
                     sorted(work_loads.items(), key=lambda x: x[1], reverse=True)
                 )
-            } if work_loads else {}
+            } if work_loads else {},
+            "health": get_clients_health()
         }
     except Exception as e:
-        return {"loads": {}}
+        return {"loads": {}, "health": []}
+
+@app.get("/api/system/indexes")
+async def get_indexes(_: bool = Depends(require_auth)):
+    from Backend import db
+    try:
+        return {"indexes": await db.index_report()}
+    except Exception as e:
+        return {"indexes": [], "error": str(e)}
+
+@app.get("/api/system/cache")
+async def get_cache_stats(_: bool = Depends(require_auth)):
+    from Backend.helper.cache import cache_stats
+    return {"caches": cache_stats()}
+
+@app.get("/api/system/providers")
+async def get_provider_stats(_: bool = Depends(require_auth)):
+    from Backend.helper.providers import provider_stats
+    return {"providers": provider_stats()}
+
+@app.get("/api/system/translation")
+async def get_translation_stats(_: bool = Depends(require_auth)):
+    from Backend.helper.translation import translator
+    return translator.stats()
+
+@app.get("/api/system/ingest")
+async def get_ingest_stats(_: bool = Depends(require_auth)):
+    from Backend.helper.ingest import pipeline_stats
+    return {"stages": pipeline_stats()}
 
 @app.exception_handler(401)
 async def auth_exception_handler(request: Request, exc):
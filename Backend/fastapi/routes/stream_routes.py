@@ -8,10 +8,11 @@ from fastapi.responses import StreamingResponse
 from Backend.helper.encrypt import decode_string
 from Backend.helper.exceptions import InvalidHash
 from Backend.helper.custom_dl import ByteStreamer
-from Backend.pyrofork.bot import StreamBot, work_loads, multi_clients
+from Backend.helper.rate_limiter import tg_call
+from Backend.pyrofork.bot import class_cache
+from Backend.pyrofork.clients import select_client
 
 router = APIRouter(tags=["Streaming"])
-class_cache = {}
 
 
 def parse_range_header(range_header: str, file_size: int) -> Tuple[int, int]:
@@ -43,7 +44,8 @@ async def stream_handler(request: Request, id: str, name: str):
         raise HTTPException(status_code=400, detail="Missing id")
 
     chat_id = f"-100{decoded_data['chat_id']}"
-    message = await StreamBot.get_messages(int(chat_id), int(decoded_data["msg_id"]))
+    _, client = select_client()
+    message = await tg_call(client, client.get_messages, int(chat_id), int(decoded_data["msg_id"]))
     file = message.video or message.document
     file_hash = file.file_unique_id[:6]
 
@@ -62,8 +64,7 @@ async def media_streamer(
     secure_hash: str,
 ) -> StreamingResponse:
     range_header = request.headers.get("Range", "")
-    index = min(work_loads, key=work_loads.get)
-    faster_client = multi_clients[index]
+    index, faster_client = select_client()
 
     tg_connect = class_cache.get(faster_client)
     if not tg_connect:
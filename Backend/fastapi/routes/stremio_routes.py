@@ -1,4 +1,6 @@
 from fastapi import APIRouter, HTTPException
+from collections import OrderedDict
+from time import time
 from typing import Optional
 from urllib.parse import unquote
 from Backend.config import Telegram
@@ -14,6 +16,11 @@ ADDON_NAME = "Vps"
 ADDON_VERSION = __version__
 PAGE_SIZE = 15
 
+# Stremio pages with `skip`, remember the continuation token that serves each next skip.
+CURSOR_CACHE_SIZE = 2000
+CURSOR_TTL = 600
+catalog_cursors = OrderedDict()
+
 router = APIRouter(prefix="/stremio", tags=["Stremio Addon"])
 
 # --- Genres ---
@@ -29,6 +36,23 @@ GENRES = [
 
 
 # --- Helper Functions ---
+def get_catalog_cursor(key: tuple) -> Optional[str]:
+    entry = catalog_cursors.get(key)
+    if not entry or entry[1] < time():
+        catalog_cursors.pop(key, None)
+        return None
+    return entry[0]
+
+
+def set_catalog_cursor(key: tuple, cursor: Optional[str]):
+    if not cursor:
+        return
+    catalog_cursors[key] = (cursor, time() + CURSOR_TTL)
+    catalog_cursors.move_to_end(key)
+    while len(catalog_cursors) > CURSOR_CACHE_SIZE:
+        catalog_cursors.popitem(last=False)
+
+
 def convert_to_stremio_meta(item: dict) -> dict:
     media_type = "series" if item.get("media_type") == "tv" else "movie"
     stremio_id = f"{item.get('tmdb_id')}-{item.get('db_index')}"
@@ -224,12 +248,12 @@ async def get_catalog(media_type: str, id: str, extra: Optional[str] = None):
             else:
                 sort_params = [("updated_on", "desc")]
 
-            if media_type == "movie":
-                data = await db.sort_movies(sort_params, page, PAGE_SIZE, genre_filter=genre_filter)
-                items = data.get("movies", [])
-            else:
-                data = await db.sort_tv_shows(sort_params, page, PAGE_SIZE, genre_filter=genre_filter)
-                items = data.get("tv_shows", [])
+            # A cached token only serves the skip it was issued for, anything else pages by skip.
+            cursor = get_catalog_cursor((media_type, id, genre_filter, stremio_skip))
+            sort = db.sort_movies if media_type == "movie" else db.sort_tv_shows
+            data = await sort(sort_params, page, PAGE_SIZE, genre_filter=genre_filter, cursor=cursor)
+            items = data.get("movies" if media_type == "movie" else "tv_shows", [])
+            set_catalog_cursor((media_type, id, genre_filter, stremio_skip + len(items)), data.get("next_cursor"))
     except Exception:
         return {"metas": []}
 
@@ -246,7 +270,7 @@ async def get_meta(media_type: str, id: str):
     except (ValueError, IndexError):
         raise HTTPException(status_code=400, detail="Invalid Stremio ID format")
 
-    media = await db.get_media_details(tmdb_id=tmdb_id, db_index=db_index)
+    media = await db.get_media_details(tmdb_id=tmdb_id, db_index=db_index, include_files=False)
     if not media:
         return {"meta": {}}
 
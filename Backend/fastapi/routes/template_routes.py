@@ -5,6 +5,7 @@ from Backend.fastapi.security.credentials import verify_credentials, require_aut
 from Backend.fastapi.themes import get_theme, get_all_themes
 from Backend import db
 from Backend.pyrofork.bot import work_loads, multi_clients, StreamBot
+from Backend.pyrofork.clients import get_clients_health, is_healthy
 from Backend.helper.pyro import get_readable_time
 from Backend import StartTime, __version__
 from time import time
@@ -66,6 +67,8 @@ async def dashboard_page(request: Request, _: bool = Depends(require_auth)):
             "uptime": get_readable_time(time() - StartTime),
             "telegram_bot": f"@{StreamBot.username}" if StreamBot and StreamBot.username else "@StreamBot",
             "connected_bots": len(multi_clients),
+            "healthy_bots": sum(1 for i in multi_clients if is_healthy(i)),
+            "bot_health": get_clients_health(),
             "loads": {
                 f"bot{c + 1}": l
                 for c, (_, l) in enumerate(
@@ -87,6 +90,8 @@ async def dashboard_page(request: Request, _: bool = Depends(require_auth)):
             "uptime": "N/A",
             "telegram_bot": "@StreamBot",
             "connected_bots": 0,
+            "healthy_bots": 0,
+            "bot_health": [],
             "loads": {},
             "version": "1.0.0",
             "movies": 0,
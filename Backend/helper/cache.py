@@ -0,0 +1,136 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from hashlib import sha1
+from threading import Lock
+from time import time
+from typing import Any, Dict, Hashable, List
+
+from Backend.logger import LOGGER
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Returned by get() on a miss, None is a valid (negative) cached value.
+MISS = object()
+
+caches: Dict[str, "Cache"] = {}
+
+
+class Cache:
+    """
+    Bounded LRU in memory, optionally backed by the tracking DB's `cache` collection so
+    entries survive restarts. None values are negative results and expire after
+    `negative_ttl`. Persisted values have to be BSON-serializable.
+    """
+
+    def __init__(self, namespace: str, ttl: int, negative_ttl: int = HOUR,
+                 max_size: int = 5000, persistent: bool = True):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self.persistent = persistent
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # The memory tier may be touched from worker threads, keep it consistent.
+        self._lock = Lock()
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        caches[namespace] = self
+
+    def _store_id(self, key: Hashable) -> str:
+        return f"{self.namespace}:{sha1(repr(key).encode()).hexdigest()}"
+
+    def get_memory(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            value, expires_at = entry
+            if expires_at < time():
+                del self._entries[key]
+                return MISS
+            self._entries.move_to_end(key)
+            return value
+
+    def set_memory(self, key: Hashable, value: Any, ttl: int = None):
+        if ttl is None:
+            ttl = self.negative_ttl if value is None else self.ttl
+        with self._lock:
+            self._entries[key] = (value, time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _count(self, value: Any, tier: str) -> Any:
+        if value is MISS:
+            self.misses += 1
+        elif tier == "memory":
+            self.memory_hits += 1
+        else:
+            self.store_hits += 1
+        if value is None:
+            self.negative_hits += 1
+        return value
+
+    def peek(self, key: Hashable) -> Any:
+        # Memory tier only, for callers that can't await.
+        return self._count(self.get_memory(key), "memory")
+
+    async def get(self, key: Hashable) -> Any:
+        value = self.get_memory(key)
+        if value is not MISS or not self.persistent:
+            return self._count(value, "memory")
+
+        from Backend import db
+        try:
+            doc = await db.dbs["tracking"]["cache"].find_one({"_id": self._store_id(key)})
+        except Exception as e:
+            LOGGER.debug(f"Cache read of {self.namespace} failed: {e}")
+            doc = None
+        if not doc or doc["expires_at"] < datetime.utcnow():
+            return self._count(MISS, "store")
+
+        # Keep the remaining lifetime when promoting to memory.
+        remaining = (doc["expires_at"] - datetime.utcnow()).total_seconds()
+        self.set_memory(key, doc["value"], ttl=int(remaining))
+        return self._count(doc["value"], "store")
+
+    async def set(self, key: Hashable, value: Any):
+        self.set_memory(key, value)
+        if not self.persistent:
+            return
+
+        from Backend import db
+        ttl = self.negative_ttl if value is None else self.ttl
+        try:
+            await db.dbs["tracking"]["cache"].update_one(
+                {"_id": self._store_id(key)},
+                {"$set": {
+                    "namespace": self.namespace,
+                    "value": value,
+                    "expires_at": datetime.utcnow() + timedelta(seconds=ttl)
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            LOGGER.debug(f"Cache write of {self.namespace} failed: {e}")
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.store_hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "persistent": self.persistent,
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.store_hits) / lookups, 3) if lookups else 0,
+        }
+
+
+def cache_stats() -> List[dict]:
+    return [cache.stats() for cache in caches.values()]
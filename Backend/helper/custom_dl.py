@@ -7,6 +7,7 @@ from typing import Dict, Union
 from Backend.logger import LOGGER
 from Backend.helper.exceptions import FIleNotFound
 from Backend.helper.pyro import get_file_ids
+from Backend.helper.rate_limiter import tg_call
 from Backend.pyrofork.bot import work_loads
 from pyrogram import Client, utils, raw
 
@@ -16,7 +17,7 @@ class ByteStreamer:
         self.clean_timer = 30 * 60
         self.client: Client = client
         self.__cached_file_ids: Dict[int, FileId] = {}
-        asyncio.create_task(self.clean_cache())
+        self.clean_task = asyncio.create_task(self.clean_cache())
 
     async def get_file_properties(self, chat_id: int, message_id: int) -> FileId:
         if message_id not in self.__cached_file_ids:
@@ -80,7 +81,7 @@ class ByteStreamer:
                 )
                 await media_session.start()
                 for _ in range(6):
-                    exported_auth = await client.invoke(raw.functions.auth.ExportAuthorization(dc_id=file_id.dc_id))
+                    exported_auth = await tg_call(client, client.invoke, raw.functions.auth.ExportAuthorization(dc_id=file_id.dc_id))
                     try:
                         
                         await media_session.send(raw.functions.auth.ImportAuthorization(id=exported_auth.id, bytes=exported_auth.bytes))
@@ -139,6 +140,17 @@ class ByteStreamer:
                                                            thumb_size=file_id.thumbnail_size)
         return location
 
+    async def close(self) -> None:
+        # The client was replaced, drop everything tied to it.
+        self.clean_task.cancel()
+        self.__cached_file_ids.clear()
+        for media_session in list(self.client.media_sessions.values()):
+            try:
+                await media_session.stop()
+            except Exception as e:
+                LOGGER.debug(f"Stopping media session failed: {e}")
+        self.client.media_sessions.clear()
+
     async def clean_cache(self) -> None:
         while True:
             await asyncio.sleep(self.clean_timer)
@@ -1,9 +1,12 @@
-from asyncio import create_task
-from bson import ObjectId
+from asyncio import create_task, gather, sleep, wait_for
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from bson import ObjectId, json_util
+import heapq
 import motor.motor_asyncio
 from datetime import datetime
 from pydantic import ValidationError
-from pymongo import ASCENDING, DESCENDING
+from pymongo import ASCENDING, DESCENDING, InsertOne, ReplaceOne, ReturnDocument, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from typing import Dict, List, Optional, Tuple, Any
 
 from Backend.logger import LOGGER
@@ -14,6 +17,121 @@ from Backend.helper.modal import Episode, MovieSchema, QualityDetail, Season, TV
 from Backend.helper.task_manager import delete_message
 
 
+# Per-shard budget for fan-out queries, a slow shard is dropped instead of stalling the response.
+SHARD_TIMEOUT = 10
+
+# Indexes every storage DB must have, as (keys, name) per collection.
+INDEX_MANIFEST: Dict[str, List[Tuple[List[Tuple[str, int]], str]]] = {
+    collection: [
+        ([("imdb_id", ASCENDING)], "imdb_id"),
+        ([("tmdb_id", ASCENDING)], "tmdb_id"),
+        ([("title", ASCENDING), ("release_year", ASCENDING)], "title_year"),
+        # Catalog pages sort on (field, _id), the trailing _id lets the index provide that order.
+        ([("updated_on", DESCENDING), ("_id", DESCENDING)], "updated_on_id"),
+        ([("rating", DESCENDING), ("_id", DESCENDING)], "rating_id"),
+        ([("genres", ASCENDING), ("updated_on", DESCENDING), ("_id", DESCENDING)], "genres_updated_on_id"),
+        ([("genres", ASCENDING), ("rating", DESCENDING), ("_id", DESCENDING)], "genres_rating_id"),
+    ]
+    for collection in ("movie", "tv")
+}
+INDEX_MANIFEST["episodes"] = [
+    ([("show_id", ASCENDING), ("season_number", ASCENDING), ("episode_number", ASCENDING)], "show_episode"),
+    ([("telegram.id", ASCENDING)], "telegram_id"),
+]
+UNIQUE_INDEXES = {"show_episode"}
+# Superseded by the *_id sort indexes above, dropped wherever they still exist.
+RETIRED_INDEXES = {"updated_on", "rating", "genres_updated_on", "genres_rating"}
+
+
+# Just enough of a TV document to decide where an episode file goes, without its metadata.
+TV_OUTLINE_PROJECTION = {
+    "imdb_id": 1, "tmdb_id": 1, "title": 1, "release_year": 1,
+    "seasons.season_number": 1,
+    "seasons.episodes.episode_number": 1,
+    "seasons.episodes.telegram.id": 1,
+    "seasons.episodes.telegram.quality": 1,
+    "episodes_split": 1,
+}
+
+# Fields the location index and genre counters are derived from.
+METADATA_INDEX_PROJECTION = {"imdb_id": 1, "tmdb_id": 1, "title": 1, "release_year": 1, "genres": 1}
+
+# Mongo's cross-type sort order, so shard results merge exactly as one collection would sort.
+# bool is checked before int since it subclasses it.
+BSON_TYPE_RANK = (
+    (type(None), 1),
+    (bool, 8),
+    ((int, float), 2),
+    (str, 3),
+    (dict, 4),
+    (list, 5),
+    (bytes, 6),
+    (ObjectId, 7),
+    (datetime, 9),
+)
+
+# $type aliases per rank, used to continue a keyset scan across a type boundary.
+BSON_TYPE_ALIASES = {
+    2: ["double", "int", "long", "decimal"],
+    3: ["string"],
+    4: ["object"],
+    5: ["array"],
+    6: ["binData"],
+    7: ["objectId"],
+    8: ["bool"],
+    9: ["date"],
+}
+
+
+def bson_rank(value: Any) -> int:
+    return next((rank for types, rank in BSON_TYPE_RANK if isinstance(value, types)), 10)
+
+
+def sort_key(document: Dict[str, Any], field: str) -> Tuple[int, Any, Any]:
+    value = document.get(field)
+    rank = bson_rank(value)
+    if rank in (4, 5, 10):
+        value = str(value)
+    return rank, value, document["_id"]
+
+
+def keyset_filter(field: str, direction: int, value: Any, last_id: ObjectId) -> dict:
+    """
+    Match the documents that sort after (value, last_id) for `direction`, the same order
+    `sort([(field, direction), ("_id", direction)])` returns them in.
+    """
+    op = "$lt" if direction == DESCENDING else "$gt"
+    rank = bson_rank(value)
+    clauses = [{field: value, "_id": {op: last_id}}]
+    if value is not None:
+        clauses.append({field: {op: value}})
+
+    # Range operators never cross BSON types, later types have to be matched explicitly.
+    later = [r for r in BSON_TYPE_ALIASES if (r < rank if direction == DESCENDING else r > rank)]
+    if later:
+        clauses.append({field: {"$type": [alias for r in later for alias in BSON_TYPE_ALIASES[r]]}})
+    if direction == DESCENDING and value is not None:
+        # null and missing sort lowest of all.
+        clauses.append({field: None})
+    return {"$or": clauses}
+
+
+def encode_cursor(field: str, direction: int, positions: Dict[int, Tuple[Any, ObjectId]]) -> str:
+    payload = {"f": field, "d": direction, "p": {str(i): list(pos) for i, pos in positions.items()}}
+    return urlsafe_b64encode(json_util.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str, field: str, direction: int) -> Dict[int, Tuple[Any, ObjectId]]:
+    try:
+        payload = json_util.loads(urlsafe_b64decode(cursor.encode()))
+        positions = {int(i): (pos[0], pos[1]) for i, pos in payload["p"].items()}
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if payload.get("f") != field or payload.get("d") != direction:
+        raise ValueError("Cursor does not belong to this sort order")
+    return positions
+
+
 def convert_objectid_to_str(document: Dict[str, Any]) -> Dict[str, Any]:
     for key, value in document.items():
         if isinstance(value, ObjectId):
@@ -37,6 +155,10 @@ class Database:
         self.dbs: Dict[str, motor.motor_asyncio.AsyncIOMotorDatabase] = {}
 
         self.current_db_index = 1
+        # Until the location index has been built once, a miss in it proves nothing.
+        self.locations_ready = False
+        # Same for the materialized counters, until then pages are planned with count_documents.
+        self.counters_ready = False
 
     async def connect(self):
         try:
@@ -61,6 +183,27 @@ class Database:
 
             LOGGER.info(f"Active storage DB: storage_{self.current_db_index}")
 
+            storage_keys = [key for key in self.dbs if key.startswith("storage_")]
+            await gather(*(self.ensure_indexes(key) for key in storage_keys))
+            await self.dbs["tracking"]["files"].create_index("quality_id", name="quality_id", background=True)
+            await self.dbs["tracking"]["cache"].create_index("expires_at", name="expires_at", expireAfterSeconds=0, background=True)
+            for report in await self.index_report():
+                if report["missing"] or report["unused"]:
+                    LOGGER.warning(
+                        f"Indexes on {report['db_name']}.{report['collection']} - "
+                        f"missing: {report['missing'] or '-'}, unused: {report['unused'] or '-'}"
+                    )
+
+            if (await self.get_state("locations") or {}).get("built"):
+                self.locations_ready = True
+            else:
+                create_task(self.rebuild_locations())
+
+            if (await self.get_state("counters") or {}).get("built"):
+                self.counters_ready = True
+            else:
+                create_task(self.reconcile_counters())
+
         except Exception as e:
             LOGGER.error(f"Database connection error: {e}")
 
@@ -76,10 +219,500 @@ class Database:
             upsert=True
         )
 
+    async def ensure_indexes(self, db_key: str):
+        for collection_name, indexes in INDEX_MANIFEST.items():
+            collection = self.dbs[db_key][collection_name]
+            for keys, name in indexes:
+                try:
+                    await collection.create_index(keys, name=name, background=True, unique=name in UNIQUE_INDEXES)
+                except Exception as e:
+                    LOGGER.error(f"Failed to create index {name} on {db_key}.{collection_name}: {e}")
+            try:
+                existing = await collection.index_information()
+                for name in RETIRED_INDEXES & existing.keys():
+                    await collection.drop_index(name)
+                    LOGGER.info(f"Dropped retired index {name} on {db_key}.{collection_name}")
+            except Exception as e:
+                LOGGER.error(f"Failed to drop retired indexes on {db_key}.{collection_name}: {e}")
+
+    async def index_report(self) -> List[Dict[str, Any]]:
+        """
+        Compare every storage collection against INDEX_MANIFEST. `unused` lists indexes
+        with no recorded accesses since the server last started.
+        """
+        report = []
+        for db_key in [key for key in self.dbs if key.startswith("storage_")]:
+            for collection_name, indexes in INDEX_MANIFEST.items():
+                collection = self.dbs[db_key][collection_name]
+                try:
+                    existing = await collection.index_information()
+                    usage = await collection.aggregate([{"$indexStats": {}}]).to_list(None)
+                except Exception as e:
+                    LOGGER.error(f"Failed to read indexes of {db_key}.{collection_name}: {e}")
+                    continue
+                report.append({
+                    "db_name": db_key,
+                    "collection": collection_name,
+                    "missing": [name for _, name in indexes if name not in existing],
+                    "unused": [
+                        stat["name"] for stat in usage
+                        if stat["name"] != "_id_" and not stat.get("accesses", {}).get("ops")
+                    ],
+                })
+        return report
+
+    async def get_state(self, key: str) -> Optional[dict]:
+        return await self.dbs["tracking"]["state"].find_one({"_id": key})
+
+    async def set_state(self, key: str, **fields):
+        await self.dbs["tracking"]["state"].update_one(
+            {"_id": key},
+            {"$set": fields},
+            upsert=True
+        )
+
+    async def clear_state(self, key: str):
+        await self.dbs["tracking"]["state"].delete_one({"_id": key})
+
+
+    # -------------------------------
+    # Title Location Index
+    # -------------------------------
+    def _location_lookups(
+        self, collection_name: str, imdb_id=None, tmdb_id=None, title=None, release_year=None
+    ) -> List[Tuple[str, dict]]:
+        # Same precedence as the per-shard lookups: imdb_id, then tmdb_id, then title + year.
+        lookups = []
+        if imdb_id:
+            lookups.append((f"{collection_name}:imdb:{imdb_id}", {"imdb_id": imdb_id}))
+        if tmdb_id:
+            lookups.append((f"{collection_name}:tmdb:{tmdb_id}", {"tmdb_id": tmdb_id}))
+        if title and release_year:
+            lookups.append((
+                f"{collection_name}:title:{title}:{release_year}",
+                {"title": title, "release_year": release_year}
+            ))
+        return lookups
+
+    def _document_location_keys(self, collection_name: str, document: dict) -> List[str]:
+        return [key for key, _ in self._location_lookups(
+            collection_name,
+            document.get("imdb_id"), document.get("tmdb_id"),
+            document.get("title"), document.get("release_year")
+        )]
+
+    async def set_location(self, collection_name: str, document: dict, db_index: int):
+        keys = self._document_location_keys(collection_name, document)
+        if not keys:
+            return
+        try:
+            await self.dbs["tracking"]["locations"].bulk_write([
+                UpdateOne({"_id": key}, {"$set": {"db_index": db_index}}, upsert=True)
+                for key in keys
+            ], ordered=False)
+        except Exception as e:
+            LOGGER.error(f"Failed to record location of {document.get('title')}: {e}")
+
+    async def remove_location(self, collection_name: str, document: dict, db_index: int):
+        keys = self._document_location_keys(collection_name, document)
+        if keys:
+            await self.dbs["tracking"]["locations"].delete_many({"_id": {"$in": keys}, "db_index": db_index})
+
+    async def update_metadata(
+        self, collection_name: str, db_index: int, doc_id: ObjectId, update: Dict[str, Any]
+    ) -> bool:
+        """
+        $set metadata fields of a stored document in place, keeping the location index and
+        genre counters in step when ids, title or genres change.
+        """
+        previous = await self.dbs[f"storage_{db_index}"][collection_name].find_one_and_update(
+            {"_id": doc_id},
+            {"$set": update},
+            projection=METADATA_INDEX_PROJECTION,
+            return_document=ReturnDocument.BEFORE
+        )
+        if not previous:
+            return False
+        await self._metadata_changed(collection_name, db_index, previous, update)
+        return True
+
+    async def _metadata_changed(self, collection_name: str, db_index: int, previous: dict, update: Dict[str, Any]):
+        # `previous` holds METADATA_INDEX_PROJECTION of the document before `update` was $set.
+        current = {**previous, **update}
+
+        if "genres" in update and set(previous.get("genres") or []) != set(update["genres"] or []):
+            await self.adjust_counters(collection_name, {"genres": previous.get("genres")}, db_index, -1)
+            await self.adjust_counters(collection_name, {"genres": update["genres"]}, db_index, 1)
+
+        old_keys = set(self._document_location_keys(collection_name, previous))
+        new_keys = set(self._document_location_keys(collection_name, current))
+        if old_keys - new_keys:
+            await self.dbs["tracking"]["locations"].delete_many(
+                {"_id": {"$in": list(old_keys - new_keys)}, "db_index": db_index}
+            )
+        if new_keys - old_keys:
+            await self.set_location(collection_name, current, db_index)
+
+    async def rebuild_locations(self):
+        LOGGER.info("Building title location index...")
+        locations = self.dbs["tracking"]["locations"]
+        projection = {"imdb_id": 1, "tmdb_id": 1, "title": 1, "release_year": 1}
+        try:
+            for db_index in range(1, len(self.dbs)):
+                for collection_name in ("movie", "tv"):
+                    ops = []
+                    async for doc in self.dbs[f"storage_{db_index}"][collection_name].find({}, projection):
+                        ops.extend(
+                            UpdateOne({"_id": key}, {"$set": {"db_index": db_index}}, upsert=True)
+                            for key in self._document_location_keys(collection_name, doc)
+                        )
+                        if len(ops) >= 1000:
+                            await locations.bulk_write(ops, ordered=False)
+                            ops = []
+                    if ops:
+                        await locations.bulk_write(ops, ordered=False)
+            await self.set_state("locations", built=True)
+            self.locations_ready = True
+            LOGGER.info("Title location index built")
+        except Exception as e:
+            LOGGER.error(f"Failed to build title location index: {e}")
+
+    async def _find_existing(
+        self, collection_name: str, imdb_id, tmdb_id, title, release_year, projection: Optional[dict] = None
+    ) -> Tuple[Optional[dict], Optional[int]]:
+        lookups = self._location_lookups(collection_name, imdb_id, tmdb_id, title, release_year)
+        if not lookups:
+            return None, None
+
+        if self.locations_ready:
+            found = {
+                loc["_id"]: loc["db_index"]
+                async for loc in self.dbs["tracking"]["locations"].find({"_id": {"$in": [k for k, _ in lookups]}})
+            }
+            hit = next(((key, query) for key, query in lookups if key in found), None)
+            if not hit:
+                return None, None
+            key, query = hit
+            db_index = found[key]
+            if f"storage_{db_index}" in self.dbs:
+                document = await self.dbs[f"storage_{db_index}"][collection_name].find_one(query, projection)
+                if document:
+                    return document, db_index
+            # Stale entry (document edited or removed out of band), fall back to scanning.
+            LOGGER.warning(f"Stale location entry {key}, scanning storage databases")
+            await self.dbs["tracking"]["locations"].delete_one({"_id": key})
+
+        for db_index in range(1, len(self.dbs)):
+            collection = self.dbs[f"storage_{db_index}"][collection_name]
+            for _, query in lookups:
+                document = await collection.find_one(query, projection)
+                if document:
+                    await self.set_location(collection_name, document, db_index)
+                    return document, db_index
+        return None, None
+
+
+    # -------------------------------
+    # Ingest Journal
+    # -------------------------------
+    # Files accepted by the receiver are journaled before metadata resolution and removed
+    # once stored, so anything still here after a restart was never written.
+    async def journal_file(self, channel: int, msg_id: int, title: str, size: str, default_source: Optional[str] = None):
+        await self.dbs["tracking"]["ingest_journal"].update_one(
+            {"_id": f"{channel}:{msg_id}"},
+            {"$setOnInsert": {
+                "channel": channel, "msg_id": msg_id, "title": title, "size": size,
+                "default_source": default_source, "attempts": 0, "created_on": datetime.utcnow()
+            }},
+            upsert=True
+        )
+
+    async def journal_done(self, files: List[Tuple[int, int]]):
+        if files:
+            await self.dbs["tracking"]["ingest_journal"].delete_many(
+                {"_id": {"$in": [f"{channel}:{msg_id}" for channel, msg_id in files]}}
+            )
+
+    async def pending_journal(self) -> List[dict]:
+        return await self.dbs["tracking"]["ingest_journal"].find().sort("created_on", ASCENDING).to_list(None)
+
+    async def journal_attempt(self, channel: int, msg_id: int) -> int:
+        entry = await self.dbs["tracking"]["ingest_journal"].find_one_and_update(
+            {"_id": f"{channel}:{msg_id}"},
+            {"$inc": {"attempts": 1}},
+            return_document=ReturnDocument.AFTER
+        )
+        return entry["attempts"] if entry else 0
+
+
+    # -------------------------------
+    # Received File Index
+    # -------------------------------
+    # Telegram's file_unique_id of every received file, so a repost is skipped before any
+    # metadata lookup. Entries go away with their file through forget_files.
+    async def claim_file(self, file_unique_id: str, channel: int, msg_id: int) -> bool:
+        try:
+            await self.dbs["tracking"]["files"].insert_one({
+                "_id": file_unique_id,
+                "quality_id": await encode_string({"chat_id": channel, "msg_id": msg_id}),
+                "channel": channel,
+                "msg_id": msg_id,
+                "created_on": datetime.utcnow()
+            })
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def is_claimed(self, file_unique_id: str) -> bool:
+        return await self.dbs["tracking"]["files"].find_one({"_id": file_unique_id}, {"_id": 1}) is not None
+
+    async def release_file(self, channel: int, msg_id: int):
+        await self.forget_files([await encode_string({"chat_id": channel, "msg_id": msg_id})])
+
+    async def forget_files(self, quality_ids: List[str]):
+        if quality_ids:
+            await self.dbs["tracking"]["files"].delete_many({"quality_id": {"$in": quality_ids}})
+
+
+    # -------------------------------
+    # Materialized Document Counters
+    # -------------------------------
+    # One tracking doc per (collection, shard, genre); genre "" holds the shard total.
+    async def adjust_counters(self, collection_name: str, document: dict, db_index: int, delta: int):
+        genres = {""} | set(document.get("genres") or [])
+        try:
+            await self.dbs["tracking"]["counters"].bulk_write([
+                UpdateOne(
+                    {"_id": f"{collection_name}:{db_index}:{genre}"},
+                    {
+                        "$inc": {"count": delta},
+                        "$setOnInsert": {"collection": collection_name, "db_index": db_index, "genre": genre}
+                    },
+                    upsert=True
+                )
+                for genre in genres
+            ], ordered=False)
+        except Exception as e:
+            LOGGER.error(f"Failed to update counters of {collection_name} in storage_{db_index}: {e}")
+
+    async def get_counts(self, collection_name: str, db_indexes, genre: Optional[str] = None) -> Dict[int, int]:
+        db_indexes = list(db_indexes)
+        counts = {db_index: 0 for db_index in db_indexes}
+        cursor = self.dbs["tracking"]["counters"].find({
+            "_id": {"$in": [f"{collection_name}:{i}:{genre or ''}" for i in db_indexes]}
+        })
+        async for counter in cursor:
+            counts[counter["db_index"]] = max(counter["count"], 0)
+        return counts
+
+    async def reconcile_counters(self):
+        counters = self.dbs["tracking"]["counters"]
+        try:
+            for db_index in range(1, len(self.dbs)):
+                for collection_name in ("movie", "tv"):
+                    collection = self.dbs[f"storage_{db_index}"][collection_name]
+                    totals = {"": await collection.count_documents({})}
+                    async for row in collection.aggregate([
+                        {"$unwind": "$genres"},
+                        {"$group": {"_id": "$genres", "count": {"$sum": 1}}}
+                    ]):
+                        if row["_id"]:
+                            totals[row["_id"]] = row["count"]
+
+                    ids = [f"{collection_name}:{db_index}:{genre}" for genre in totals]
+                    await counters.bulk_write([
+                        UpdateOne(
+                            {"_id": _id},
+                            {"$set": {"count": count, "collection": collection_name, "db_index": db_index, "genre": genre}},
+                            upsert=True
+                        )
+                        for _id, (genre, count) in zip(ids, totals.items())
+                    ], ordered=False)
+                    await counters.delete_many({"collection": collection_name, "db_index": db_index, "_id": {"$nin": ids}})
+            await self.set_state("counters", built=True, reconciled_on=datetime.utcnow())
+            self.counters_ready = True
+            LOGGER.info("Document counters reconciled")
+        except Exception as e:
+            LOGGER.error(f"Failed to reconcile document counters: {e}")
+
+    async def counter_reconcile_loop(self):
+        # Plugins that write to the storage DBs directly make the counters drift, this corrects them.
+        if Telegram.COUNTER_RECONCILE_INTERVAL <= 0:
+            return
+        while True:
+            await sleep(Telegram.COUNTER_RECONCILE_INTERVAL * 3600)
+            await self.reconcile_counters()
+
+
+    # -------------------------------
+    # Split Episode Storage
+    # -------------------------------
+    # Shows marked `episodes_split` keep only season summaries ({season_number, episode_count})
+    # in `seasons`; their episodes live in the storage DB's `episodes` collection, one document
+    # per (show_id, season_number, episode_number).
+    @staticmethod
+    def _season_summaries(seasons: List[dict]) -> List[dict]:
+        return [
+            {"season_number": season["season_number"], "episode_count": len(season.get("episodes", []))}
+            for season in seasons
+        ]
+
+    async def split_tv_document(self, db_index: int, tv: dict) -> bool:
+        storage = self.dbs[f"storage_{db_index}"]
+        seasons = tv.get("seasons", [])
+        ops = [
+            UpdateOne(
+                {"show_id": tv["_id"], "season_number": season["season_number"], "episode_number": episode["episode_number"]},
+                {"$set": {key: value for key, value in episode.items() if key != "episode_number"}},
+                upsert=True
+            )
+            for season in seasons
+            for episode in season.get("episodes", [])
+        ]
+        if ops:
+            await storage["episodes"].bulk_write(ops, ordered=False)
+
+        # Swap in the summaries only if no episode changed meanwhile, else the caller retries.
+        result = await storage["tv"].update_one(
+            {"_id": tv["_id"], "seasons": seasons, "episodes_split": {"$ne": True}},
+            {"$set": {"seasons": self._season_summaries(seasons), "episodes_split": True}}
+        )
+        if result.modified_count:
+            return True
+        # The show stays embedded, rows upserted for it above would be orphans.
+        if not await storage["tv"].find_one({"_id": tv["_id"], "episodes_split": True}, {"_id": 1}):
+            await storage["episodes"].delete_many({"show_id": tv["_id"]})
+        return False
+
+    async def hydrate_tv(
+        self, db_index: int, tv: Optional[dict], season_number: Optional[int] = None, include_files: bool = True
+    ) -> Optional[dict]:
+        """Put a split show's episodes back into `seasons`, optionally for one season only."""
+        if not tv or not tv.get("episodes_split"):
+            return tv
+        query = {"show_id": tv["_id"]}
+        if season_number is not None:
+            query["season_number"] = season_number
+        projection = {"_id": 0, "show_id": 0}
+        if not include_files:
+            projection["telegram"] = 0
+
+        seasons = {}
+        cursor = self.dbs[f"storage_{db_index}"]["episodes"].find(query, projection).sort(
+            [("season_number", ASCENDING), ("episode_number", ASCENDING)]
+        )
+        async for episode in cursor:
+            number = episode.pop("season_number")
+            seasons.setdefault(number, {"season_number": number, "episodes": []})["episodes"].append(episode)
+        tv["seasons"] = [seasons[number] for number in sorted(seasons)]
+        return tv
+
+    async def add_split_episode_quality(
+        self, storage, outline: dict, season_number: int, episode: dict, quality: dict, append_only: bool = False
+    ):
+        episodes = storage["episodes"]
+        key = {"show_id": outline["_id"], "season_number": season_number, "episode_number": episode["episode_number"]}
+
+        # Manual adds keep every file, like they do for embedded shows.
+        if Telegram.REPLACE_MODE and not append_only:
+            current = await episodes.find_one(key, {"telegram": 1})
+            replaced = [q for q in (current or {}).get("telegram", []) if q.get("quality") == quality.get("quality")]
+            if replaced:
+                await self._delete_file_messages(replaced)
+                await episodes.update_one(key, {"$pull": {"telegram": {"quality": quality.get("quality")}}})
+
+        details = {k: v for k, v in episode.items() if k not in ("episode_number", "telegram")}
+        result = await episodes.update_one(
+            key, {"$setOnInsert": details, "$push": {"telegram": quality}}, upsert=True
+        )
+
+        now = datetime.utcnow()
+        if result.upserted_id is None:
+            await storage["tv"].update_one({"_id": outline["_id"]}, {"$set": {"updated_on": now}})
+            return
+        # A new episode, count it in its season summary, creating the season when needed.
+        added = await storage["tv"].update_one(
+            {"_id": outline["_id"], "seasons.season_number": {"$ne": season_number}},
+            {"$push": {"seasons": {"season_number": season_number, "episode_count": 1}}, "$set": {"updated_on": now}}
+        )
+        if not added.matched_count:
+            await storage["tv"].update_one(
+                {"_id": outline["_id"]},
+                {"$inc": {"seasons.$[s].episode_count": 1}, "$set": {"updated_on": now}},
+                array_filters=[{"s.season_number": season_number}]
+            )
+
+    async def _delete_split_episodes(
+        self, db_index: int, show_id: ObjectId, season_number: int, episode_number: Optional[int] = None
+    ) -> bool:
+        storage = self.dbs[f"storage_{db_index}"]
+        query = {"show_id": show_id, "season_number": season_number}
+        if episode_number is not None:
+            query["episode_number"] = episode_number
+
+        async for episode in storage["episodes"].find(query, {"telegram": 1}):
+            await self._delete_file_messages(episode.get("telegram", []))
+        result = await storage["episodes"].delete_many(query)
+        if not result.deleted_count:
+            return False
+
+        now = datetime.utcnow()
+        if episode_number is None:
+            update = {"$pull": {"seasons": {"season_number": season_number}}, "$set": {"updated_on": now}}
+            await storage["tv"].update_one({"_id": show_id}, update)
+        else:
+            await storage["tv"].update_one(
+                {"_id": show_id},
+                {"$inc": {"seasons.$[s].episode_count": -result.deleted_count}, "$set": {"updated_on": now}},
+                array_filters=[{"s.season_number": season_number}]
+            )
+        return True
+
+    async def refresh_season_summaries(self, db_index: int, show_ids: List[ObjectId]) -> List[ObjectId]:
+        """Recount the season summaries of split shows, returns the shows left without episodes."""
+        storage = self.dbs[f"storage_{db_index}"]
+        summaries = {show_id: [] for show_id in show_ids}
+        async for row in storage["episodes"].aggregate([
+            {"$match": {"show_id": {"$in": show_ids}}},
+            {"$group": {"_id": {"show": "$show_id", "season": "$season_number"}, "count": {"$sum": 1}}},
+            {"$sort": {"_id.season": 1}}
+        ]):
+            summaries[row["_id"]["show"]].append({"season_number": row["_id"]["season"], "episode_count": row["count"]})
+
+        ops = [
+            # Only split shows carry summaries, an embedded show's seasons must never be replaced.
+            UpdateOne({"_id": show_id, "episodes_split": True}, {"$set": {"seasons": seasons, "updated_on": datetime.utcnow()}})
+            for show_id, seasons in summaries.items()
+        ]
+        if ops:
+            await storage["tv"].bulk_write(ops, ordered=False)
+        return [show_id for show_id, seasons in summaries.items() if not seasons]
+
 
     # -------------------------------
     # Helper Methods for Repeated Logic
     # -------------------------------
+    async def fan_out(self, func, db_indexes=None, timeout: float = SHARD_TIMEOUT) -> Dict[int, Any]:
+        """
+        Run `func(db_index, db)` on several storage DBs concurrently (all of them by default).
+        Shards that fail or time out are logged and left out of the returned {db_index: result}.
+        """
+        if db_indexes is None:
+            db_indexes = range(1, len(self.dbs))
+        db_indexes = list(db_indexes)
+
+        results = await gather(
+            *(wait_for(func(i, self.dbs[f"storage_{i}"]), timeout) for i in db_indexes),
+            return_exceptions=True
+        )
+        collected = {}
+        for db_index, result in zip(db_indexes, results):
+            if isinstance(result, BaseException):
+                LOGGER.warning(f"storage_{db_index} skipped: {type(result).__name__}: {result}")
+                continue
+            collected[db_index] = result
+        return collected
+
     def _get_sort_dict(self, sort_params: List[Tuple[str, str]]) -> Dict[str, int]:
         if sort_params:
             sort_field, sort_direction = sort_params[0]
@@ -92,55 +725,83 @@ class Database:
         sort_dict: Dict[str, int],
         page: int,
         page_size: int,
-        filter_dict: Optional[dict] = None
+        filter_dict: Optional[dict] = None,
+        genre: Optional[str] = None,
+        cursor: Optional[str] = None
     ):
+        """
+        Return one globally sorted page as (results, dbs_checked, total_count, next_cursor).
+        With `cursor` (a previous page's next_cursor) the page continues from per-shard
+        (sort value, _id) positions instead of skipping, so deep pages cost the same as the first.
+        """
         filter_dict = filter_dict or {}
-        skip = (page - 1) * page_size
-        results = []
-        dbs_checked = []
-        total_count = 0
-
-        db_counts = []
-        for i in range(1, self.current_db_index + 1):
-            db_key = f"storage_{i}"
-            db = self.dbs[db_key]
-            count = await db[collection_name].count_documents(filter_dict)
-            db_counts.append((i, count))
-            total_count += count
-
-        start_db_index = None
-        for db_index, count in reversed(db_counts):
-            if skip < count:
-                start_db_index = db_index
-                break
-            skip -= count
-
-        if not start_db_index:
-            return [], [], total_count
-
-        for db_index, count in reversed(db_counts):
-            if db_index < start_db_index:
-                continue
-
-            db_key = f"storage_{db_index}"
-            db = self.dbs[db_key]
-            dbs_checked.append(db_index)
-
-            cursor = (
-                db[collection_name]
-                .find(filter_dict)
-                .sort(sort_dict)
-                .skip(skip if db_index == start_db_index else 0)
-                .limit(page_size - len(results))
+        offset = skip = (page - 1) * page_size
+        (sort_field, direction), = sort_dict.items()
+        positions = decode_cursor(cursor, sort_field, direction) if cursor else {}
+        if cursor:
+            skip = 0
+
+        if self.counters_ready:
+            counts = await self.get_counts(collection_name, range(1, self.current_db_index + 1), genre)
+        else:
+            counts = await self.fan_out(
+                lambda i, db: db[collection_name].count_documents(filter_dict),
+                range(1, self.current_db_index + 1)
             )
+        # Materialized counters can lag behind plugins writing to the shards directly, so they
+        # only size the result. Shards are always read, the page ends where their rows run out.
+        total_count = sum(counts.values())
+
+        def shard_filter(db_index):
+            if db_index not in positions:
+                return filter_dict
+            return {"$and": [filter_dict, keyset_filter(sort_field, direction, *positions[db_index])]}
+
+        # The global page lies within the first skip + page_size documents of every shard.
+        # Only the sort keys are fetched for the merge, full documents just for the page itself.
+        sort_spec = [(sort_field, direction), ("_id", direction)]
+        candidates = await self.fan_out(
+            lambda i, db: db[collection_name].find(shard_filter(i), {sort_field: 1})
+            .sort(sort_spec).limit(skip + page_size).to_list(None),
+            range(1, self.current_db_index + 1)
+        )
 
-            docs = await cursor.to_list(None)
-            results.extend(docs)
+        merged = heapq.merge(
+            *([(i, doc) for doc in docs] for i, docs in candidates.items()),
+            key=lambda item: sort_key(item[1], sort_field),
+            reverse=direction == DESCENDING
+        )
+        consumed = [item for _, item in zip(range(skip + page_size), merged)]
+        page_items = consumed[skip:]
+
+        page_ids: Dict[int, List[ObjectId]] = {}
+        for i, doc in page_items:
+            page_ids.setdefault(i, []).append(doc["_id"])
+        loaded = await self.fan_out(
+            lambda i, db: db[collection_name].find({"_id": {"$in": page_ids[i]}}).to_list(None),
+            page_ids
+        )
+        documents = {doc["_id"]: doc for docs in loaded.values() for doc in docs}
+        # Documents removed since the merge are left out rather than failing the page.
+        results = [documents[doc["_id"]] for _, doc in page_items if doc["_id"] in documents]
+        dbs_checked = sorted({i for i, _ in page_items}, reverse=True)
+
+        # A shard that filled its limit may hold more, one that returned fewer rows is exhausted.
+        has_more = (
+            any(len(docs) == skip + page_size for docs in candidates.values())
+            or sum(len(docs) for docs in candidates.values()) > len(consumed)
+        )
+        total_count = max(total_count, offset + len(page_items) + (1 if has_more else 0))
 
-            if len(results) >= page_size:
-                break
+        next_cursor = None
+        if len(page_items) == page_size and has_more:
+            # Advance each shard past the last document it contributed, skipped ones included.
+            # Shards that contributed nothing keep their old position (or none, read from the top).
+            for i, doc in consumed:
+                positions[i] = (doc.get(sort_field), doc["_id"])
+            next_cursor = encode_cursor(sort_field, direction, positions)
 
-        return results, dbs_checked, total_count
+        return results, dbs_checked, total_count, next_cursor
 
 
 
@@ -153,6 +814,9 @@ class Database:
         try:
             await self.dbs[current_db_key][collection_name].insert_one(document)
             await self.dbs[old_db_key][collection_name].delete_one({"_id": document["_id"]})
+            await self.set_location(collection_name, document, self.current_db_index)
+            await self.adjust_counters(collection_name, document, old_db_index, -1)
+            await self.adjust_counters(collection_name, document, self.current_db_index, 1)
             LOGGER.info(f"✅ Moved document {document.get('tmdb_id')} from {old_db_key} to {current_db_key}")
             return True
         except Exception as e:
@@ -166,6 +830,7 @@ class Database:
             return None
         self.current_db_index = next_db_index
         await self.update_current_db_index()
+        await self.ensure_indexes(f"storage_{self.current_db_index}")
         LOGGER.info(f"Switched to storage_{self.current_db_index}")
         return await func(*args)
 
@@ -174,13 +839,12 @@ class Database:
     # Multi Database Method for insert/update/delete/list
     # -------------------------------
 
-    async def insert_media(
+    def _build_media(
         self, metadata_info: dict,
         channel: int, msg_id: int, size: str, name: str
-    ) -> Optional[ObjectId]:
-        
+    ):
         if metadata_info['media_type'] == "movie":
-            media = MovieSchema(
+            return MovieSchema(
                 tmdb_id=metadata_info['tmdb_id'],
                 imdb_id=metadata_info['imdb_id'],
                 db_index=self.current_db_index,
@@ -202,41 +866,235 @@ class Database:
                     size=size
                 )]
             )
-            return await self.update_movie(media)
-        else:
-            tv_show = TVShowSchema(
-                tmdb_id=metadata_info['tmdb_id'],
-                imdb_id=metadata_info['imdb_id'],
-                db_index=self.current_db_index,
-                title=metadata_info['title'],
-                genres=metadata_info['genres'],
-                description=metadata_info['description'],
-                rating=metadata_info['rate'],
-                release_year=metadata_info['year'],
-                poster=metadata_info['poster'],
-                backdrop=metadata_info['backdrop'],
-                logo=metadata_info['logo'],
-                cast=metadata_info['cast'],
-                runtime=metadata_info['runtime'],
-                media_type=metadata_info['media_type'],
-                seasons=[Season(
-                    season_number=metadata_info['season_number'],
-                    episodes=[Episode(
-                        episode_number=metadata_info['episode_number'],
-                        title=metadata_info['episode_title'],
-                        episode_backdrop=metadata_info['episode_backdrop'],
-                        overview=metadata_info['episode_overview'],
-                        released=metadata_info['episode_released'],
-                        telegram=[QualityDetail(
-                            quality=metadata_info['quality'],
-                            id=metadata_info['encoded_string'],
-                            name=name,
-                            size=size
-                        )]
+        return TVShowSchema(
+            tmdb_id=metadata_info['tmdb_id'],
+            imdb_id=metadata_info['imdb_id'],
+            db_index=self.current_db_index,
+            title=metadata_info['title'],
+            genres=metadata_info['genres'],
+            description=metadata_info['description'],
+            rating=metadata_info['rate'],
+            release_year=metadata_info['year'],
+            poster=metadata_info['poster'],
+            backdrop=metadata_info['backdrop'],
+            logo=metadata_info['logo'],
+            cast=metadata_info['cast'],
+            runtime=metadata_info['runtime'],
+            media_type=metadata_info['media_type'],
+            seasons=[Season(
+                season_number=metadata_info['season_number'],
+                episodes=[Episode(
+                    episode_number=metadata_info['episode_number'],
+                    title=metadata_info['episode_title'],
+                    episode_backdrop=metadata_info['episode_backdrop'],
+                    overview=metadata_info['episode_overview'],
+                    released=metadata_info['episode_released'],
+                    telegram=[QualityDetail(
+                        quality=metadata_info['quality'],
+                        id=metadata_info['encoded_string'],
+                        name=name,
+                        size=size
                     )]
                 )]
+            )]
+        )
+
+    async def insert_media(
+        self, metadata_info: dict,
+        channel: int, msg_id: int, size: str, name: str
+    ) -> Optional[ObjectId]:
+        media = self._build_media(metadata_info, channel, msg_id, size, name)
+        if isinstance(media, MovieSchema):
+            return await self.update_movie(media)
+        return await self.update_tv_show(media)
+
+    async def bulk_ingest(self, records: List[Tuple[dict, int, int, str, str]]) -> List[bool]:
+        """
+        Store a batch of (metadata_info, channel, msg_id, size, name) records. Files of the
+        same title are merged in memory first, then every collection of the active storage DB
+        gets a single bulk_write. Titles that live on another shard or are stored split go
+        through insert_media. Returns whether each record was stored; records that weren't
+        are left to the caller to retry.
+        """
+        stored = [False] * len(records)
+        groups: Dict[Tuple[str, Any], List[Tuple[int, dict]]] = {}
+        for index, record in enumerate(records):
+            try:
+                media = self._build_media(*record).dict()
+            except ValidationError as e:
+                LOGGER.error(f"Validation error: {e}")
+                continue
+            key = media.get("imdb_id") or media.get("tmdb_id") or f"{media['title']}:{media['release_year']}"
+            groups.setdefault((media["media_type"], key), []).append((index, media))
+
+        fallback: List[int] = []
+        # Per collection: (ops, inserted document, record indexes, (show_id, file ids) to verify).
+        pending: Dict[str, List[Tuple[list, Optional[dict], List[int], Optional[tuple]]]] = {"movie": [], "tv": []}
+
+        for (media_type, _), items in groups.items():
+            collection_name = "movie" if media_type == "movie" else "tv"
+            indexes = [index for index, _ in items]
+            incoming = items[0][1]
+
+            existing, existing_db_index = await self._find_existing(
+                collection_name, incoming.get("imdb_id"), incoming.get("tmdb_id"),
+                incoming["title"], incoming["release_year"],
+                projection=TV_OUTLINE_PROJECTION if collection_name == "tv" else None
             )
-            return await self.update_tv_show(tv_show)
+            if existing and (existing_db_index != self.current_db_index or existing.get("episodes_split")):
+                fallback.extend(indexes)
+                continue
+
+            for _, media in items[1:]:
+                if collection_name == "movie":
+                    await self._merge_movie_qualities(incoming, media["telegram"])
+                else:
+                    await self._merge_tv_seasons(incoming, media["seasons"])
+            if not existing:
+                incoming["db_index"] = self.current_db_index
+                pending[collection_name].append(([InsertOne(incoming)], incoming, indexes, None))
+            elif collection_name == "movie":
+                await self._merge_movie_qualities(existing, incoming["telegram"])
+                existing["updated_on"] = datetime.utcnow()
+                pending["movie"].append(([ReplaceOne({"_id": existing["_id"]}, existing)], None, indexes, None))
+            else:
+                # Targeted updates only, a full replace would undo concurrent edits of the show.
+                expected = {
+                    q.get("id") for season in incoming["seasons"]
+                    for episode in season["episodes"] for q in episode.get("telegram", [])
+                }
+                pending["tv"].append((
+                    await self._tv_update_ops(existing, incoming["seasons"]), None, indexes, (existing["_id"], expected)
+                ))
+
+        current_db_key = f"storage_{self.current_db_index}"
+        for collection_name, entries in pending.items():
+            if not entries:
+                continue
+            ops = [op for entry_ops, _, _, _ in entries for op in entry_ops]
+            owners = [n for n, (entry_ops, _, _, _) in enumerate(entries) for _ in entry_ops]
+            applied = len(entries)
+            try:
+                if ops:
+                    await self.dbs[current_db_key][collection_name].bulk_write(ops, ordered=True)
+            except BulkWriteError as e:
+                # Ordered writes stop at the first error, entries before it are stored.
+                applied = owners[e.details["writeErrors"][0]["index"]]
+                LOGGER.error(f"Bulk write to {current_db_key}.{collection_name} stopped at entry {applied}: {e}")
+                for _, _, indexes, verify in entries[applied:]:
+                    if verify is None:
+                        fallback.extend(indexes)
+            except Exception as e:
+                # Unknown how far it got, leave the records unstored so the caller keeps them.
+                LOGGER.error(f"Bulk write to {current_db_key}.{collection_name} failed: {e}")
+                applied = 0
+
+            for n, (_, inserted, indexes, verify) in enumerate(entries):
+                if verify is not None:
+                    fallback.extend(await self._unapplied_episodes(current_db_key, *verify, records, indexes, stored))
+                    continue
+                if n >= applied:
+                    continue
+                for index in indexes:
+                    stored[index] = True
+                if inserted is None:
+                    continue
+                await self.set_location(collection_name, inserted, self.current_db_index)
+                await self.adjust_counters(collection_name, inserted, self.current_db_index, 1)
+                if collection_name == "tv" and Telegram.SPLIT_EPISODES:
+                    await self.split_tv_document(self.current_db_index, inserted)
+
+        for index in fallback:
+            stored[index] = bool(await self.insert_media(*records[index]))
+        return stored
+
+    async def _tv_update_ops(self, outline: dict, seasons: List[dict]) -> List[UpdateOne]:
+        """
+        The updates _add_episode_quality would make for every file in `seasons`, as bulk ops.
+        A guard that misses because the show changed meanwhile is caught by _unapplied_episodes.
+        """
+        ops = []
+        now = datetime.utcnow()
+        # A show split meanwhile only has season summaries, every op has to miss it.
+        show = {"_id": outline["_id"], "episodes_split": {"$ne": True}}
+        known = {
+            season.get("season_number"): {e.get("episode_number"): e for e in season.get("episodes", [])}
+            for season in outline.get("seasons", [])
+        }
+        for season in seasons:
+            season_number = season["season_number"]
+            if season_number not in known:
+                ops.append(UpdateOne(
+                    {**show, "seasons.season_number": {"$ne": season_number}},
+                    {"$push": {"seasons": season}, "$set": {"updated_on": now}}
+                ))
+                continue
+
+            for episode in season["episodes"]:
+                episode_number = episode["episode_number"]
+                existing_episode = known[season_number].get(episode_number)
+                if existing_episode is None:
+                    ops.append(UpdateOne(
+                        {**show, "seasons": {"$elemMatch": {
+                            "season_number": season_number,
+                            "episodes.episode_number": {"$ne": episode_number}
+                        }}},
+                        {"$push": {"seasons.$[s].episodes": episode}, "$set": {"updated_on": now}},
+                        array_filters=[{"s.season_number": season_number}]
+                    ))
+                    continue
+
+                path = "seasons.$[s].episodes.$[e].telegram"
+                array_filters = [{"s.season_number": season_number}, {"e.episode_number": episode_number}]
+                qualities = episode.get("telegram", [])
+                if Telegram.REPLACE_MODE:
+                    targets = list({q.get("quality") for q in qualities})
+                    await self._delete_file_messages([
+                        q for q in existing_episode.get("telegram", []) if q.get("quality") in targets
+                    ])
+                    ops.append(UpdateOne(
+                        show,
+                        {"$pull": {path: {"quality": {"$in": targets}}}},
+                        array_filters=array_filters
+                    ))
+                ops.append(UpdateOne(
+                    show,
+                    {"$push": {path: {"$each": qualities}}, "$set": {"updated_on": now}},
+                    array_filters=array_filters
+                ))
+        return ops
+
+    async def _unapplied_episodes(
+        self, db_key: str, show_id: ObjectId, expected: set, records: list, indexes: List[int], stored: List[bool]
+    ) -> List[int]:
+        """
+        Check which files of a bulk show update made it into the document. Marks them stored
+        and returns the record indexes still missing, for the guarded one-by-one path.
+        """
+        try:
+            document = await self.dbs[db_key]["tv"].find_one(
+                {"_id": show_id}, {"seasons.episodes.telegram.id": 1, "episodes_split": 1}
+            ) or {}
+            if document.get("episodes_split"):
+                # Split meanwhile, files written before the swap moved to the episodes collection.
+                episodes = await self.dbs[db_key]["episodes"].find(
+                    {"show_id": show_id}, {"telegram.id": 1}
+                ).to_list(None)
+            else:
+                episodes = [e for season in document.get("seasons", []) for e in season.get("episodes", [])]
+        except Exception as e:
+            LOGGER.error(f"Could not verify bulk update of show {show_id}: {e}")
+            return []
+        present = {q.get("id") for episode in episodes for q in episode.get("telegram", [])}
+        missing = []
+        for index in indexes:
+            file_id = records[index][0]["encoded_string"]
+            # Files superseded by a later one of the same batch (REPLACE_MODE) count as handled.
+            if file_id in present or file_id not in expected:
+                stored[index] = True
+            else:
+                missing.append(index)
+        return missing
 
     async def update_movie(self, movie_data: MovieSchema) -> Optional[ObjectId]:
         try:
@@ -251,40 +1109,22 @@ class Database:
         release_year = movie_dict["release_year"]
 
         quality_to_update = movie_dict["telegram"][0]
-        target_quality = quality_to_update["quality"]
 
         current_db_key = f"storage_{self.current_db_index}"
         total_storage_dbs = len(self.dbs) - 1
 
-        existing_movie = None
-        existing_db_key = None
-        existing_db_index = None
-
-        for db_index in range(1, total_storage_dbs + 1):
-            db_key = f"storage_{db_index}"
-            movie = None
-
-            if imdb_id:
-                movie = await self.dbs[db_key]["movie"].find_one({"imdb_id": imdb_id})
-            if not movie and tmdb_id:
-                movie = await self.dbs[db_key]["movie"].find_one({"tmdb_id": tmdb_id})
-            if not movie and title and release_year:
-                movie = await self.dbs[db_key]["movie"].find_one({
-                    "title": title,
-                    "release_year": release_year
-                })
-
-            if movie:
-                existing_movie = movie
-                existing_db_key = db_key
-                existing_db_index = db_index
-                break
+        existing_movie, existing_db_index = await self._find_existing(
+            "movie", imdb_id, tmdb_id, title, release_year
+        )
+        existing_db_key = f"storage_{existing_db_index}" if existing_movie else None
 
         # ---------------- INSERT NEW MOVIE ----------------
         if not existing_movie:
             try:
                 movie_dict["db_index"] = self.current_db_index
                 result = await self.dbs[current_db_key]["movie"].insert_one(movie_dict)
+                await self.set_location("movie", movie_dict, self.current_db_index)
+                await self.adjust_counters("movie", movie_dict, self.current_db_index, 1)
                 return result.inserted_id
             except Exception as e:
                 LOGGER.error(f"Insertion failed in {current_db_key}: {e}")
@@ -294,33 +1134,7 @@ class Database:
 
         # ---------------- UPDATE MOVIE ----------------
         movie_id = existing_movie["_id"]
-        existing_qualities = existing_movie.get("telegram", [])
-
-        if Telegram.REPLACE_MODE:
-            # delete all same-quality entries
-            to_delete = [q for q in existing_qualities if q.get("quality") == target_quality]
-
-            for q in to_delete:
-                try:
-                    old_id = q.get("id")
-                    if old_id:
-                        decoded = await decode_string(old_id)
-                        chat_id = int(f"-100{decoded['chat_id']}")
-                        msg_id = int(decoded['msg_id'])
-                        create_task(delete_message(chat_id, msg_id))
-                except Exception as e:
-                    LOGGER.error(f"Failed to delete old quality: {e}")
-
-            existing_qualities = [
-                q for q in existing_qualities if q.get("quality") != target_quality
-            ]
-            existing_qualities.append(quality_to_update)
-
-        else:
-            # allow duplicate qualities
-            existing_qualities.append(quality_to_update)
-
-        existing_movie["telegram"] = existing_qualities
+        await self._merge_movie_qualities(existing_movie, [quality_to_update])
         existing_movie["updated_on"] = datetime.utcnow()
 
         if existing_db_index != self.current_db_index:
@@ -355,35 +1169,20 @@ class Database:
         current_db_key = f"storage_{self.current_db_index}"
         total_storage_dbs = len(self.dbs) - 1
 
-        existing_tv = None
-        existing_db_key = None
-        existing_db_index = None
-
-        for db_index in range(1, total_storage_dbs + 1):
-            db_key = f"storage_{db_index}"
-            tv = None
-
-            if imdb_id:
-                tv = await self.dbs[db_key]["tv"].find_one({"imdb_id": imdb_id})
-            if not tv and tmdb_id:
-                tv = await self.dbs[db_key]["tv"].find_one({"tmdb_id": tmdb_id})
-            if not tv and title and release_year:
-                tv = await self.dbs[db_key]["tv"].find_one({
-                    "title": title,
-                    "release_year": release_year
-                })
-
-            if tv:
-                existing_tv = tv
-                existing_db_key = db_key
-                existing_db_index = db_index
-                break
+        existing_tv, existing_db_index = await self._find_existing(
+            "tv", imdb_id, tmdb_id, title, release_year, projection=TV_OUTLINE_PROJECTION
+        )
+        existing_db_key = f"storage_{existing_db_index}" if existing_tv else None
 
         # ---------------- INSERT NEW TV ----------------
         if not existing_tv:
             try:
                 tv_show_dict["db_index"] = self.current_db_index
                 result = await self.dbs[current_db_key]["tv"].insert_one(tv_show_dict)
+                await self.set_location("tv", tv_show_dict, self.current_db_index)
+                await self.adjust_counters("tv", tv_show_dict, self.current_db_index, 1)
+                if Telegram.SPLIT_EPISODES:
+                    await self.split_tv_document(self.current_db_index, tv_show_dict)
                 return result.inserted_id
             except Exception as e:
                 LOGGER.error(f"Insertion failed in {current_db_key}: {e}")
@@ -394,15 +1193,130 @@ class Database:
         # ---------------- UPDATE TV ----------------
         tv_id = existing_tv["_id"]
 
-        for season in tv_show_dict["seasons"]:
+        if existing_db_index == self.current_db_index:
+            try:
+                storage = self.dbs[existing_db_key]
+                for season in tv_show_dict["seasons"]:
+                    for episode in season["episodes"]:
+                        for quality in episode.get("telegram", []):
+                            if not existing_tv.get("episodes_split"):
+                                if await self._add_episode_quality(
+                                    storage["tv"], existing_tv, season["season_number"], episode, quality
+                                ):
+                                    continue
+                                # Missed because the show was split meanwhile (or is gone), check which.
+                                if not await storage["tv"].find_one({"_id": tv_id, "episodes_split": True}, {"_id": 1}):
+                                    LOGGER.warning(f"TV show {tmdb_id} disappeared from {existing_db_key} during update")
+                                    return None
+                                existing_tv["episodes_split"] = True
+                            await self.add_split_episode_quality(storage, existing_tv, season["season_number"], episode, quality)
+                return tv_id
+            except Exception as e:
+                LOGGER.error(f"Failed to update TV show {tmdb_id} in {existing_db_key}: {e}")
+                if any(keyword in str(e).lower() for keyword in ["storage", "quota"]):
+                    return await self._handle_storage_error(self.update_tv_show, tv_show_data, total_storage_dbs=total_storage_dbs)
+                return None
+
+        # ---------------- MOVE DB IF NEEDED ----------------
+        # Moving rewrites the whole document anyway, so merge in memory.
+        existing_tv = await self.hydrate_tv(
+            existing_db_index, await self.dbs[existing_db_key]["tv"].find_one({"_id": tv_id})
+        )
+        was_split = existing_tv.pop("episodes_split", False)
+        await self._merge_tv_seasons(existing_tv, tv_show_dict["seasons"])
+        existing_tv["updated_on"] = datetime.utcnow()
+
+        try:
+            if await self._move_document("tv", existing_tv, existing_db_index) and was_split:
+                await self.dbs[existing_db_key]["episodes"].delete_many({"show_id": tv_id})
+                await self.split_tv_document(self.current_db_index, existing_tv)
+        except Exception as e:
+            LOGGER.error(f"Error moving TV show to {current_db_key}: {e}")
+            if any(keyword in str(e).lower() for keyword in ["storage", "quota"]):
+                return await self._handle_storage_error(self.update_tv_show, tv_show_data, total_storage_dbs=total_storage_dbs)
+        return tv_id
+
+    async def _add_episode_quality(self, collection, outline: dict, season_number: int, episode: dict, quality: dict) -> bool:
+        """
+        Add one file to an episode with targeted array updates, creating the season or episode
+        when missing. `outline` is only a hint of what exists, every step is guarded so a
+        concurrent writer makes it fall through to the next one instead of clobbering it.
+        Returns False if the show is no longer stored embedded, nothing is written then.
+        """
+        show = {"_id": outline["_id"], "episodes_split": {"$ne": True}}
+        episode_number = episode["episode_number"]
+        season = next((s for s in outline.get("seasons", []) if s.get("season_number") == season_number), None)
+        existing_episode = season and next(
+            (e for e in season.get("episodes", []) if e.get("episode_number") == episode_number), None
+        )
+        now = datetime.utcnow()
+        new_episode = {**episode, "telegram": [quality]}
+
+        if season is None:
+            result = await collection.update_one(
+                {**show, "seasons.season_number": {"$ne": season_number}},
+                {"$push": {"seasons": {"season_number": season_number, "episodes": [new_episode]}},
+                 "$set": {"updated_on": now}}
+            )
+            if result.matched_count:
+                return True
+
+        if not existing_episode:
+            result = await collection.update_one(
+                {**show, "seasons": {"$elemMatch": {
+                    "season_number": season_number,
+                    "episodes.episode_number": {"$ne": episode_number}
+                }}},
+                {"$push": {"seasons.$[s].episodes": new_episode}, "$set": {"updated_on": now}},
+                array_filters=[{"s.season_number": season_number}]
+            )
+            if result.matched_count:
+                return True
+
+        path = "seasons.$[s].episodes.$[e].telegram"
+        array_filters = [{"s.season_number": season_number}, {"e.episode_number": episode_number}]
+        if Telegram.REPLACE_MODE:
+            replaced = [
+                q for q in (existing_episode or {}).get("telegram", [])
+                if q.get("quality") == quality.get("quality")
+            ]
+            pulled = await collection.update_one(
+                show,
+                {"$pull": {path: {"quality": quality.get("quality")}}},
+                array_filters=array_filters
+            )
+            if not pulled.matched_count:
+                # Split meanwhile, the split path replaces the file there.
+                return False
+            await self._delete_file_messages(replaced)
+        result = await collection.update_one(
+            show,
+            {"$push": {path: quality}, "$set": {"updated_on": now}},
+            array_filters=array_filters
+        )
+        return bool(result.matched_count)
+
+    async def _merge_movie_qualities(self, movie: dict, qualities: List[dict]):
+        existing_qualities = movie.setdefault("telegram", [])
+        for quality in qualities:
+            if Telegram.REPLACE_MODE:
+                # delete all same-quality entries
+                target_quality = quality.get("quality")
+                await self._delete_file_messages([q for q in existing_qualities if q.get("quality") == target_quality])
+                existing_qualities[:] = [q for q in existing_qualities if q.get("quality") != target_quality]
+            # otherwise allow duplicate qualities
+            existing_qualities.append(quality)
+
+    async def _merge_tv_seasons(self, tv: dict, seasons: List[dict]):
+        for season in seasons:
             existing_season = next(
-                (s for s in existing_tv["seasons"]
+                (s for s in tv["seasons"]
                 if s["season_number"] == season["season_number"]),
                 None
             )
 
             if not existing_season:
-                existing_tv["seasons"].append(season)
+                tv["seasons"].append(season)
                 continue
 
             for episode in season["episodes"]:
@@ -422,21 +1336,10 @@ class Database:
                     target_quality = quality.get("quality")
 
                     if Telegram.REPLACE_MODE:
-                        to_delete = [
+                        await self._delete_file_messages([
                             q for q in existing_episode["telegram"]
                             if q.get("quality") == target_quality
-                        ]
-
-                        for q in to_delete:
-                            try:
-                                old_id = q.get("id")
-                                if old_id:
-                                    decoded = await decode_string(old_id)
-                                    chat_id = int(f"-100{decoded['chat_id']}")
-                                    msg_id = int(decoded['msg_id'])
-                                    create_task(delete_message(chat_id, msg_id))
-                            except Exception as e:
-                                LOGGER.error(f"Failed to delete old quality: {e}")
+                        ])
 
                         existing_episode["telegram"] = [
                             q for q in existing_episode["telegram"]
@@ -447,32 +1350,24 @@ class Database:
                     else:
                         existing_episode["telegram"].append(quality)
 
-        existing_tv["updated_on"] = datetime.utcnow()
-
-        # ---------------- MOVE DB IF NEEDED ----------------
-        if existing_db_index != self.current_db_index:
+    async def _delete_file_messages(self, qualities: List[dict]):
+        await self.forget_files([q["id"] for q in qualities if q.get("id")])
+        for quality in qualities:
             try:
-                if await self._move_document("tv", existing_tv, existing_db_index):
-                    return tv_id
+                old_id = quality.get("id")
+                if old_id:
+                    decoded = await decode_string(old_id)
+                    chat_id = int(f"-100{decoded['chat_id']}")
+                    msg_id = int(decoded['msg_id'])
+                    create_task(delete_message(chat_id, msg_id))
             except Exception as e:
-                LOGGER.error(f"Error moving TV show to {current_db_key}: {e}")
-                if any(keyword in str(e).lower() for keyword in ["storage", "quota"]):
-                    return await self._handle_storage_error(self.update_tv_show, tv_show_data, total_storage_dbs=total_storage_dbs)
-            return tv_id
-
-        try:
-            await self.dbs[existing_db_key]["tv"].replace_one({"_id": tv_id}, existing_tv)
-            return tv_id
-        except Exception as e:
-            LOGGER.error(f"Failed to update TV show {tmdb_id} in {existing_db_key}: {e}")
-            if any(keyword in str(e).lower() for keyword in ["storage", "quota"]):
-                return await self._handle_storage_error(self.update_tv_show, tv_show_data, total_storage_dbs=total_storage_dbs)
+                LOGGER.error(f"Failed to queue file for deletion: {e}")
     
-    async def sort_movies(self, sort_params, page, page_size, genre_filter=None):
+    async def sort_movies(self, sort_params, page, page_size, genre_filter=None, cursor=None):
         sort_dict = self._get_sort_dict(sort_params)
         filter_dict = {"genres": {"$in": [genre_filter]}} if genre_filter else {}
-        results, dbs_checked, total_count = await self._paginate_collection(
-            "movie", sort_dict, page, page_size, filter_dict=filter_dict
+        results, dbs_checked, total_count, next_cursor = await self._paginate_collection(
+            "movie", sort_dict, page, page_size, filter_dict=filter_dict, genre=genre_filter, cursor=cursor
         )
         total_pages = (total_count + page_size - 1) // page_size
         return {
@@ -480,14 +1375,15 @@ class Database:
             "total_pages": total_pages,
             "databases_checked": dbs_checked,
             "current_page": page,
+            "next_cursor": next_cursor,
             "movies": [convert_objectid_to_str(result) for result in results],
         }
 
-    async def sort_tv_shows(self, sort_params, page, page_size, genre_filter=None):
+    async def sort_tv_shows(self, sort_params, page, page_size, genre_filter=None, cursor=None):
         sort_dict = self._get_sort_dict(sort_params)
         filter_dict = {"genres": {"$in": [genre_filter]}} if genre_filter else {}
-        results, dbs_checked, total_count = await self._paginate_collection(
-            "tv", sort_dict, page, page_size, filter_dict=filter_dict
+        results, dbs_checked, total_count, next_cursor = await self._paginate_collection(
+            "tv", sort_dict, page, page_size, filter_dict=filter_dict, genre=genre_filter, cursor=cursor
         )
         total_pages = (total_count + page_size - 1) // page_size
         return {
@@ -495,6 +1391,7 @@ class Database:
             "total_pages": total_pages,
             "databases_checked": dbs_checked,
             "current_page": page,
+            "next_cursor": next_cursor,
             "tv_shows": [convert_objectid_to_str(result) for result in results],
         }
 
@@ -539,48 +1436,27 @@ class Database:
                 }}
             ]
             
-            results = []
-            dbs_checked = []
-            
-            active_db_key = f"storage_{self.current_db_index}"
-            active_db = self.dbs[active_db_key]
-            dbs_checked.append(self.current_db_index)
-            
-            tv_results = await active_db["tv"].aggregate(tv_pipeline).to_list(None)
-            movie_results = await active_db["movie"].aggregate(movie_pipeline).to_list(None)
-            combined = tv_results + movie_results
-            results.extend(combined)
-            
-            if len(results) < page_size:
-                previous_db_index = self.current_db_index - 1
-                while previous_db_index > 0 and len(results) < page_size:
-                    prev_db_key = f"storage_{previous_db_index}"
-                    prev_db = self.dbs[prev_db_key]
-                    tv_results_prev = await prev_db["tv"].aggregate(tv_pipeline).to_list(None)
-                    movie_results_prev = await prev_db["movie"].aggregate(movie_pipeline).to_list(None)
-                    combined_prev = tv_results_prev + movie_results_prev
-                    results.extend(combined_prev)
-                    dbs_checked.append(previous_db_index)
-                    previous_db_index -= 1
-
-            total_count = 0
-            for db_index in dbs_checked:
-                key = f"storage_{db_index}"
-                db = self.dbs[key]
-                tv_count = await db["tv"].count_documents({
-                    "$or": [
-                        {"title": regex_query},
-                        {"seasons.episodes.telegram.name": regex_query}
-                    ]
-                })
-                movie_count = await db["movie"].count_documents({
-                    "$or": [
-                        {"title": regex_query},
-                        {"telegram.name": regex_query}
+            async def search_shard(db_index, db):
+                shard_tv_pipeline = tv_pipeline
+                split_ids = await db["episodes"].distinct("show_id", {"telegram.name": regex_query})
+                if split_ids:
+                    shard_tv_pipeline = [
+                        {"$match": {"$or": tv_pipeline[0]["$match"]["$or"] + [{"_id": {"$in": split_ids}}]}},
+                        tv_pipeline[1]
                     ]
-                })
-                total_count += (tv_count + movie_count)
-            
+                tv_results, movie_results = await gather(
+                    db["tv"].aggregate(shard_tv_pipeline).to_list(None),
+                    db["movie"].aggregate(movie_pipeline).to_list(None)
+                )
+                return tv_results + movie_results
+
+            # Newest shard first, as before, but every shard is searched at once.
+            found = await self.fan_out(search_shard, range(self.current_db_index, 0, -1))
+            results = []
+            for db_index in sorted(found, reverse=True):
+                results.extend(found[db_index])
+
+            total_count = len(results)
             paged_results = results[skip:skip + page_size]
 
             return {
@@ -589,52 +1465,90 @@ class Database:
             }
 
 
+    async def _tv_slice(self, db_key: str, tmdb_id: int, season_number: int, episode_number: Optional[int] = None) -> Optional[dict]:
+        """
+        Fetch one season, or one episode of it, of an embedded show with $filter so Mongo only
+        ships that slice instead of the whole document. Split shows come back as a bare outline.
+        """
+        def pick(items, field, number):
+            return {"$arrayElemAt": [
+                {"$filter": {"input": {"$ifNull": [items, []]}, "as": "item", "cond": {"$eq": [f"$$item.{field}", number]}}},
+                0
+            ]}
+
+        pipeline = [
+            {"$match": {"tmdb_id": tmdb_id}},
+            {"$limit": 1},
+            {"$project": {"episodes_split": 1, "season": pick("$seasons", "season_number", season_number)}},
+        ]
+        if episode_number is not None:
+            pipeline.append({"$project": {
+                "episodes_split": 1,
+                "episode": pick("$season.episodes", "episode_number", episode_number)
+            }})
+        found = await self.dbs[db_key]["tv"].aggregate(pipeline).to_list(1)
+        return found[0] if found else None
+
     async def get_media_details(
         self, tmdb_id: int, db_index: int,
-        season_number: Optional[int] = None, episode_number: Optional[int] = None
+        season_number: Optional[int] = None, episode_number: Optional[int] = None,
+        include_files: bool = True
     ) -> Optional[dict]:
         db_key = f"storage_{db_index}"
         if episode_number is not None and season_number is not None:
-            tv_show = await self.dbs[db_key]["tv"].find_one({"tmdb_id": tmdb_id})
+            tv_show = await self._tv_slice(db_key, tmdb_id, season_number, episode_number)
             if not tv_show:
                 return None
-            for season in tv_show.get("seasons", []):
-                if season.get("season_number") == season_number:
-                    for episode in season.get("episodes", []):
-                        if episode.get("episode_number") == episode_number:
-                            details = convert_objectid_to_str(episode)
-                            details.update({
-                                "tmdb_id": tmdb_id,
-                                "type": "tv",
-                                "season_number": season_number,
-                                "episode_number": episode_number,
-                                "backdrop": episode.get("episode_backdrop")
-                            })
-                            return details
-            return None
+            episode = tv_show.get("episode")
+            if tv_show.get("episodes_split"):
+                episode = await self.dbs[db_key]["episodes"].find_one(
+                    {"show_id": tv_show["_id"], "season_number": season_number, "episode_number": episode_number},
+                    {"_id": 0, "show_id": 0}
+                )
+            if not episode:
+                return None
+            details = convert_objectid_to_str(episode)
+            details.update({
+                "tmdb_id": tmdb_id,
+                "type": "tv",
+                "season_number": season_number,
+                "episode_number": episode_number,
+                "backdrop": episode.get("episode_backdrop")
+            })
+            return details
 
         elif season_number is not None:
-            tv_show = await self.dbs[db_key]["tv"].find_one({"tmdb_id": tmdb_id})
+            tv_show = await self._tv_slice(db_key, tmdb_id, season_number)
             if not tv_show:
                 return None
-            for season in tv_show.get("seasons", []):
-                if season.get("season_number") == season_number:
-                    details = convert_objectid_to_str(season)
-                    details.update({
-                        "tmdb_id": tmdb_id,
-                        "type": "tv",
-                        "season_number": season_number
-                    })
-                    return details
-            return None
+            season = tv_show.get("season")
+            if tv_show.get("episodes_split"):
+                tv_show = await self.hydrate_tv(db_index, tv_show, season_number)
+                season = next(iter(tv_show["seasons"]), None)
+            if not season:
+                return None
+            details = convert_objectid_to_str(season)
+            details.update({
+                "tmdb_id": tmdb_id,
+                "type": "tv",
+                "season_number": season_number
+            })
+            return details
 
         else:
-            tv_doc = await self.dbs[db_key]["tv"].find_one({"tmdb_id": tmdb_id})
+            # Catalog metadata has no use for the file lists, which are most of a big show.
+            projection = None if include_files else {"seasons.episodes.telegram": 0}
+            tv_doc = await self.hydrate_tv(
+                db_index, await self.dbs[db_key]["tv"].find_one({"tmdb_id": tmdb_id}, projection),
+                include_files=include_files
+            )
             if tv_doc:
                 tv_doc = convert_objectid_to_str(tv_doc)
                 tv_doc["type"] = "tv"
                 return tv_doc
-            movie_doc = await self.dbs[db_key]["movie"].find_one({"tmdb_id": tmdb_id})
+            movie_doc = await self.dbs[db_key]["movie"].find_one(
+                {"tmdb_id": tmdb_id}, None if include_files else {"telegram": 0}
+            )
             if movie_doc:
                 movie_doc = convert_objectid_to_str(movie_doc)
                 movie_doc["type"] = "movie"
@@ -654,6 +1568,8 @@ class Database:
         else:
             collection_name = "movie"
         document = await self.dbs[db_key][collection_name].find_one({"tmdb_id": int(tmdb_id)})
+        if collection_name == "tv":
+            document = await self.hydrate_tv(int(db_index), document)
         return convert_objectid_to_str(document) if document else None
 
     async def update_document(
@@ -668,8 +1584,11 @@ class Database:
         collection = self.dbs[db_key][collection_name]
 
         try:
+            previous = await collection.find_one({"tmdb_id": int(tmdb_id)}, METADATA_INDEX_PROJECTION)
             result = await collection.update_one({"tmdb_id": int(tmdb_id)}, {"$set": update_data})
 
+            if result.modified_count and previous:
+                await self._metadata_changed(collection_name, int(db_index), previous, update_data)
             return result.modified_count > 0
 
         except Exception as e:
@@ -692,12 +1611,21 @@ class Database:
                         LOGGER.error(f"Document with tmdb_id {tmdb_id} not found in {db_key} during migration.")
                         return False
 
+                    old_doc = await self.hydrate_tv(db_index_int, old_doc) if collection_name == "tv" else old_doc
+                    was_split = old_doc.pop("episodes_split", False)
+                    old_show_id = old_doc["_id"]
                     old_doc.update(update_data)
                     old_doc["db_index"] = next_db_index
                     old_doc.pop("_id", None)
                     insert_result = await self.dbs[new_db_key][collection_name].insert_one(old_doc)
                     LOGGER.info(f"Inserted document {insert_result.inserted_id} into {new_db_key}")
                     await self.dbs[db_key][collection_name].delete_one({"tmdb_id": int(tmdb_id)})
+                    if was_split:
+                        await self.dbs[db_key]["episodes"].delete_many({"show_id": old_show_id})
+                        await self.split_tv_document(next_db_index, old_doc)
+                    await self.set_location(collection_name, old_doc, next_db_index)
+                    await self.adjust_counters(collection_name, old_doc, db_index_int, -1)
+                    await self.adjust_counters(collection_name, old_doc, next_db_index, 1)
                     LOGGER.info(f"Deleted document tmdb_id {tmdb_id} from {db_key}")
                     self.current_db_index = next_db_index
                     await self.update_current_db_index()
@@ -715,35 +1643,25 @@ class Database:
         if media_type == "Movie":
             doc = await self.dbs[db_key]["movie"].find_one({"tmdb_id": tmdb_id})
             if doc and "telegram" in doc:
-                for quality in doc["telegram"]:
-                    try:
-                        old_id = quality.get("id")
-                        if old_id:
-                            decoded_data = await decode_string(old_id)
-                            chat_id = int(f"-100{decoded_data['chat_id']}")
-                            msg_id = int(decoded_data['msg_id'])
-                            create_task(delete_message(chat_id, msg_id))
-                    except Exception as e:
-                        LOGGER.error(f"Failed to queue file for deletion: {e}")
+                await self._delete_file_messages(doc["telegram"])
             
             result = await self.dbs[db_key]["movie"].delete_one({"tmdb_id": tmdb_id})
+            if doc and result.deleted_count:
+                await self.remove_location("movie", doc, int(db_index))
+                await self.adjust_counters("movie", doc, int(db_index), -1)
         else:
-            doc = await self.dbs[db_key]["tv"].find_one({"tmdb_id": tmdb_id})
+            doc = await self.hydrate_tv(int(db_index), await self.dbs[db_key]["tv"].find_one({"tmdb_id": tmdb_id}))
             if doc and "seasons" in doc:
                 for season in doc["seasons"]:
                     for episode in season.get("episodes", []):
-                        for quality in episode.get("telegram", []):
-                            try:
-                                old_id = quality.get("id")
-                                if old_id:
-                                    decoded_data = await decode_string(old_id)
-                                    chat_id = int(f"-100{decoded_data['chat_id']}")
-                                    msg_id = int(decoded_data['msg_id'])
-                                    create_task(delete_message(chat_id, msg_id))
-                            except Exception as e:
-                                LOGGER.error(f"Failed to queue file for deletion: {e}")
+                        await self._delete_file_messages(episode.get("telegram", []))
             
             result = await self.dbs[db_key]["tv"].delete_one({"tmdb_id": tmdb_id})
+            if doc and result.deleted_count:
+                if doc.get("episodes_split"):
+                    await self.dbs[db_key]["episodes"].delete_many({"show_id": doc["_id"]})
+                await self.remove_location("tv", doc, int(db_index))
+                await self.adjust_counters("tv", doc, int(db_index), -1)
         
         if result.deleted_count > 0:
             LOGGER.info(f"{media_type} with tmdb_id {tmdb_id} deleted successfully.")
@@ -758,18 +1676,7 @@ class Database:
         if not movie or "telegram" not in movie:
             return False
 
-        for q in movie["telegram"]:
-            if q.get("id") == id:
-                try:
-                    old_id = q.get("id")
-                    if old_id:
-                        decoded_data = await decode_string(old_id)
-                        chat_id = int(f"-100{decoded_data['chat_id']}")
-                        msg_id = int(decoded_data['msg_id'])
-                        create_task(delete_message(chat_id, msg_id))
-                except Exception as e:
-                    LOGGER.error(f"Failed to queue file for deletion: {e}")
-                break
+        await self._delete_file_messages([q for q in movie["telegram"] if q.get("id") == id][:1])
         
         original_len = len(movie["telegram"])
         movie["telegram"] = [q for q in movie["telegram"] if q.get("id") != id]
@@ -782,124 +1689,151 @@ class Database:
         return result.modified_count > 0
 
     async def delete_tv_episode(self, tmdb_id: int, db_index: int, season_number: int, episode_number: int) -> bool:
-        db_key = f"storage_{db_index}"
-        tv = await self.dbs[db_key]["tv"].find_one({"tmdb_id": tmdb_id})
-        
-        if not tv or "seasons" not in tv:
+        collection = self.dbs[f"storage_{db_index}"]["tv"]
+        tv = await collection.find_one(
+            {"tmdb_id": tmdb_id},
+            {"seasons": {"$elemMatch": {"season_number": season_number}}, "episodes_split": 1}
+        )
+        if tv and tv.get("episodes_split"):
+            return await self._delete_split_episodes(db_index, tv["_id"], season_number, episode_number)
+        if not tv or not tv.get("seasons"):
             return False
-        
-        found = False
-        for season in tv["seasons"]:
-            if season.get("season_number") == season_number:
-                for ep in season["episodes"]:
-                    if ep.get("episode_number") == episode_number:
-                        for quality in ep.get("telegram", []):
-                            try:
-                                old_id = quality.get("id")
-                                if old_id:
-                                    decoded_data = await decode_string(old_id)
-                                    chat_id = int(f"-100{decoded_data['chat_id']}")
-                                    msg_id = int(decoded_data['msg_id'])
-                                    create_task(delete_message(chat_id, msg_id))
-                            except Exception as e:
-                                LOGGER.error(f"Failed to queue file for deletion: {e}")
-                        break
-                
-                original_len = len(season["episodes"])
-                season["episodes"] = [ep for ep in season["episodes"] if ep.get("episode_number") != episode_number]
-                found = original_len > len(season["episodes"])
-                break
-        
-        if not found:
+
+        episode = next(
+            (ep for ep in tv["seasons"][0].get("episodes", []) if ep.get("episode_number") == episode_number),
+            None
+        )
+        if episode is None:
             return False
-        
-        tv['updated_on'] = datetime.utcnow()
-        result = await self.dbs[db_key]["tv"].replace_one({"tmdb_id": tmdb_id}, tv)
+        await self._delete_file_messages(episode.get("telegram", []))
+
+        result = await collection.update_one(
+            {"_id": tv["_id"]},
+            {"$pull": {"seasons.$[s].episodes": {"episode_number": episode_number}},
+             "$set": {"updated_on": datetime.utcnow()}},
+            array_filters=[{"s.season_number": season_number}]
+        )
         return result.modified_count > 0
 
     async def delete_tv_season(self, tmdb_id: int, db_index: int, season_number: int) -> bool:
-        db_key = f"storage_{db_index}"
-        tv = await self.dbs[db_key]["tv"].find_one({"tmdb_id": tmdb_id})
-        
-        if not tv or "seasons" not in tv:
-            return False
-        
-        for season in tv["seasons"]:
-            if season.get("season_number") == season_number:
-                for episode in season.get("episodes", []):
-                    for quality in episode.get("telegram", []):
-                        try:
-                            old_id = quality.get("id")
-                            if old_id:
-                                decoded_data = await decode_string(old_id)
-                                chat_id = int(f"-100{decoded_data['chat_id']}")
-                                msg_id = int(decoded_data['msg_id'])
-                                create_task(delete_message(chat_id, msg_id))
-                        except Exception as e:
-                            LOGGER.error(f"Failed to queue file for deletion: {e}")
-                break
-        
-        original_len = len(tv["seasons"])
-        tv["seasons"] = [s for s in tv["seasons"] if s.get("season_number") != season_number]
-        
-        if len(tv["seasons"]) == original_len:
+        collection = self.dbs[f"storage_{db_index}"]["tv"]
+        tv = await collection.find_one(
+            {"tmdb_id": tmdb_id},
+            {"seasons": {"$elemMatch": {"season_number": season_number}}, "episodes_split": 1}
+        )
+        if tv and tv.get("episodes_split"):
+            return await self._delete_split_episodes(db_index, tv["_id"], season_number)
+        if not tv or not tv.get("seasons"):
             return False
-        
-        tv['updated_on'] = datetime.utcnow()
-        result = await self.dbs[db_key]["tv"].replace_one({"tmdb_id": tmdb_id}, tv)
+
+        for episode in tv["seasons"][0].get("episodes", []):
+            await self._delete_file_messages(episode.get("telegram", []))
+
+        result = await collection.update_one(
+            {"_id": tv["_id"]},
+            {"$pull": {"seasons": {"season_number": season_number}},
+             "$set": {"updated_on": datetime.utcnow()}}
+        )
         return result.modified_count > 0
 
     async def delete_tv_quality(self, tmdb_id: int, db_index: int, season_number: int, episode_number: int, id: str) -> bool:
-        db_key = f"storage_{db_index}"
-        tv = await self.dbs[db_key]["tv"].find_one({"tmdb_id": tmdb_id})
-        
-        if not tv or "seasons" not in tv:
-            return False
-        
-        found = False
-        for season in tv["seasons"]:
-            if season.get("season_number") == season_number:
-                for episode in season["episodes"]:
-                    if episode.get("episode_number") == episode_number and "telegram" in episode:
-                        for q in episode["telegram"]:
-                            if q.get("id") == id:
-                                try:
-                                    old_id = q.get("id")
-                                    if old_id:
-                                        decoded_data = await decode_string(old_id)
-                                        chat_id = int(f"-100{decoded_data['chat_id']}")
-                                        msg_id = int(decoded_data['msg_id'])
-                                        create_task(delete_message(chat_id, msg_id))
-                                except Exception as e:
-                                    LOGGER.error(f"Failed to queue file for deletion: {e}")
-                                break
-                        
-                        original_len = len(episode["telegram"])
-                        episode["telegram"] = [q for q in episode["telegram"] if q.get("id") != id]
-                        found = original_len > len(episode["telegram"])
-                        break
-        
-        if not found:
-            return False
-        tv['updated_on'] = datetime.utcnow()
-        result = await self.dbs[db_key]["tv"].replace_one({"tmdb_id": tmdb_id}, tv)
-        return result.modified_count > 0
+        storage = self.dbs[f"storage_{db_index}"]
+        tv = await storage["tv"].find_one({"tmdb_id": tmdb_id, "episodes_split": True}, {"_id": 1})
+        if tv:
+            result = await storage["episodes"].update_one(
+                {"show_id": tv["_id"], "season_number": season_number, "episode_number": episode_number, "telegram.id": id},
+                {"$pull": {"telegram": {"id": id}}}
+            )
+            if not result.modified_count:
+                return False
+            await storage["tv"].update_one({"_id": tv["_id"]}, {"$set": {"updated_on": datetime.utcnow()}})
+            await self._delete_file_messages([{"id": id}])
+            return True
 
+        result = await storage["tv"].update_one(
+            {"tmdb_id": tmdb_id, "seasons": {"$elemMatch": {
+                "season_number": season_number,
+                "episodes": {"$elemMatch": {"episode_number": episode_number, "telegram.id": id}}
+            }}},
+            {"$pull": {"seasons.$[s].episodes.$[e].telegram": {"id": id}},
+             "$set": {"updated_on": datetime.utcnow()}},
+            array_filters=[{"s.season_number": season_number}, {"e.episode_number": episode_number}]
+        )
+        if not result.modified_count:
+            return False
+        await self._delete_file_messages([{"id": id}])
+        return True
+
+
+    async def remove_qualities(self, ids: List[str], db_index: int) -> Dict[str, int]:
+        """
+        Pull every QualityDetail whose id is in `ids` from one storage DB with bulk updates,
+        then drop episodes, seasons and documents that were left empty by it.
+        """
+        db = self.dbs[f"storage_{db_index}"]
+        removed = {"movie": 0, "tv": 0}
+        await self.forget_files(ids)
+
+        projection = {"imdb_id": 1, "tmdb_id": 1, "title": 1, "release_year": 1, "genres": 1}
+
+        affected = await db["movie"].distinct("_id", {"telegram.id": {"$in": ids}})
+        if affected:
+            await db["movie"].update_many({"_id": {"$in": affected}}, {"$pull": {"telegram": {"id": {"$in": ids}}}})
+            emptied = await db["movie"].find({"_id": {"$in": affected}, "telegram": {"$size": 0}}, projection).to_list(None)
+            if emptied:
+                result = await db["movie"].delete_many({"_id": {"$in": [doc["_id"] for doc in emptied]}})
+                removed["movie"] = result.deleted_count
+                for doc in emptied:
+                    await self.remove_location("movie", doc, db_index)
+                    await self.adjust_counters("movie", doc, db_index, -1)
+
+        affected = await db["tv"].distinct("_id", {"seasons.episodes.telegram.id": {"$in": ids}})
+        if affected:
+            await db["tv"].bulk_write([
+                UpdateMany({"_id": {"$in": affected}}, {"$pull": {"seasons.$[].episodes.$[].telegram": {"id": {"$in": ids}}}}),
+                UpdateMany({"_id": {"$in": affected}}, {"$pull": {"seasons.$[].episodes": {"telegram": {"$size": 0}}}}),
+                UpdateMany({"_id": {"$in": affected}}, {"$pull": {"seasons": {"episodes": {"$size": 0}}}}),
+            ], ordered=True)
+        affected_split = await db["episodes"].distinct("show_id", {"telegram.id": {"$in": ids}})
+        if affected_split:
+            await db["episodes"].update_many({"telegram.id": {"$in": ids}}, {"$pull": {"telegram": {"id": {"$in": ids}}}})
+            await db["episodes"].delete_many({"show_id": {"$in": affected_split}, "telegram": {"$size": 0}})
+            await self.refresh_season_summaries(db_index, affected_split)
+            affected = (affected or []) + affected_split
+        if affected:
+            emptied = await db["tv"].find({"_id": {"$in": affected}, "seasons": {"$size": 0}}, projection).to_list(None)
+            if emptied:
+                result = await db["tv"].delete_many({"_id": {"$in": [doc["_id"] for doc in emptied]}})
+                removed["tv"] = result.deleted_count
+                for doc in emptied:
+                    await self.remove_location("tv", doc, db_index)
+                    await self.adjust_counters("tv", doc, db_index, -1)
+
+        return removed
 
     # Get per-DB statistics (movies, tv shows, used size, etc.)
     async def get_database_stats(self):
-        stats = []
-        for key in self.dbs.keys():
-            if key.startswith("storage_"):
-                db = self.dbs[key]
-                movie_count = await db["movie"].count_documents({})
-                tv_count = await db["tv"].count_documents({})
-                db_stats = await db.command("dbstats")
-                stats.append({
-                    "db_name": key,
-                    "movie_count": movie_count,
-                    "tv_count": tv_count,
-                    "storageSize": db_stats.get("storageSize", 0),
-                    "dataSize": db_stats.get("dataSize", 0)
-                })
-        return stats
+        async def shard_stats(db_index, db):
+            if self.counters_ready:
+                movie_counts, tv_counts, db_stats = await gather(
+                    self.get_counts("movie", [db_index]),
+                    self.get_counts("tv", [db_index]),
+                    db.command("dbstats")
+                )
+                movie_count, tv_count = movie_counts[db_index], tv_counts[db_index]
+            else:
+                movie_count, tv_count, db_stats = await gather(
+                    db["movie"].count_documents({}),
+                    db["tv"].count_documents({}),
+                    db.command("dbstats")
+                )
+            return {
+                "db_name": f"storage_{db_index}",
+                "movie_count": movie_count,
+                "tv_count": tv_count,
+                "storageSize": db_stats.get("storageSize", 0),
+                "dataSize": db_stats.get("dataSize", 0)
+            }
+
+        stats = await self.fan_out(shard_stats)
+        return [stats[db_index] for db_index in sorted(stats)]
@@ -0,0 +1,58 @@
+from pymongo import ASCENDING, DeleteMany, ReplaceOne
+
+from Backend.helper.database import Database
+
+# Synchronous counterparts of Database.hydrate_tv and friends, for the plugins that work on a
+# storage DB through pymongo. Shows marked `episodes_split` keep only season summaries in
+# `seasons`, their episodes live in the `episodes` collection.
+
+
+def hydrate_tv(storage, tv: dict) -> dict:
+    """Put a split show's episodes back into `seasons`, same shape as an embedded show."""
+    if not tv or not tv.get("episodes_split"):
+        return tv
+    seasons = {}
+    cursor = storage["episodes"].find({"show_id": tv["_id"]}, {"_id": 0, "show_id": 0}).sort(
+        [("season_number", ASCENDING), ("episode_number", ASCENDING)]
+    )
+    for episode in cursor:
+        number = episode.pop("season_number")
+        seasons.setdefault(number, {"season_number": number, "episodes": []})["episodes"].append(episode)
+    tv["seasons"] = [seasons[number] for number in sorted(seasons)]
+    return tv
+
+
+def save_tv_seasons(storage, tv: dict):
+    """Write a hydrated show's `seasons` back in whichever layout the show is stored in."""
+    seasons = [season for season in tv.get("seasons", []) if season.get("episodes")]
+    if not tv.get("episodes_split"):
+        storage["tv"].update_one({"_id": tv["_id"]}, {"$set": {"seasons": seasons}})
+        return
+
+    ops = [
+        ReplaceOne(
+            {"show_id": tv["_id"], "season_number": season["season_number"], "episode_number": episode["episode_number"]},
+            {**episode, "show_id": tv["_id"], "season_number": season["season_number"]},
+            upsert=True
+        )
+        for season in seasons
+        for episode in season["episodes"]
+    ]
+    kept = [
+        {"season_number": season["season_number"], "episode_number": episode["episode_number"]}
+        for season in seasons
+        for episode in season["episodes"]
+    ]
+    # Episodes dropped from the hydrated show go from the collection as well.
+    ops.append(DeleteMany({"show_id": tv["_id"], "$nor": kept} if kept else {"show_id": tv["_id"]}))
+    storage["episodes"].bulk_write(ops, ordered=True)
+    storage["tv"].update_one(
+        {"_id": tv["_id"]},
+        {"$set": {"seasons": Database._season_summaries(seasons)}}
+    )
+
+
+def delete_tv(storage, tv: dict):
+    storage["tv"].delete_one({"_id": tv["_id"]})
+    if tv.get("episodes_split"):
+        storage["episodes"].delete_many({"show_id": tv["_id"]})
@@ -1,12 +1,30 @@
 import httpx
 import re
 import asyncio
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+
+from Backend.helper.cache import HOUR, MISS, Cache
+from Backend.helper.providers import CINEMETA, ProviderError, ProviderUnavailable, parse_retry_after
+from Backend.helper.single_flight import SingleFlight
 
 BASE_URL = "https://v3-cinemeta.strem.io"
 
 _client: Optional[httpx.AsyncClient] = None
 _client_lock = asyncio.Lock()
+# Concurrent requests for the same Cinemeta URL share one response.
+_flights = SingleFlight()
+# /meta documents cut down to the fields get_detail and the episode index read, one entry per
+# title instead of per episode. The (season, episode) index has tuple keys, so only the meta
+# is persisted and the index lives in memory, rebuilt on load.
+META_CACHE = Cache("cinemeta_meta", ttl=6 * HOUR, negative_ttl=HOUR // 2, max_size=500)
+META_ENTRIES = Cache("cinemeta_entries", ttl=6 * HOUR, negative_ttl=HOUR // 2, max_size=500, persistent=False)
+
+META_FIELDS = (
+    "imdb_id", "id", "moviedb_id", "type", "name", "description", "genres", "genre",
+    "year", "releaseInfo", "released", "imdbRating", "poster", "background", "logo",
+    "runtime", "director", "cast",
+)
+VIDEO_FIELDS = ("season", "episode", "title", "thumbnail", "overview", "released")
 
 
 async def _get_client() -> httpx.AsyncClient:
@@ -20,6 +38,24 @@ async def _get_client() -> httpx.AsyncClient:
         return _client
 
 
+async def _fetch_json(url: str) -> Optional[Any]:
+    return await _flights.do(url, _get_json, url)
+
+
+async def _get_json(url: str) -> Optional[Any]:
+    return await CINEMETA.call(_request_json, url)
+
+
+async def _request_json(url: str) -> Optional[Any]:
+    client = await _get_client()
+    resp = await client.get(url)
+    if resp.status_code == 429 or resp.status_code >= 500:
+        raise ProviderError(resp.status_code, parse_retry_after(resp.headers))
+    if resp.status_code != 200:
+        return None
+    return resp.json()
+
+
 def extract_first_year(year_string) -> int:
     if not year_string:
         return 0
@@ -35,14 +71,12 @@ async def search_title(query: str, type: str) -> Optional[Dict[str, Any]]:
     Query Cinemeta search endpoint for a title.
     type = 'tvSeries' or 'movie' (your code uses 'tvSeries' for TV)
     """
-    client = await _get_client()
     cinemeta_type = "series" if type == "tvSeries" else type
     url = f"{BASE_URL}/catalog/{cinemeta_type}/imdb/search={query}.json"
     try:
-        resp = await client.get(url)
-        if resp.status_code != 200:
+        data = await _fetch_json(url)
+        if data is None:
             return None
-        data = resp.json()
         if data and 'metas' in data and data['metas']:
             meta = data['metas'][0]
             return {
@@ -53,25 +87,21 @@ async def search_title(query: str, type: str) -> Optional[Dict[str, Any]]:
                 'poster': meta.get('poster', '')
             }
         return None
+    except ProviderUnavailable:
+        # Not a "no match", the caller must not cache it as one.
+        raise
     except Exception:
         return None
 
 
 async def get_detail(imdb_id: str, media_type: str) -> Optional[Dict[str, Any]]:
-    client = await _get_client()
     cinemeta_type = "series" if media_type in ["tvSeries", "tv"] else "movie"
 
     try:
-        url = f"{BASE_URL}/meta/{cinemeta_type}/{imdb_id}.json"
-        resp = await client.get(url)
-
-        if resp.status_code != 200:
-            return None
-
-        data = resp.json()
-        meta = data.get("meta")
-        if not meta:
+        entry = await get_meta(cinemeta_type, imdb_id)
+        if not entry:
             return None
+        meta = entry["meta"]
 
         # ---- Extract year ----
         year_value = 0
@@ -99,33 +129,81 @@ async def get_detail(imdb_id: str, media_type: str) -> Optional[Dict[str, Any]]:
             "videos": meta.get("videos", [])
         }
 
+    except ProviderUnavailable:
+        raise
     except Exception:
         return None
 
 
-async def get_season(imdb_id: str, season_id: int, episode_id: int) -> Optional[Dict[str, Any]]:
+def format_episode(video: Dict[str, Any], season_id: int, episode_id: int) -> Dict[str, Any]:
+    return {
+        'title': video.get('title', f'Episode {episode_id}'),
+        'no': str(episode_id),
+        'season': str(season_id),
+        'image': video.get('thumbnail', ''),
+        'plot': video.get('overview', ''),
+        'released': video.get('released', '')
+    }
+
+
+def index_episodes(videos) -> Dict[Tuple[str, str], Dict[str, Any]]:
     """
-    Return episode meta for a specific season/episode using Cinemeta series endpoint.
+    Map (season, episode) of a series' `videos` to the same shape get_season returns,
+    so a whole season pack can be matched against one get_detail response.
     """
-    client = await _get_client()
+    index = {}
+    for video in videos or []:
+        key = (str(video.get('season', '')), str(video.get('episode', '')))
+        if key not in index:
+            index[key] = format_episode(video, key[0], key[1])
+    return index
+
+
+async def get_meta(cinemeta_type: str, imdb_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Cached `{"meta": ..., "episodes": index_episodes(videos)}` of a Cinemeta title, shared
+    by get_detail and get_season. Expired entries are fetched again on the next lookup.
+    """
+    key = (cinemeta_type, imdb_id)
+    cached = META_ENTRIES.peek(key)
+    if cached is not MISS:
+        return cached
+    return await _flights.do(("meta",) + key, _load_meta, cinemeta_type, imdb_id)
+
+
+def _project_meta(meta: Dict[str, Any]) -> Dict[str, Any]:
+    projected = {field: meta[field] for field in META_FIELDS if field in meta}
+    projected["videos"] = [
+        {field: video[field] for field in VIDEO_FIELDS if field in video}
+        for video in meta.get("videos") or []
+    ]
+    return projected
+
+
+async def _load_meta(cinemeta_type: str, imdb_id: str) -> Optional[Dict[str, Any]]:
+    key = (cinemeta_type, imdb_id)
+    meta = await META_CACHE.get(key)
+    if meta is MISS:
+        data = await _fetch_json(f"{BASE_URL}/meta/{cinemeta_type}/{imdb_id}.json")
+        meta = _project_meta(data["meta"]) if data and data.get("meta") else None
+        await META_CACHE.set(key, meta)
+    entry = {"meta": meta, "episodes": index_episodes(meta.get("videos"))} if meta else None
+    META_ENTRIES.set_memory(key, entry)
+    return entry
+
+
+async def episode_index(imdb_id: str) -> Dict[Tuple[str, str], Dict[str, Any]]:
     try:
-        url = f"{BASE_URL}/meta/series/{imdb_id}.json"
-        resp = await client.get(url)
-        if resp.status_code != 200:
-            return None
-        data = resp.json()
-        if 'meta' in data and 'videos' in data['meta']:
-            for video in data['meta']['videos']:
-                if (str(video.get('season', '')) == str(season_id) and
-                        str(video.get('episode', '')) == str(episode_id)):
-                    return {
-                        'title': video.get('title', f'Episode {episode_id}'),
-                        'no': str(episode_id),
-                        'season': str(season_id),
-                        'image': video.get('thumbnail', ''),
-                        'plot': video.get('overview', ''),
-                        'released': video.get('released', '')
-                    }
-        return None
+        entry = await get_meta("series", imdb_id)
+    except ProviderUnavailable:
+        raise
     except Exception:
-        return None
+        return {}
+    return entry["episodes"] if entry else {}
+
+
+async def get_season(imdb_id: str, season_id: int, episode_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Return episode meta for a specific season/episode using Cinemeta series endpoint.
+    """
+    return (await episode_index(imdb_id)).get((str(season_id), str(episode_id)))
@@ -0,0 +1,262 @@
+import asyncio
+from contextlib import asynccontextmanager
+from time import monotonic
+
+from Backend import db
+from Backend.config import Telegram
+from Backend.helper.metadata import parse_filename, resolve_metadata_batch, translate_metadata
+from Backend.helper.pyro import clean_filename, remove_urls
+from Backend.helper.task_manager import edit_message
+from Backend.logger import LOGGER
+
+# -------------------------------
+# Tunables
+# -------------------------------
+QUEUE_SIZE = 500
+PARSE_WORKERS = 2
+RESOLVE_WORKERS = 4
+# Files arriving within this window are resolved together, a season pack looks its show up once.
+RESOLVE_BATCH_WINDOW = 1.0
+RESOLVE_BATCH_LIMIT = 100
+TRANSLATE_WORKERS = 4
+BULK_INGEST_LIMIT = 50
+JOURNAL_MAX_ATTEMPTS = 3
+
+# Writes of the same title are serialized through one of these, unrelated titles rarely share one.
+LOCK_STRIPES = 64
+title_locks = [asyncio.Lock() for _ in range(LOCK_STRIPES)]
+
+
+def title_key(metadata_info: dict) -> str:
+    return str(
+        metadata_info.get("imdb_id") or metadata_info.get("tmdb_id")
+        or f"{metadata_info.get('title')}:{metadata_info.get('year')}"
+    )
+
+
+@asynccontextmanager
+async def title_lock(records):
+    # Stripes are always taken in ascending order so two batches can't deadlock.
+    stripes = sorted({hash(title_key(record[0])) % LOCK_STRIPES for record in records})
+    for stripe in stripes:
+        await title_locks[stripe].acquire()
+    try:
+        yield
+    finally:
+        for stripe in reversed(stripes):
+            title_locks[stripe].release()
+
+
+# -------------------------------
+# Stages
+# -------------------------------
+class Stage:
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.busy = 0
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def observe(self, latency: float):
+        self.batches += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def stats(self) -> dict:
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "queued": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+            "busy": self.busy,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "avg_latency_ms": round(self.total_latency / self.batches * 1000, 1) if self.batches else 0,
+            "max_latency_ms": round(self.max_latency * 1000, 1),
+        }
+
+
+parse_stage = Stage("parse", PARSE_WORKERS)
+resolve_stage = Stage("resolve", RESOLVE_WORKERS)
+translate_stage = Stage("translate", TRANSLATE_WORKERS)
+persist_stage = Stage("persist", max(1, Telegram.INGEST_WORKERS))
+STAGES = (parse_stage, resolve_stage, translate_stage, persist_stage)
+pipeline_started = False
+
+
+async def parse(item: dict):
+    item["parsed"] = await parse_filename(
+        clean_filename(item["title"]), item["channel"], item["msg_id"], item.get("default_source")
+    )
+    return item if item["parsed"] else None
+
+
+async def resolve(items: list) -> list:
+    results = await resolve_metadata_batch([item.pop("parsed") for item in items], translate=False)
+    for i, (item, metadata_info) in enumerate(zip(items, results)):
+        if not metadata_info or isinstance(metadata_info, Exception):
+            continue
+        item["metadata"] = metadata_info
+        results[i] = item
+        if item.get("new_caption"):
+            asyncio.create_task(edit_message(
+                chat_id=int(f"-100{item['channel']}"),
+                msg_id=item["msg_id"],
+                new_caption=item["new_caption"]
+            ))
+    return results
+
+
+async def translate(item: dict):
+    # The translation service batches these with other files' fields behind the scenes.
+    metadata_info = await translate_metadata(item["metadata"])
+    title = remove_urls(item["title"])
+    if not title.endswith(('.mkv', '.mp4')):
+        title += '.mkv'
+    return metadata_info, item["channel"], item["msg_id"], item["size"], title
+
+
+def each(func):
+    # Run a per-item stage function over a batch, keeping failures per item.
+    async def run(items: list) -> list:
+        return await asyncio.gather(*(func(item) for item in items), return_exceptions=True)
+    return run
+
+
+async def run_stage(stage: Stage, func, next_stage: Stage, batch_limit: int = 1, batch_window: float = 0):
+    while True:
+        items = [await stage.queue.get()]
+        if batch_limit > 1:
+            await asyncio.sleep(batch_window)
+            while not stage.queue.empty() and len(items) < batch_limit:
+                items.append(stage.queue.get_nowait())
+
+        stage.busy += 1
+        start = monotonic()
+        try:
+            results = await func(items)
+        except Exception as e:
+            results = [e] * len(items)
+        finally:
+            stage.observe(monotonic() - start)
+            stage.busy -= 1
+            for _ in items:
+                stage.queue.task_done()
+
+        for item, result in zip(items, results):
+            if isinstance(result, Exception):
+                # Left in the journal, the next startup retries it.
+                stage.failed += 1
+                LOGGER.error(f"Ingest {stage.name} failed for file: {item['title']} (ID: {item['msg_id']}): {result}")
+            elif result is None:
+                stage.dropped += 1
+                LOGGER.warning(f"Metadata failed for file: {item['title']} (ID: {item['msg_id']})")
+                await db.journal_done([(item["channel"], item["msg_id"])])
+                # Let a later repost of the file try again.
+                await db.release_file(item["channel"], item["msg_id"])
+            else:
+                stage.processed += 1
+                await next_stage.queue.put(result)
+
+
+async def persist_worker():
+    stage = persist_stage
+    while True:
+        batch = [await stage.queue.get()]
+        # Files that piled up while we were writing go to the database in one bulk write.
+        while not stage.queue.empty() and len(batch) < BULK_INGEST_LIMIT:
+            batch.append(stage.queue.get_nowait())
+
+        stage.busy += 1
+        start = monotonic()
+        try:
+            async with title_lock(batch):
+                if len(batch) > 1:
+                    stored = await db.bulk_ingest(batch)
+                    LOGGER.info(f"Bulk ingested {sum(stored)}/{len(batch)} files")
+                else:
+                    metadata_info, channel, msg_id, size, title = batch[0]
+                    updated_id = await db.insert_media(metadata_info, channel=channel, msg_id=msg_id, size=size, name=title)
+                    stored = [bool(updated_id)]
+                    if updated_id:
+                        LOGGER.info(f"{metadata_info['media_type']} updated with ID: {updated_id}")
+                    else:
+                        LOGGER.info("Update failed due to validation errors.")
+                # Files that weren't stored stay journaled, the next startup retries them.
+                await db.journal_done([
+                    (channel, msg_id) for (_, channel, msg_id, _, _), ok in zip(batch, stored) if ok
+                ])
+                # Nothing was indexed for these, a repost must not be skipped as a duplicate.
+                for (_, channel, msg_id, _, _), ok in zip(batch, stored):
+                    if not ok:
+                        await db.release_file(channel, msg_id)
+            stage.processed += sum(stored)
+            stage.dropped += len(batch) - sum(stored)
+        except Exception as e:
+            stage.failed += len(batch)
+            LOGGER.error(f"Ingest persist failed for {len(batch)} files: {e}")
+            for _, channel, msg_id, _, _ in batch:
+                try:
+                    await db.release_file(channel, msg_id)
+                except Exception:
+                    pass
+        finally:
+            stage.observe(monotonic() - start)
+            stage.busy -= 1
+            for _ in batch:
+                stage.queue.task_done()
+
+
+def start_pipeline():
+    global pipeline_started
+    if pipeline_started:
+        return
+    pipeline_started = True
+    for _ in range(parse_stage.workers):
+        asyncio.create_task(run_stage(parse_stage, each(parse), resolve_stage))
+    for _ in range(resolve_stage.workers):
+        asyncio.create_task(run_stage(
+            resolve_stage, resolve, translate_stage, RESOLVE_BATCH_LIMIT, RESOLVE_BATCH_WINDOW
+        ))
+    for _ in range(translate_stage.workers):
+        asyncio.create_task(run_stage(translate_stage, each(translate), persist_stage))
+    for _ in range(persist_stage.workers):
+        asyncio.create_task(persist_worker())
+
+
+async def submit(channel: int, msg_id: int, title: str, size: str, default_source=None, new_caption=None):
+    # Waits when the pipeline is full, this is the backpressure on the receiver.
+    await parse_stage.queue.put({
+        "channel": channel,
+        "msg_id": msg_id,
+        "title": title,
+        "size": size,
+        "default_source": default_source,
+        "new_caption": new_caption,
+    })
+
+
+async def replay_journal():
+    # Files accepted before the last restart that never made it to the database.
+    entries = await db.pending_journal()
+    if entries:
+        LOGGER.info(f"Replaying {len(entries)} journaled files")
+    for entry in entries:
+        channel, msg_id = entry["channel"], entry["msg_id"]
+        if await db.journal_attempt(channel, msg_id) > JOURNAL_MAX_ATTEMPTS:
+            LOGGER.warning(f"Dropping journaled file {entry['title']} (ID: {msg_id}) after {JOURNAL_MAX_ATTEMPTS} attempts")
+            await db.journal_done([(channel, msg_id)])
+            continue
+        await submit(channel, msg_id, entry["title"], entry["size"], entry.get("default_source"))
+
+
+def pipeline_stats() -> list:
+    return [stage.stats() for stage in STAGES]
@@ -0,0 +1,113 @@
+import asyncio
+from collections import defaultdict
+from time import time
+
+from Backend import db
+from Backend.config import Telegram
+from Backend.helper.encrypt import decode_string
+from Backend.helper.pyro import is_media, iter_messages_batched
+from Backend.helper.rate_limiter import tg_call
+from Backend.logger import LOGGER
+from Backend.pyrofork.bot import StreamBot
+
+check_running = False
+
+
+async def collect_telegram_entries():
+    """
+    Scan every storage DB and group Telegram-backed QualityDetail entries by channel.
+    Returns {chat_id: {msg_id: [(db_index, id, label), ...]}}.
+    """
+    entries = defaultdict(lambda: defaultdict(list))
+
+    async def add(db_index, quality, label):
+        qid = quality.get("id") or ""
+        if not qid or qid.startswith(("http://", "https://")):
+            return
+        try:
+            decoded = await decode_string(qid)
+            entries[int(decoded["chat_id"])][int(decoded["msg_id"])].append((db_index, qid, label))
+        except Exception as e:
+            LOGGER.debug(f"Could not decode quality id {qid}: {e}")
+
+    for db_index in range(1, len(db.dbs)):
+        storage = db.dbs[f"storage_{db_index}"]
+        async for movie in storage["movie"].find({}, {"title": 1, "telegram": 1}):
+            for q in movie.get("telegram") or []:
+                await add(db_index, q, f"🎬 {movie.get('title')} | {q.get('name')}")
+        titles = {}
+        async for tv in storage["tv"].find({}, {"title": 1, "seasons": 1}):
+            titles[tv["_id"]] = tv.get("title")
+            for season in tv.get("seasons", []):
+                for ep in season.get("episodes", []):
+                    for q in ep.get("telegram") or []:
+                        label = f"📺 {tv.get('title')} S{season.get('season_number')}E{ep.get('episode_number')} | {q.get('name')}"
+                        await add(db_index, q, label)
+        # Episodes of shows stored in split form.
+        async for ep in storage["episodes"].find({}, {"show_id": 1, "season_number": 1, "episode_number": 1, "telegram": 1}):
+            for q in ep.get("telegram") or []:
+                label = f"📺 {titles.get(ep['show_id'])} S{ep.get('season_number')}E{ep.get('episode_number')} | {q.get('name')}"
+                await add(db_index, q, label)
+    return entries
+
+
+async def find_dead_entries(progress=None):
+    entries = await collect_telegram_entries()
+    total = sum(len(m) for m in entries.values())
+    checked = 0
+    dead = []
+
+    for chat_id, by_msg in entries.items():
+        try:
+            async for messages in iter_messages_batched(int(f"-100{chat_id}"), sorted(by_msg)):
+                for message in messages:
+                    if message.empty or not is_media(message):
+                        dead.extend(by_msg.get(message.id, []))
+                checked += len(messages)
+                if progress:
+                    await progress(checked, total)
+        except Exception as e:
+            # A channel we can't read is not proof that its files are gone.
+            LOGGER.error(f"Skipping link check of channel {chat_id}: {e}")
+            checked += len(by_msg)
+
+    return dead, total
+
+
+async def remove_dead_entries(dead):
+    by_db = defaultdict(set)
+    for db_index, qid, _ in dead:
+        by_db[db_index].add(qid)
+
+    removed = {"movie": 0, "tv": 0}
+    for db_index, ids in by_db.items():
+        result = await db.remove_qualities(list(ids), db_index)
+        removed["movie"] += result["movie"]
+        removed["tv"] += result["tv"]
+    return removed
+
+
+async def link_check_loop():
+    global check_running
+    if Telegram.LINK_CHECK_INTERVAL <= 0:
+        return
+    while True:
+        await asyncio.sleep(Telegram.LINK_CHECK_INTERVAL * 3600)
+        if check_running:
+            continue
+        check_running = True
+        try:
+            start = time()
+            dead, total = await find_dead_entries()
+            text = f"🔗 Telegram link kontrolü\n\nKontrol edilen: {total}\nÇalışmayan: {len(dead)}"
+            if dead and Telegram.LINK_CHECK_AUTO_REMOVE:
+                removed = await remove_dead_entries(dead)
+                text += f"\nSilinen film: {removed['movie']} | Silinen dizi: {removed['tv']}"
+            text += f"\nSüre: {int(time() - start)}s"
+            LOGGER.info(text.replace("\n", " "))
+            if dead:
+                await tg_call(StreamBot, StreamBot.send_message, Telegram.OWNER_ID, text)
+        except Exception as e:
+            LOGGER.error(f"Scheduled link check failed: {e}")
+        finally:
+            check_running = False
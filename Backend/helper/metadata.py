@@ -3,26 +3,29 @@ import PTN
 import re
 from datetime import datetime, timezone
 
-from deep_translator import GoogleTranslator
-from Backend.helper.imdb import get_detail, get_season, search_title
+from Backend.helper.imdb import episode_index, get_detail, search_title
 from themoviedb import aioTMDb
 from Backend.config import Telegram
 import Backend
 from Backend.logger import LOGGER
 from Backend.helper.encrypt import encode_string
+from Backend.helper.cache import DAY, HOUR, MISS, Cache
+from Backend.helper.providers import TMDB, ProviderUnavailable
+from Backend.helper.single_flight import SingleFlight
+from Backend.helper.translation import translator
 
 # -------------------------------------------------
 # CONFIG
 # -------------------------------------------------
 tmdb = aioTMDb(key=Telegram.TMDB_API, language="en-US", region="US")
 
-IMDB_CACHE = {}
-TMDB_SEARCH_CACHE = {}
-TMDB_DETAILS_CACHE = {}
-EPISODE_CACHE = {}
-TRANSLATE_CACHE = {}
+IMDB_CACHE = Cache("imdb_search", ttl=7 * DAY, negative_ttl=6 * HOUR)
+TMDB_SEARCH_CACHE = Cache("tmdb_search", ttl=7 * DAY, negative_ttl=6 * HOUR)
+TMDB_DETAILS_CACHE = Cache("tmdb_details", ttl=DAY, max_size=2000)
+EPISODE_CACHE = Cache("tmdb_episode", ttl=DAY, max_size=5000)
 
-API_SEMAPHORE = asyncio.Semaphore(12)
+# Concurrent misses for the same key wait for one upstream call.
+flights = SingleFlight()
 
 # -------------------------------------------------
 # GENRE NORMALIZATION
@@ -131,90 +134,152 @@ def to_iso_datetime(date_value):
     except Exception:
         return ""
 
-def translate_text_safe(text):
-    if not text or not str(text).strip():
-        return ""
-    if text in TRANSLATE_CACHE:
-        return TRANSLATE_CACHE[text]
-    try:
-        tr = GoogleTranslator(source="en", target="tr").translate(text)
-    except Exception:
-        tr = text
-    TRANSLATE_CACHE[text] = tr
-    return tr
+def keep_text(text):
+    return text or ""
+
+TRANSLATED_FIELDS = ("description", "episode_title", "episode_overview")
+
+async def translate_metadata(info):
+    # For metadata resolved with translate=False, the ingest pipeline translates in its own stage.
+    fields = [field for field in TRANSLATED_FIELDS if field in info]
+    # All fields of one title go out together and end up in the same upstream batch.
+    for field, text in zip(fields, await translator.translate_many([info[f] for f in fields])):
+        info[field] = text
+    return info
 
 # -------------------------------------------------
 # SAFE SEARCH
 # -------------------------------------------------
 async def safe_imdb_search(title, type_):
     key = f"{type_}:{title}"
-    if key in IMDB_CACHE:
-        return IMDB_CACHE[key]
+    cached = await IMDB_CACHE.get(key)
+    if cached is not MISS:
+        return cached
     try:
-        async with API_SEMAPHORE:
-            res = await search_title(title, type_)
-        imdb_id = res["id"] if res else None
-        IMDB_CACHE[key] = imdb_id
-        return imdb_id
+        return await flights.do(("imdb_search", key), _imdb_search, key, title, type_)
+    except ProviderUnavailable:
+        # Not a "no match", the ingest pipeline keeps the file journaled and retries it.
+        raise
     except Exception:
         return None
 
+async def _imdb_search(key, title, type_):
+    # Cinemeta requests are rate limited inside imdb.py.
+    res = await search_title(title, type_)
+    imdb_id = res["id"] if res else None
+    await IMDB_CACHE.set(key, imdb_id)
+    return imdb_id
+
 async def safe_tmdb_search(title, type_, year=None):
+    # Returns the TMDB id of the best match.
     key = f"{type_}:{title}:{year}"
-    if key in TMDB_SEARCH_CACHE:
-        return TMDB_SEARCH_CACHE[key]
+    cached = await TMDB_SEARCH_CACHE.get(key)
+    if cached is not MISS:
+        return cached
     try:
-        async with API_SEMAPHORE:
-            res = (
-                await tmdb.search().movies(title, year=year)
-                if type_ == "movie"
-                else await tmdb.search().tv(title)
-            )
-        TMDB_SEARCH_CACHE[key] = res[0] if res else None
-        return TMDB_SEARCH_CACHE[key]
+        return await flights.do(("tmdb_search", key), _tmdb_search, key, title, type_, year)
+    except ProviderUnavailable:
+        raise
     except Exception:
         return None
 
+async def _tmdb_search(key, title, type_, year):
+    res = (
+        await TMDB.call(tmdb.search().movies, title, year=year)
+        if type_ == "movie"
+        else await TMDB.call(tmdb.search().tv, title)
+    )
+    tmdb_id = res[0].id if res else None
+    await TMDB_SEARCH_CACHE.set(key, tmdb_id)
+    return tmdb_id
+
 # -------------------------------------------------
 # TMDB FETCHERS
 # -------------------------------------------------
+# Only the fields the metadata builders read are cached, already formatted, so entries
+# are plain BSON and survive restarts.
+def _tmdb_summary(d):
+    return {
+        "tmdb_id": d.id,
+        "imdb_id": getattr(d.external_ids, "imdb_id", None),
+        "poster": format_tmdb_image(d.poster_path),
+        "backdrop": format_tmdb_image(d.backdrop_path, "original"),
+        "logo": get_tmdb_logo(d.images),
+        "rate": d.vote_average or 0,
+        "description": keep_text(d.overview),
+        "genres": [g.name for g in d.genres],
+        "cast": [c.name for c in d.credits.cast],
+    }
+
 async def _tmdb_tv_details(tid):
-    if tid in TMDB_DETAILS_CACHE:
-        return TMDB_DETAILS_CACHE[tid]
-    async with API_SEMAPHORE:
-        d = await tmdb.tv(tid).details(
-            append_to_response="external_ids,credits"
-        )
-        d.images = await tmdb.tv(tid).images()
-    TMDB_DETAILS_CACHE[tid] = d
-    return d
+    cached = await TMDB_DETAILS_CACHE.get(("tv", tid))
+    if cached is not MISS:
+        return cached
+    return await flights.do(("tv_details", tid), _load_tmdb_tv_details, tid)
+
+async def _load_tmdb_tv_details(tid):
+    d = await TMDB.call(
+        tmdb.tv(tid).details,
+        append_to_response="external_ids,credits"
+    )
+    d.images = await TMDB.call(tmdb.tv(tid).images)
+    tv = {
+        **_tmdb_summary(d),
+        "title": d.name,
+        "year": d.first_air_date.year if d.first_air_date else 0,
+        "released": to_iso_datetime(d.first_air_date),
+    }
+    await TMDB_DETAILS_CACHE.set(("tv", tid), tv)
+    return tv
 
 async def _tmdb_episode_details(tid, s, e):
     key = (tid, s, e)
-    if key in EPISODE_CACHE:
-        return EPISODE_CACHE[key]
-    async with API_SEMAPHORE:
-        d = await tmdb.episode(tid, s, e).details(
-            append_to_response="images"
-        )
-    EPISODE_CACHE[key] = d
-    return d
+    cached = await EPISODE_CACHE.get(key)
+    if cached is not MISS:
+        return cached
+    return await flights.do(("episode_details", key), _load_tmdb_episode_details, key)
+
+async def _load_tmdb_episode_details(key):
+    tid, s, e = key
+    d = await TMDB.call(
+        tmdb.episode(tid, s, e).details,
+        append_to_response="images"
+    )
+    ep = {
+        "title": keep_text(d.name),
+        "backdrop": format_tmdb_image(d.still_path, "original") if d.still_path else "",
+        "overview": keep_text(d.overview),
+        "released": to_iso_datetime(d.air_date),
+    }
+    await EPISODE_CACHE.set(key, ep)
+    return ep
 
 async def _tmdb_movie_details(mid):
-    if mid in TMDB_DETAILS_CACHE:
-        return TMDB_DETAILS_CACHE[mid]
-    async with API_SEMAPHORE:
-        d = await tmdb.movie(mid).details(
-            append_to_response="external_ids,credits"
-        )
-        d.images = await tmdb.movie(mid).images()
-    TMDB_DETAILS_CACHE[mid] = d
-    return d
+    cached = await TMDB_DETAILS_CACHE.get(("movie", mid))
+    if cached is not MISS:
+        return cached
+    return await flights.do(("movie_details", mid), _load_tmdb_movie_details, mid)
+
+async def _load_tmdb_movie_details(mid):
+    d = await TMDB.call(
+        tmdb.movie(mid).details,
+        append_to_response="external_ids,credits"
+    )
+    d.images = await TMDB.call(tmdb.movie(mid).images)
+    movie = {
+        **_tmdb_summary(d),
+        "title": d.title,
+        "year": d.release_date.year if d.release_date else 0,
+        "released": to_iso_datetime(d.release_date),
+        "runtime": f"{d.runtime} min" if d.runtime else "",
+    }
+    await TMDB_DETAILS_CACHE.set(("movie", mid), movie)
+    return movie
 
 # -------------------------------------------------
 # MAIN ENTRY
 # -------------------------------------------------
-async def metadata(filename, channel, msg_id):
+async def parse_filename(filename, channel, msg_id, default_source=None):
     try:
         parsed = PTN.parse(filename)
     except Exception:
@@ -233,35 +298,131 @@ async def metadata(filename, channel, msg_id):
 
     encoded = await encode_string({"chat_id": channel, "msg_id": msg_id})
 
-    default_id = extract_default_id(Backend.USE_DEFAULT_ID) or extract_default_id(filename)
+    default_id = extract_default_id(default_source) or extract_default_id(filename)
 
-    if season:
+    return {
+        "title": title,
+        "season": season,
+        "episode": episode,
+        "year": year,
+        "quality": quality,
+        "encoded": encoded,
+        "default_id": default_id,
+    }
+
+async def resolve_metadata(parsed, translate=True):
+    if parsed["season"]:
         return await fetch_tv_metadata(
-            title, season, episode, encoded, year, quality, default_id
+            parsed["title"], parsed["season"], parsed["episode"], parsed["encoded"],
+            parsed["year"], parsed["quality"], parsed["default_id"], translate=translate
         )
 
     return await fetch_movie_metadata(
-        title, encoded, year, quality, default_id
+        parsed["title"], parsed["encoded"], parsed["year"], parsed["quality"],
+        parsed["default_id"], translate=translate
+    )
+
+async def resolve_metadata_batch(parsed_items, translate=True):
+    """
+    Resolve many parsed files at once, episodes of the same show share one show lookup.
+    Returns one result per item, None or the raised exception for files that failed.
+    """
+    results = [None] * len(parsed_items)
+    shows = {}
+    movies = []
+    for i, parsed in enumerate(parsed_items):
+        if parsed["season"]:
+            key = (parsed["title"].lower(), parsed["year"], parsed["default_id"])
+            shows.setdefault(key, []).append(i)
+        else:
+            movies.append(i)
+
+    async def resolve_movie(i):
+        try:
+            results[i] = await resolve_metadata(parsed_items[i], translate)
+        except Exception as e:
+            results[i] = e
+
+    async def resolve_show(indexes):
+        first = parsed_items[indexes[0]]
+        try:
+            show = await resolve_tv_show(first["title"], first["year"], first["default_id"])
+        except Exception as e:
+            for i in indexes:
+                results[i] = e
+            return
+        episodes = await asyncio.gather(*(
+            tv_episode_metadata(
+                show, parsed_items[i]["season"], parsed_items[i]["episode"],
+                parsed_items[i]["encoded"], parsed_items[i]["quality"], translate
+            )
+            for i in indexes
+        ), return_exceptions=True)
+        for i, result in zip(indexes, episodes):
+            results[i] = result
+
+    await asyncio.gather(
+        *(resolve_movie(i) for i in movies),
+        *(resolve_show(indexes) for indexes in shows.values())
     )
+    return results
+
+async def metadata(filename, channel, msg_id, translate=True):
+    parsed = await parse_filename(filename, channel, msg_id, Backend.USE_DEFAULT_ID)
+    if not parsed:
+        return None
+    return await resolve_metadata(parsed, translate)
 
 # -------------------------------------------------
 # TV METADATA
 # -------------------------------------------------
-async def fetch_tv_metadata(title, season, episode, encoded, year, quality, default_id):
+async def fetch_tv_metadata(title, season, episode, encoded, year, quality, default_id, translate=True):
+    show = await resolve_tv_show(title, year, default_id)
+    return await tv_episode_metadata(show, season, episode, encoded, quality, translate)
+
+async def resolve_tv_show(title, year, default_id):
+    """
+    Show-level half of fetch_tv_metadata. Cinemeta's detail already lists every episode,
+    so files of the same show only need this once.
+    """
     imdb_id = default_id if default_id and str(default_id).startswith("tt") else None
     tmdb_id = int(default_id) if default_id and str(default_id).isdigit() else None
 
     if not imdb_id and not tmdb_id:
         imdb_id = await safe_imdb_search(title, "tvSeries")
 
+    imdb = None
     if imdb_id:
         try:
             imdb = await get_detail(imdb_id, "tvSeries")
-            ep = await get_season(imdb_id, season, episode)
+        except ProviderUnavailable:
+            raise
+        except Exception:
+            imdb = None
+
+    return {
+        "title": title,
+        "year": year,
+        "imdb_id": imdb_id,
+        "tmdb_id": tmdb_id,
+        "imdb": imdb,
+        "episodes": await episode_index(imdb_id) if imdb else {},
+    }
+
+async def tv_episode_metadata(show, season, episode, encoded, quality, translate=True):
+    info = await _tv_episode_metadata(show, season, episode, encoded, quality)
+    return await translate_metadata(info) if info and translate else info
+
+async def _tv_episode_metadata(show, season, episode, encoded, quality):
+    imdb_id = show["imdb_id"]
+    imdb = show["imdb"]
+    ep = show["episodes"].get((str(season), str(episode)))
+
+    if imdb and ep:
+        try:
             images = format_imdb_images(imdb_id)
 
-            # Bölüm başlığını çeviriyoruz
-            episode_title = translate_text_safe(ep.get("title", ""))
+            episode_title = keep_text(ep.get("title", ""))
 
             return {
                 "tmdb_id": imdb.get("moviedb_id"),
@@ -270,7 +431,7 @@ async def fetch_tv_metadata(title, season, episode, encoded, year, quality, defa
                 "year": imdb.get("releaseDetailed", {}).get("year", 0),
                 "released": to_iso_datetime(imdb.get("releaseDetailed", {}).get("date")),
                 "rate": imdb.get("rating", {}).get("star", 0),
-                "description": translate_text_safe(imdb.get("plot", "")),
+                "description": keep_text(imdb.get("plot", "")),
                 "poster": images["poster"],
                 "backdrop": images["backdrop"],
                 "logo": images["logo"],
@@ -282,7 +443,7 @@ async def fetch_tv_metadata(title, season, episode, encoded, year, quality, defa
                 "episode_number": episode,
                 "episode_title": episode_title,  # Çevrilmiş başlık
                 "episode_backdrop": ep.get("image", ""),
-                "episode_overview": translate_text_safe(ep.get("plot", "")),
+                "episode_overview": keep_text(ep.get("plot", "")),
                 "episode_released": to_iso_datetime(ep.get("released")),
                 "quality": quality,
                 "encoded_string": encoded,
@@ -290,41 +451,36 @@ async def fetch_tv_metadata(title, season, episode, encoded, year, quality, defa
         except Exception:
             pass
 
+    tmdb_id = show["tmdb_id"] or await safe_tmdb_search(show["title"], "tv", show["year"])
     if not tmdb_id:
-        res = await safe_tmdb_search(title, "tv", year)
-        if not res:
-            return None
-        tmdb_id = res.id
+        return None
 
     tv = await _tmdb_tv_details(tmdb_id)
     ep = await _tmdb_episode_details(tmdb_id, season, episode)
 
-    still = ep.still_path if ep else None
-
-    # TMDB'den alınan bölüm başlığını çeviriyoruz
-    episode_title = translate_text_safe(ep.name) if ep else ""
+    episode_title = ep["title"] if ep else ""
 
     return {
-        "tmdb_id": tv.id,
-        "imdb_id": getattr(tv.external_ids, "imdb_id", None),
-        "title": tv.name,
-        "year": tv.first_air_date.year if tv.first_air_date else 0,
-        "released": to_iso_datetime(tv.first_air_date),
-        "rate": tv.vote_average or 0,
-        "description": translate_text_safe(tv.overview),
-        "poster": format_tmdb_image(tv.poster_path),
-        "backdrop": format_tmdb_image(tv.backdrop_path, "original"),
-        "logo": get_tmdb_logo(tv.images),
-        "genres": tur_genre_normalize([g.name for g in tv.genres]),
-        "cast": [c.name for c in tv.credits.cast],
+        "tmdb_id": tv["tmdb_id"],
+        "imdb_id": tv["imdb_id"],
+        "title": tv["title"],
+        "year": tv["year"],
+        "released": tv["released"],
+        "rate": tv["rate"],
+        "description": tv["description"],
+        "poster": tv["poster"],
+        "backdrop": tv["backdrop"],
+        "logo": tv["logo"],
+        "genres": tur_genre_normalize(tv["genres"]),
+        "cast": list(tv["cast"]),
         "runtime": "",
         "media_type": "tv",
         "season_number": season,
         "episode_number": episode,
         "episode_title": episode_title,  # Çevrilmiş başlık
-        "episode_backdrop": format_tmdb_image(still, "original") if still else "",
-        "episode_overview": translate_text_safe(ep.overview) if ep else "",
-        "episode_released": to_iso_datetime(ep.air_date) if ep else "",
+        "episode_backdrop": ep["backdrop"] if ep else "",
+        "episode_overview": ep["overview"] if ep else "",
+        "episode_released": ep["released"] if ep else "",
         "quality": quality,
         "encoded_string": encoded,
     }
@@ -332,7 +488,11 @@ async def fetch_tv_metadata(title, season, episode, encoded, year, quality, defa
 # -------------------------------------------------
 # MOVIE METADATA
 # -------------------------------------------------
-async def fetch_movie_metadata(title, encoded, year, quality, default_id):
+async def fetch_movie_metadata(title, encoded, year, quality, default_id, translate=True):
+    info = await _fetch_movie_metadata(title, encoded, year, quality, default_id)
+    return await translate_metadata(info) if info and translate else info
+
+async def _fetch_movie_metadata(title, encoded, year, quality, default_id):
     imdb_id = default_id if default_id and str(default_id).startswith("tt") else None
     tmdb_id = int(default_id) if default_id and str(default_id).isdigit() else None
 
@@ -351,7 +511,7 @@ async def fetch_movie_metadata(title, encoded, year, quality, default_id):
                 "year": imdb.get("releaseDetailed", {}).get("year", 0),
                 "released": to_iso_datetime(imdb.get("releaseDetailed", {}).get("date")),
                 "rate": imdb.get("rating", {}).get("star", 0),
-                "description": translate_text_safe(imdb.get("plot", "")),
+                "description": keep_text(imdb.get("plot", "")),
                 "poster": images["poster"],
                 "backdrop": images["backdrop"],
                 "logo": images["logo"],
@@ -362,31 +522,32 @@ async def fetch_movie_metadata(title, encoded, year, quality, default_id):
                 "quality": quality,
                 "encoded_string": encoded,
             }
+        except ProviderUnavailable:
+            raise
         except Exception:
             pass
 
     if not tmdb_id:
-        res = await safe_tmdb_search(title, "movie", year)
-        if not res:
+        tmdb_id = await safe_tmdb_search(title, "movie", year)
+        if not tmdb_id:
             return None
-        tmdb_id = res.id
 
     movie = await _tmdb_movie_details(tmdb_id)
 
     return {
-        "tmdb_id": movie.id,
-        "imdb_id": getattr(movie.external_ids, "imdb_id", None),
-        "title": movie.title,
-        "year": movie.release_date.year if movie.release_date else 0,
-        "released": to_iso_datetime(movie.release_date),
-        "rate": movie.vote_average or 0,
-        "description": translate_text_safe(movie.overview),
-        "poster": format_tmdb_image(movie.poster_path),
-        "backdrop": format_tmdb_image(movie.backdrop_path, "original"),
-        "logo": get_tmdb_logo(movie.images),
-        "genres": tur_genre_normalize([g.name for g in movie.genres]),
-        "cast": [c.name for c in movie.credits.cast],
-        "runtime": f"{movie.runtime} min" if movie.runtime else "",
+        "tmdb_id": movie["tmdb_id"],
+        "imdb_id": movie["imdb_id"],
+        "title": movie["title"],
+        "year": movie["year"],
+        "released": movie["released"],
+        "rate": movie["rate"],
+        "description": movie["description"],
+        "poster": movie["poster"],
+        "backdrop": movie["backdrop"],
+        "logo": movie["logo"],
+        "genres": tur_genre_normalize(movie["genres"]),
+        "cast": list(movie["cast"]),
+        "runtime": movie["runtime"],
         "media_type": "movie",
         "quality": quality,
         "encoded_string": encoded,
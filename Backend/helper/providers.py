@@ -0,0 +1,192 @@
+import asyncio
+import random
+from time import monotonic
+from typing import Optional
+
+import aiohttp
+import httpx
+
+from Backend.config import Telegram
+from Backend.helper.rate_limiter import TokenBucket
+from Backend.logger import LOGGER
+
+# -------------------------------
+# Tunables
+# -------------------------------
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+# Consecutive failures before the circuit opens, and how long it stays open.
+FAILURE_THRESHOLD = 5
+OPEN_SECONDS = 30.0
+
+
+class ProviderError(Exception):
+    """An upstream response worth retrying: 429 or a server error."""
+
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status}" if status else "connection error")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class ProviderUnavailable(Exception):
+    """
+    The provider is throttling us or down. Callers must not cache this as "not found",
+    the same lookup is expected to work later.
+    """
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    value = headers.get("Retry-After") if headers else None
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        # HTTP-date form, fall back to our own backoff.
+        return None
+
+
+def _retryable(e: Exception) -> Optional[ProviderError]:
+    if isinstance(e, ProviderError):
+        return e
+    # themoviedb raises aiohttp's ClientResponseError on non-2xx responses.
+    if isinstance(e, aiohttp.ClientResponseError):
+        if e.status == 429 or e.status >= 500:
+            return ProviderError(e.status, parse_retry_after(e.headers))
+        return None
+    if isinstance(e, (aiohttp.ClientConnectionError, httpx.TransportError, asyncio.TimeoutError)):
+        return ProviderError(0)
+    return None
+
+
+class Provider:
+    def __init__(self, name: str, rate: float, concurrency: int):
+        self.name = name
+        self.bucket = TokenBucket(rate, max(1.0, rate))
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.concurrency = concurrency
+        self.paused_until = 0.0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.requests = 0
+        self.succeeded = 0
+        self.client_errors = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self.retries = 0
+        self.rejected = 0
+        self.circuit_opens = 0
+        self.total_latency = 0.0
+
+    @property
+    def paused_for(self) -> float:
+        return max(0.0, self.paused_until - monotonic())
+
+    @property
+    def state(self) -> str:
+        if self.consecutive_failures < FAILURE_THRESHOLD:
+            return "closed"
+        # Once the open period is over, calls go through again as trials.
+        return "open" if monotonic() < self.open_until else "half_open"
+
+    async def call(self, func, *args, **kwargs):
+        """
+        Run an upstream call within the provider's rate. 429s and server errors are retried
+        with backoff, honoring Retry-After. Raises ProviderUnavailable when retries run out
+        or the circuit is open; other errors (404 and the like) pass through untouched.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            state = self.state
+            if state == "open":
+                self.rejected += 1
+                raise ProviderUnavailable(f"{self.name} circuit is open")
+            if state == "half_open":
+                # Let one trial call through, the rest keep failing fast until it succeeds.
+                self.open_until = monotonic() + OPEN_SECONDS
+
+            if self.paused_for:
+                await asyncio.sleep(self.paused_for)
+            await self.bucket.acquire()
+            async with self.semaphore:
+                self.requests += 1
+                start = monotonic()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    error = _retryable(e)
+                    if error is None:
+                        # The provider answered, it just didn't have what we asked for.
+                        self.on_client_error()
+                        raise
+                else:
+                    self.on_success()
+                    return result
+                finally:
+                    self.total_latency += monotonic() - start
+
+            self.on_failure(error, attempt)
+            if attempt == MAX_RETRIES:
+                raise ProviderUnavailable(f"{self.name} failed after {MAX_RETRIES} retries: {error}") from error
+            self.retries += 1
+
+    def on_success(self):
+        self.succeeded += 1
+        self.consecutive_failures = 0
+        if self.bucket.rate < self.bucket.base_rate:
+            self.bucket.rate = min(self.bucket.base_rate, self.bucket.rate * 1.05)
+
+    def on_client_error(self):
+        # A healthy provider, but not a success: 404s and the like are counted apart.
+        self.client_errors += 1
+        self.consecutive_failures = 0
+
+    def on_failure(self, error: ProviderError, attempt: int):
+        if error.status == 429:
+            self.throttled += 1
+        else:
+            self.server_errors += 1
+
+        delay = error.retry_after
+        if delay is None:
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.5)
+        # Everyone waits, not only the caller that got the error.
+        self.paused_until = max(self.paused_until, monotonic() + delay)
+        self.bucket.rate = max(self.bucket.base_rate / 16, self.bucket.rate / 2)
+
+        was_open = self.state == "open"
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= FAILURE_THRESHOLD:
+            self.open_until = max(self.open_until, monotonic() + max(OPEN_SECONDS, delay))
+            if not was_open:
+                self.circuit_opens += 1
+                LOGGER.warning(f"{self.name} failing ({error}), opening circuit for {self.open_until - monotonic():.0f}s")
+        else:
+            LOGGER.debug(f"{self.name} returned {error}, backing off {delay:.1f}s and lowering rate to {self.bucket.rate:.2f}/s")
+
+    def stats(self) -> dict:
+        return {
+            "provider": self.name,
+            "state": self.state,
+            "rate": round(self.bucket.rate, 2),
+            "base_rate": self.bucket.base_rate,
+            "concurrency": self.concurrency,
+            "paused_for": round(self.paused_for, 1),
+            "requests": self.requests,
+            "succeeded": self.succeeded,
+            "client_errors": self.client_errors,
+            "throttled": self.throttled,
+            "server_errors": self.server_errors,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "circuit_opens": self.circuit_opens,
+            "avg_latency_ms": round(self.total_latency / self.requests * 1000, 1) if self.requests else 0,
+        }
+
+
+TMDB = Provider("tmdb", Telegram.TMDB_RATE_LIMIT, concurrency=12)
+CINEMETA = Provider("cinemeta", Telegram.CINEMETA_RATE_LIMIT, concurrency=8)
+PROVIDERS = (TMDB, CINEMETA)
+
+
+def provider_stats() -> list:
+    return [provider.stats() for provider in PROVIDERS]
@@ -1,13 +1,16 @@
+from asyncio import gather
 from pyrogram.file_id import FileId
-from typing import Optional
+from typing import AsyncIterator, List, Optional
 from Backend.logger import LOGGER
 from Backend import __version__, now, timezone
 from Backend.config import Telegram
 from Backend.helper.exceptions import FIleNotFound
+from Backend.helper.rate_limiter import tg_call
 from aiofiles import open as aiopen
 from aiofiles.os import path as aiopath, remove as aioremove
 from pyrogram import Client
 from Backend.pyrofork.bot import StreamBot
+from Backend.pyrofork.clients import get_pool_clients
 import re
 from pyrogram.types import BotCommand
 from pyrogram import enums
@@ -19,7 +22,7 @@ def is_media(message):
 
 async def get_file_ids(client: Client, chat_id: int, message_id: int) -> Optional[FileId]:
     try:
-        message = await client.get_messages(chat_id, message_id)
+        message = await tg_call(client, client.get_messages, chat_id, message_id)
         if message.empty:
             raise FIleNotFound("Message not found or empty")
         
@@ -38,7 +41,34 @@ async def get_file_ids(client: Client, chat_id: int, message_id: int) -> Optiona
     except Exception as e:
         LOGGER.error(f"Error getting file IDs: {e}")
         raise
-        
+
+
+async def iter_messages_batched(chat_id: int, message_ids: List[int], batch_size: int = 200) -> AsyncIterator[list]:
+    """
+    Fetch messages in batches of up to 200 ids, one batch per healthy bot client at a time.
+    Yields the message list of every batch, missing messages come back with `empty` set.
+    """
+    batches = [message_ids[i:i + batch_size] for i in range(0, len(message_ids), batch_size)]
+
+    async def fetch(batch, offset):
+        clients = get_pool_clients()
+        last_error = None
+        for attempt in range(3):
+            client = clients[(offset + attempt) % len(clients)]
+            try:
+                messages = await tg_call(client, client.get_messages, chat_id, batch)
+                return messages if isinstance(messages, list) else [messages]
+            except Exception as e:
+                last_error = e
+                LOGGER.warning(f"Batch fetch of {len(batch)} messages in {chat_id} failed on {client.name}: {e}")
+        raise last_error
+
+    while batches:
+        width = len(get_pool_clients())
+        round_batches, batches = batches[:width], batches[width:]
+        for messages in await gather(*(fetch(b, n) for n, b in enumerate(round_batches))):
+            yield messages
+
 
 
 def get_readable_file_size(size_in_bytes):
@@ -126,7 +156,7 @@ async def restart_notification():
             try:
                 repo = Telegram.UPSTREAM_REPO.split('/')
                 UPSTREAM_REPO = f"https://github.com/{repo[-2]}/{repo[-1]}"
-                await StreamBot.edit_message_text(
+                await tg_call(StreamBot, StreamBot.edit_message_text,
                     chat_id=chat_id,
                     message_id=msg_id,
                     text=f"Başarıyla Yeniden Başlatıldı \n\nTarih: {now.strftime('%d/%m/%y')}\nSaat: {now.strftime('%I:%M:%S %p')}\nZaman Dilimi: {timezone.zone}\nVersiyon: {__version__}",
@@ -149,11 +179,15 @@ BotCommand("istatistik", "📈 Bot istatistiklerini görüntüler."),
 BotCommand("tur", "🇹🇷 Türleri Türkçeye çevirir."),
 BotCommand("aynivideolarisil", "🧹 Aynı olan videoları siler."),
 BotCommand("calismayanlinklerisil", "🗑️ Çalışmayan linkleri siler."),
+BotCommand("telegramlinkkontrol", "🔍 Silinmiş Telegram dosyalarını listeler."),
+BotCommand("telegramlinklerisil", "💀 Silinmiş Telegram dosyalarını kaldırır."),
 BotCommand("dizisil", "📺 Dizi siler (sezon ve bölüm destekli)."),
 BotCommand("filmsil", "🎬 Film siler."),
 BotCommand("vindir", "💾 Veritabanını indirir."),
 BotCommand("log", "📄 Günlük dosyasını gönderir."),
 BotCommand("set", "🎬 IMDb meta verilerini elle ekler."),
+BotCommand("kanalindeksle", "🗂️ Kanal geçmişini veritabanına ekler."),
+BotCommand("bolumlerayir", "🧩 Dizi bölümlerini ayrı koleksiyona taşır."),
 BotCommand("gizlikomutlar", "🔐 Gizli komutları gösterir."),
 BotCommand("restart", "♻️ Botu yeniden başlatır.")
 ]
@@ -161,12 +195,12 @@ BotCommand("restart", "♻️ Botu yeniden başlatır.")
 
 async def setup_bot_commands(bot: Client):
     try:
-        current_commands = await bot.get_bot_commands()
+        current_commands = await tg_call(bot, bot.get_bot_commands)
         if current_commands:
             LOGGER.info(f"Found {len(current_commands)} existing commands. Deleting them...")
-            await bot.set_bot_commands([])
+            await tg_call(bot, bot.set_bot_commands, [])
         
-        await bot.set_bot_commands(commands)
+        await tg_call(bot, bot.set_bot_commands, commands)
         LOGGER.info("Bot commands updated successfully.")
     except Exception as e:
         LOGGER.error(f"Error setting up bot commands: {e}")
@@ -0,0 +1,100 @@
+from asyncio import Lock, sleep
+from time import monotonic
+from pyrogram import Client
+from pyrogram.errors import FloodWait
+from Backend.config import Telegram
+from Backend.logger import LOGGER
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = monotonic()
+        self.lock = Lock()
+
+    def _refill(self):
+        now = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens: float = 1):
+        async with self.lock:
+            self._refill()
+            while self.tokens < tokens:
+                await sleep((tokens - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= tokens
+
+
+class ClientLimiter:
+    def __init__(self, name: str):
+        self.name = name
+        self.bucket = TokenBucket(Telegram.TG_RATE_LIMIT, Telegram.TG_RATE_LIMIT)
+        self.paused_until = 0.0
+        self.flood_waits = 0
+        self.last_flood_wait = 0
+
+    @property
+    def paused_for(self) -> float:
+        return max(0.0, self.paused_until - monotonic())
+
+    async def wait(self, tokens: float = 1):
+        if self.paused_for:
+            await sleep(self.paused_for)
+        await self.bucket.acquire(tokens)
+
+    def on_flood_wait(self, seconds: int):
+        self.flood_waits += 1
+        self.last_flood_wait = seconds
+        self.paused_until = max(self.paused_until, monotonic() + seconds)
+        # Halve the rate on every FloodWait, it creeps back up with successful calls.
+        self.bucket.rate = max(self.bucket.base_rate / 16, self.bucket.rate / 2)
+        LOGGER.warning(f"FloodWait of {seconds}s on client {self.name}, pausing it and lowering rate to {self.bucket.rate:.2f}/s")
+
+    def on_success(self):
+        if self.bucket.rate < self.bucket.base_rate:
+            self.bucket.rate = min(self.bucket.base_rate, self.bucket.rate * 1.05)
+
+    def stats(self) -> dict:
+        return {
+            "rate": round(self.bucket.rate, 2),
+            "paused_for": round(self.paused_for, 1),
+            "flood_waits": self.flood_waits,
+            "last_flood_wait": self.last_flood_wait,
+        }
+
+
+limiters = {}
+
+
+def get_limiter(client: Client) -> ClientLimiter:
+    name = str(getattr(client, "name", id(client)))
+    if name not in limiters:
+        limiters[name] = ClientLimiter(name)
+    return limiters[name]
+
+
+def is_paused(client: Client) -> bool:
+    return get_limiter(client).paused_for > 0
+
+
+async def tg_call(client: Client, func, *args, max_wait: int = None, tokens: float = 1, **kwargs):
+    """
+    Run a Telegram API call through the client's rate limiter.
+    FloodWaits up to max_wait seconds are waited out and retried once, longer ones are re-raised.
+    """
+    max_wait = Telegram.TG_MAX_FLOOD_WAIT if max_wait is None else max_wait
+    limiter = get_limiter(client)
+    for attempt in range(2):
+        await limiter.wait(tokens)
+        try:
+            result = await func(*args, **kwargs)
+            limiter.on_success()
+            return result
+        except FloodWait as e:
+            limiter.on_flood_wait(e.value)
+            if attempt or e.value > max_wait:
+                raise
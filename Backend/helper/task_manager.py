@@ -1,32 +1,81 @@
-from asyncio import sleep
+from asyncio import Event, create_task, sleep
+from collections import defaultdict
 from pyrogram.errors import FloodWait
 from Backend.logger import LOGGER
 from Backend.pyrofork.bot import Helper
+from Backend.helper.rate_limiter import tg_call
+
+# Telegram accepts at most 100 ids per delete_messages call.
+DELETE_BATCH_SIZE = 100
+# Short window to let bursts (e.g. a replaced season) land in the same batch.
+COALESCE_DELAY = 1.5
+
+pending_deletes = defaultdict(set)
+pending_edits = {}
+write_event = Event()
+writer_task = None
+
+
+def _wake_writer():
+    global writer_task
+    if writer_task is None or writer_task.done():
+        writer_task = create_task(_writer())
+    write_event.set()
+
 
 async def edit_message(chat_id: int, msg_id: int, new_caption: str):
-    try:
-        await Helper.edit_message_caption(
-            chat_id=chat_id,
-            message_id=msg_id,
-            caption=new_caption
-        )
-        await sleep(2)
-    except FloodWait as e:
-        LOGGER.warning(f"FloodWait for {e.value} seconds while editing message {msg_id} in {chat_id}")
-        await sleep(e.value)
-    except Exception as e:
-        LOGGER.error(f"Error while editing message {msg_id} in {chat_id}: {e}")
+    # Repeated edits of the same message collapse into the last caption.
+    pending_edits[(chat_id, msg_id)] = new_caption
+    _wake_writer()
+
 
 async def delete_message(chat_id: int, msg_id: int):
-    try:
-        await Helper.delete_messages(
-            chat_id=chat_id,
-            message_ids=msg_id
-        )
-        await sleep(2)
-        LOGGER.info(f"Deleted message {msg_id} in {chat_id}")
-    except FloodWait as e:
-        LOGGER.warning(f"FloodWait for {e.value} seconds while deleting message {msg_id} in {chat_id}")
-        await sleep(e.value)
-    except Exception as e:
-        LOGGER.error(f"Error while deleting message {msg_id} in {chat_id}: {e}")
+    pending_deletes[chat_id].add(msg_id)
+    pending_edits.pop((chat_id, msg_id), None)
+    _wake_writer()
+
+
+async def _writer():
+    while True:
+        await write_event.wait()
+        await sleep(COALESCE_DELAY)
+        write_event.clear()
+        try:
+            await flush_writes()
+        except Exception as e:
+            LOGGER.error(f"Error while flushing Telegram write queue: {e}")
+
+
+async def flush_writes():
+    while pending_deletes:
+        chat_id, msg_ids = pending_deletes.popitem()
+        msg_ids = sorted(msg_ids)
+        for i in range(0, len(msg_ids), DELETE_BATCH_SIZE):
+            chunk = msg_ids[i:i + DELETE_BATCH_SIZE]
+            try:
+                await tg_call(Helper, Helper.delete_messages, chat_id=chat_id, message_ids=chunk)
+                LOGGER.info(f"Deleted {len(chunk)} messages in {chat_id}")
+            except FloodWait as e:
+                LOGGER.warning(f"FloodWait for {e.value} seconds while deleting {len(msg_ids) - i} messages in {chat_id}, requeued")
+                pending_deletes[chat_id].update(msg_ids[i:])
+                write_event.set()
+                return
+            except Exception as e:
+                LOGGER.error(f"Error while deleting messages {chunk} in {chat_id}: {e}")
+
+    while pending_edits:
+        (chat_id, msg_id), new_caption = pending_edits.popitem()
+        try:
+            await tg_call(
+                Helper, Helper.edit_message_caption,
+                chat_id=chat_id,
+                message_id=msg_id,
+                caption=new_caption
+            )
+        except FloodWait as e:
+            LOGGER.warning(f"FloodWait for {e.value} seconds while editing message {msg_id} in {chat_id}, requeued")
+            pending_edits.setdefault((chat_id, msg_id), new_caption)
+            write_event.set()
+            return
+        except Exception as e:
+            LOGGER.error(f"Error while editing message {msg_id} in {chat_id}: {e}")
@@ -0,0 +1,180 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from deep_translator import GoogleTranslator
+
+from Backend.helper.cache import DAY, MISS, Cache
+from Backend.logger import LOGGER
+
+# -------------------------------
+# Tunables
+# -------------------------------
+TRANSLATE_WORKERS = 2
+BATCH_SIZE = 20
+# Google rejects requests over 5000 characters.
+BATCH_MAX_CHARS = 4500
+BATCH_WINDOW = 0.2
+
+# Translations of the same text never change, keep them across restarts.
+TRANSLATION_MEMORY = Cache("translate", ttl=90 * DAY, max_size=20000)
+
+
+class TranslationBackend(ABC):
+    """
+    Translates a list of texts in as few upstream requests as it can, one result per text
+    in the same order. Swap the service's backend for LocalBackend to run without network access.
+    """
+
+    @abstractmethod
+    async def translate_batch(self, texts: List[str]) -> List[str]:
+        ...
+
+
+class LocalBackend(TranslationBackend):
+    """Offline stand-in, looks texts up in a fixed mapping and returns unknown ones unchanged."""
+
+    def __init__(self, translations: Optional[Dict[str, str]] = None):
+        self.translations = translations or {}
+        # Every batch it was asked for, to check how texts got grouped.
+        self.batches: List[List[str]] = []
+
+    async def translate_batch(self, texts: List[str]) -> List[str]:
+        self.batches.append(list(texts))
+        return [self.translations.get(text, text) for text in texts]
+
+
+class GoogleBackend(TranslationBackend):
+    # Joined texts come back in one response, numbered markers survive translation intact.
+    SEPARATOR = "\n[[{}]]\n"
+
+    def __init__(self, source: str = "en", target: str = "tr"):
+        self.source = source
+        self.target = target
+        self._local = threading.local()
+
+    @property
+    def translator(self) -> GoogleTranslator:
+        # GoogleTranslator keeps the request's text on the instance, one per worker thread.
+        translator = getattr(self._local, "translator", None)
+        if translator is None:
+            translator = self._local.translator = GoogleTranslator(source=self.source, target=self.target)
+        return translator
+
+    def _translate(self, texts: List[str]) -> List[str]:
+        if len(texts) == 1:
+            return [self.translator.translate(texts[0])]
+
+        joined = "".join(
+            text + (self.SEPARATOR.format(i) if i < len(texts) - 1 else "")
+            for i, text in enumerate(texts)
+        )
+        translated = self.translator.translate(joined) or ""
+        parts, rest = [], translated
+        for i in range(len(texts) - 1):
+            marker = f"[[{i}]]"
+            if marker not in rest:
+                break
+            head, rest = rest.split(marker, 1)
+            parts.append(head.strip())
+        parts.append(rest.strip())
+
+        if len(parts) != len(texts):
+            # Markers got mangled, fall back to one request per text.
+            return [self.translator.translate(text) for text in texts]
+        return parts
+
+    async def translate_batch(self, texts: List[str]) -> List[str]:
+        # deep_translator is blocking, keep it off the event loop.
+        return await asyncio.to_thread(self._translate, texts)
+
+
+class TranslationService:
+    def __init__(self, backend: TranslationBackend, workers: int = TRANSLATE_WORKERS):
+        self.backend = backend
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.pending: Dict[str, asyncio.Future] = {}
+        self._tasks: List[asyncio.Task] = []
+        self.requests = 0
+        self.translated = 0
+        self.failed = 0
+
+    def _start(self):
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def translate(self, text: str) -> str:
+        if not text or not str(text).strip():
+            return ""
+        cached = await TRANSLATION_MEMORY.get(text)
+        if cached is not MISS:
+            return cached
+
+        future = self.pending.get(text)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self.pending[text] = future
+            await self.queue.put(text)
+            self._start()
+        return await asyncio.shield(future)
+
+    async def translate_many(self, texts: List[str]) -> List[str]:
+        return list(await asyncio.gather(*(self.translate(text) for text in texts)))
+
+    async def _worker(self):
+        carry = None
+        while True:
+            if carry is None:
+                batch = [await self.queue.get()]
+                await asyncio.sleep(BATCH_WINDOW)
+            else:
+                # Already taken off the queue, its task_done comes with the batch it opens.
+                batch, carry = [carry], None
+            size = len(batch[0])
+            while not self.queue.empty() and len(batch) < BATCH_SIZE:
+                text = self.queue.get_nowait()
+                if size + len(text) > BATCH_MAX_CHARS:
+                    # Doesn't fit, it opens the next batch.
+                    carry = text
+                    break
+                batch.append(text)
+                size += len(text)
+
+            self.requests += 1
+            try:
+                results = await self.backend.translate_batch(batch)
+                if len(results) != len(batch):
+                    # Can't tell which result belongs to which text.
+                    raise ValueError(f"got {len(results)} results for {len(batch)} texts")
+                self.translated += len(batch)
+            except Exception as e:
+                LOGGER.debug(f"Translation of {len(batch)} texts failed: {e}")
+                self.failed += len(batch)
+                results = None
+
+            for i, text in enumerate(batch):
+                future = self.pending.pop(text, None)
+                if results is not None:
+                    result = results[i] or text
+                    await TRANSLATION_MEMORY.set(text, result)
+                else:
+                    # Untranslated text is better than none, but don't remember it.
+                    result = text
+                if future and not future.done():
+                    future.set_result(result)
+                self.queue.task_done()
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "queued": self.queue.qsize(),
+            "requests": self.requests,
+            "translated": self.translated,
+            "failed": self.failed,
+        }
+
+
+translator = TranslationService(GoogleBackend())
@@ -8,7 +8,7 @@ StreamBot = Client(
     api_hash=Telegram.API_HASH,
     bot_token=Telegram.BOT_TOKEN,
     plugins={"root": "Backend/pyrofork/plugins"},
-    sleep_threshold=20,
+    sleep_threshold=0,
     workers=6,
     max_concurrent_transmissions=10
 )
@@ -19,11 +19,14 @@ Helper = Client(
     api_id=Telegram.API_ID,
     api_hash=Telegram.API_HASH,
     bot_token=Telegram.HELPER_BOT_TOKEN,
-    sleep_threshold=20,
+    sleep_threshold=0,
     workers=6,
     max_concurrent_transmissions=10
 )
 
 
 multi_clients = {}
-work_loads = {}
\ No newline at end of file
+work_loads = {}
+client_health = {}
+# ByteStreamer per running client, keyed by the client object.
+class_cache = {}
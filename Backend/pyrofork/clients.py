@@ -1,10 +1,15 @@
-from asyncio import gather, create_task
+from asyncio import gather, create_task, sleep as asleep, wait_for
+from time import time
 from pyrogram import Client
 from Backend.logger import LOGGER
 from Backend.config import Telegram
-from Backend.pyrofork.bot import multi_clients, work_loads, StreamBot
+from Backend.pyrofork.bot import multi_clients, work_loads, client_health, class_cache, StreamBot
+from Backend.helper.rate_limiter import get_limiter, is_paused, tg_call
 from os import environ
 
+client_tokens = {}
+restarting_clients = set()
+
 class TokenParser:
     @staticmethod
     def parse_from_env():
@@ -12,13 +17,22 @@ class TokenParser:
             c + 1: t
             for c, (_, t) in enumerate(
                 filter(
-                    lambda n: n[0].startswith("MULTI_TOKEN"), 
+                    lambda n: n[0].startswith("MULTI_TOKEN"),
                     sorted(environ.items())
                 )
             )
         }
         return tokens
 
+def reset_health(client_id):
+    client_health[client_id] = {
+        "healthy": True,
+        "failures": 0,
+        "last_check": time(),
+        "last_error": None,
+        "restarts": client_health.get(client_id, {}).get("restarts", 0),
+    }
+
 async def start_client(client_id, token):
     try:
         LOGGER.info(f"Starting - Bot Client {client_id}")
@@ -27,11 +41,14 @@ async def start_client(client_id, token):
             api_id=Telegram.API_ID,
             api_hash=Telegram.API_HASH,
             bot_token=token,
-            sleep_threshold=100,
+            sleep_threshold=0,
             no_updates=True,
             in_memory=True
         ).start()
-        work_loads[client_id] = 0
+        # Keep the running counter on restarts, streams still open on the old session decrement it.
+        work_loads.setdefault(client_id, 0)
+        client_tokens[client_id] = token
+        reset_health(client_id)
         return client_id, client
     except Exception as e:
         LOGGER.error(f"Failed to start Client - {client_id} Error: {e}", exc_info=True)
@@ -39,6 +56,7 @@ async def start_client(client_id, token):
 
 async def initialize_clients():
     multi_clients[0], work_loads[0] = StreamBot, 0
+    reset_health(0)
     all_tokens = TokenParser.parse_from_env()
     if not all_tokens:
         LOGGER.info("No additional Bot Clients found, Using default client")
@@ -46,11 +64,109 @@ async def initialize_clients():
 
     tasks = [create_task(start_client(i, token)) for i, token in all_tokens.items()]
     clients = await gather(*tasks)
-    clients = {client_id: client for client_id, client in clients if client} 
+    clients = {client_id: client for client_id, client in filter(None, clients)}
     multi_clients.update(clients)
-    
+
     if len(multi_clients) != 1:
         LOGGER.info(f"Multi-Client Mode Enabled with {len(multi_clients)} clients")
     else:
         LOGGER.info("No additional clients were initialized, using default client")
 
+
+# -------------------------------
+# Health Monitoring
+# -------------------------------
+def is_healthy(client_id) -> bool:
+    return client_health.get(client_id, {}).get("healthy", True)
+
+def select_client():
+    candidates = [i for i in work_loads if i in multi_clients and is_healthy(i)]
+    # Route around clients sitting out a FloodWait as long as another one is available.
+    available = [i for i in candidates if not is_paused(multi_clients[i])]
+    candidates = available or candidates
+    if not candidates:
+        # Every client is evicted, a possibly broken client beats refusing the stream.
+        candidates = [i for i in work_loads if i in multi_clients]
+    index = min(candidates, key=work_loads.get)
+    return index, multi_clients[index]
+
+def get_pool_clients():
+    ids = [i for i in sorted(multi_clients) if is_healthy(i)] or sorted(multi_clients)
+    available = [i for i in ids if not is_paused(multi_clients[i])] or ids
+    return [multi_clients[i] for i in available]
+
+async def probe_client(client_id):
+    client = multi_clients.get(client_id)
+    if client is None:
+        return
+    health = client_health.setdefault(client_id, {"healthy": True, "failures": 0, "restarts": 0})
+    health["last_check"] = time()
+    try:
+        await wait_for(tg_call(client, client.get_me, max_wait=0), timeout=15)
+        if not health["healthy"]:
+            LOGGER.info(f"Bot Client {client_id} is healthy again, adding back to the pool")
+        health.update(healthy=True, failures=0, last_error=None)
+    except Exception as e:
+        health["failures"] = health.get("failures", 0) + 1
+        health["last_error"] = f"{type(e).__name__}: {e}"
+        LOGGER.warning(f"Health check failed for Bot Client {client_id} ({health['failures']}/{Telegram.HEALTH_MAX_FAILURES}): {e}")
+        if health["healthy"] and health["failures"] >= Telegram.HEALTH_MAX_FAILURES:
+            health["healthy"] = False
+            LOGGER.error(f"Bot Client {client_id} evicted from the streaming pool")
+        if not health["healthy"] and client_id in client_tokens and client_id not in restarting_clients:
+            create_task(restart_client(client_id))
+
+async def restart_client(client_id):
+    restarting_clients.add(client_id)
+    attempt = 0
+    try:
+        while True:
+            delay = min(30 * (2 ** attempt), 1800)
+            LOGGER.info(f"Restarting Bot Client {client_id} in {delay}s (attempt {attempt + 1})")
+            await asleep(delay)
+
+            old_client = multi_clients.get(client_id)
+            if old_client is not None:
+                streamer = class_cache.pop(old_client, None)
+                if streamer is not None:
+                    await streamer.close()
+                try:
+                    await old_client.stop()
+                except Exception as e:
+                    LOGGER.debug(f"Stopping Bot Client {client_id} failed: {e}")
+
+            result = await start_client(client_id, client_tokens[client_id])
+            if result:
+                multi_clients[client_id] = result[1]
+                client_health[client_id]["restarts"] += 1
+                LOGGER.info(f"Bot Client {client_id} restarted successfully")
+                return
+            attempt += 1
+    finally:
+        restarting_clients.discard(client_id)
+
+async def monitor_clients():
+    if Telegram.HEALTH_CHECK_INTERVAL <= 0:
+        return
+    while True:
+        await asleep(Telegram.HEALTH_CHECK_INTERVAL)
+        ids = [
+            i for i in list(multi_clients)
+            if i not in restarting_clients and not is_paused(multi_clients[i])
+        ]
+        await gather(*(probe_client(i) for i in ids), return_exceptions=True)
+
+def get_clients_health():
+    return [
+        {
+            "name": f"bot{client_id + 1}",
+            "load": work_loads.get(client_id, 0),
+            "healthy": is_healthy(client_id),
+            "restarting": client_id in restarting_clients,
+            "failures": client_health.get(client_id, {}).get("failures", 0),
+            "restarts": client_health.get(client_id, {}).get("restarts", 0),
+            "last_error": client_health.get(client_id, {}).get("last_error"),
+            "limiter": get_limiter(multi_clients[client_id]).stats(),
+        }
+        for client_id in sorted(multi_clients)
+    ]
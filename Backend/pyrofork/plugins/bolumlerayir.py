@@ -0,0 +1,96 @@
+import time
+from pyrogram import Client, filters
+from pyrogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
+
+from Backend import db
+from Backend.helper.custom_filter import CustomFilters
+from Backend.helper.rate_limiter import tg_call
+from Backend.logger import LOGGER
+
+CANCEL_REQUESTED = False
+CHECKPOINT_KEY = "episode_split"
+
+# -------------------------------
+# Tunables
+# -------------------------------
+MAX_RETRIES = 3
+PROGRESS_INTERVAL = 5.0
+
+
+async def split_show(db_index: int, show_id) -> bool:
+    # A concurrent ingest makes the guarded swap fail, re-read the show and try again.
+    for _ in range(MAX_RETRIES):
+        tv = await db.dbs[f"storage_{db_index}"]["tv"].find_one({"_id": show_id})
+        if not tv or tv.get("episodes_split"):
+            return True
+        if await db.split_tv_document(db_index, tv):
+            return True
+    return False
+
+
+@Client.on_callback_query(filters.regex("cancel_split"))
+async def cancel_split(client, query):
+    global CANCEL_REQUESTED
+    CANCEL_REQUESTED = True
+    await tg_call(client, query.answer, "İptal ediliyor")
+
+
+@Client.on_message(filters.command("bolumlerayir") & filters.private & CustomFilters.owner, group=10)
+async def bolumler_ayir(client: Client, message: Message):
+    global CANCEL_REQUESTED
+    CANCEL_REQUESTED = False
+
+    checkpoint = await db.get_state(CHECKPOINT_KEY) or {}
+    status = await tg_call(client, message.reply_text,
+        "⏳ Dizi bölümleri ayrı koleksiyona taşınıyor...",
+        reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("❌ İptal", callback_data="cancel_split")]])
+    )
+
+    converted = failed = 0
+    start_time = last_progress = time.time()
+
+    try:
+        for db_index in range(checkpoint.get("db_index", 1), len(db.dbs)):
+            query = {"episodes_split": {"$ne": True}}
+            if db_index == checkpoint.get("db_index") and checkpoint.get("last_id"):
+                query["_id"] = {"$gt": checkpoint["last_id"]}
+
+            cursor = db.dbs[f"storage_{db_index}"]["tv"].find(query, {"_id": 1}).sort("_id", 1)
+            async for tv in cursor:
+                if CANCEL_REQUESTED:
+                    break
+                if await split_show(db_index, tv["_id"]):
+                    converted += 1
+                else:
+                    failed += 1
+                    LOGGER.warning(f"Could not split episodes of show {tv['_id']} in storage_{db_index}")
+                await db.set_state(CHECKPOINT_KEY, db_index=db_index, last_id=tv["_id"])
+
+                now = time.time()
+                if now - last_progress > PROGRESS_INTERVAL:
+                    last_progress = now
+                    try:
+                        await tg_call(client, status.edit_text,
+                            f"⏳ storage_{db_index} işleniyor...\n"
+                            f"✅ Dönüştürülen: {converted} | ❌ Hatalı: {failed}\n"
+                            f"⏱ {int(now - start_time)}s",
+                            reply_markup=status.reply_markup
+                        )
+                    except Exception:
+                        pass
+            if CANCEL_REQUESTED:
+                break
+    except Exception as e:
+        LOGGER.exception(f"Episode split stopped: {e}")
+        return await tg_call(client, status.edit_text, f"❌ İşlem durdu: {e}\nTekrar çalıştırınca kaldığı yerden devam eder.")
+
+    if CANCEL_REQUESTED:
+        return await tg_call(client, status.edit_text, f"❌ İptal edildi. {converted} dizi dönüştürüldü, kaldığı yerden devam edilebilir.")
+
+    await db.clear_state(CHECKPOINT_KEY)
+    await tg_call(client, status.edit_text,
+        f"🎉 Bölümler ayrıldı\n\n"
+        f"✅ Dönüştürülen dizi: {converted}\n"
+        f"❌ Hatalı: {failed}\n"
+        f"⏱ Süre: {int(time.time() - start_time)}s"
+    )
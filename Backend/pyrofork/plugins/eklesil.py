@@ -8,9 +8,11 @@ from pyrogram import Client, filters
 from pyrogram.types import Message
 
 from motor.motor_asyncio import AsyncIOMotorClient
+from Backend import db as media_db
 from Backend.helper.custom_filter import CustomFilters
 from Backend.helper.metadata import metadata
 from Backend.logger import LOGGER
+from Backend.helper.rate_limiter import tg_call
 
 # ----------------- ENV -----------------
 DATABASE_RAW = os.getenv("DATABASE", "")
@@ -76,11 +78,11 @@ async def ekle(client: Client, message: Message):
         lines = [parts[1]] if len(parts) > 1 else []
 
     if not lines:
-        return await message.reply_text(
+        return await tg_call(client, message.reply_text,
             "Kullanım:\n/ekle link\nveya\n/ekle link dosya adı"
         )
 
-    status = await message.reply_text("📥 Dizi/film ekleniyor...")
+    status = await tg_call(client, message.reply_text, "📥 Dizi/film ekleniyor...")
 
     movie_count = 0
     series_count = 0
@@ -168,6 +170,8 @@ async def ekle(client: Client, message: Message):
                         "telegram": [telegram_obj]
                     }
                     await movie_col.insert_one(doc)
+                    await media_db.set_location("movie", doc, 1)
+                    await media_db.adjust_counters("movie", doc, 1, 1)
                 else:
                     # Aynı quality veya id farketmeksizin her zaman ekle
                     doc["telegram"].append(telegram_obj)
@@ -210,6 +214,12 @@ async def ekle(client: Client, message: Message):
                         }]
                     }
                     await series_col.insert_one(doc)
+                    await media_db.set_location("tv", doc, 1)
+                    await media_db.adjust_counters("tv", doc, 1, 1)
+                elif doc.get("episodes_split"):
+                    await media_db.add_split_episode_quality(
+                        db, doc, meta["season_number"], episode_obj, telegram_obj, append_only=True
+                    )
                 else:
                     season = next((s for s in doc["seasons"] if s["season_number"] == meta["season_number"]), None)
                     if not season:
@@ -240,7 +250,7 @@ async def ekle(client: Client, message: Message):
         series_text = "\n".join(f"📺 {name}" for name in added_series)
         result_text = f"✅ İşlem tamamlandı\n\n{movies_text}\n{series_text}\n❌ Hatalı: {len(failed)}"
 
-    await status.edit_text(result_text)
+    await tg_call(client, status.edit_text, result_text)
     
 # ----------------- /SİL -----------------
 awaiting_confirmation = {}
@@ -253,11 +263,11 @@ async def sil(client: Client, message: Message):
     tv_count = await series_col.count_documents({})
 
     if movie_count == 0 and tv_count == 0:
-        return await message.reply_text("ℹ️ Veritabanı zaten boş.")
+        return await tg_call(client, message.reply_text, "ℹ️ Veritabanı zaten boş.")
 
     awaiting_confirmation[uid] = True
 
-    await message.reply_text(
+    await tg_call(client, message.reply_text,
         "⚠️ TÜM VERİLER SİLİNECEK ⚠️\n\n"
         f"🎬 Filmler: {movie_count}\n"
         f"📺 Diziler: {tv_count}\n\n"
@@ -279,17 +289,18 @@ async def sil_onay(client: Client, message: Message):
         t = await series_col.count_documents({})
         await movie_col.delete_many({})
         await series_col.delete_many({})
-        await message.reply_text(
+        await db["episodes"].delete_many({})
+        await tg_call(client, message.reply_text,
             f"✅ Silme tamamlandı\n🎬 {m} film\n📺 {t} dizi"
         )
     else:
-        await message.reply_text("❌ Silme iptal edildi.")
+        await tg_call(client, message.reply_text, "❌ Silme iptal edildi.")
 
 # ------------------calismayanlinklerisil------------------
 @Client.on_message(filters.command("calismayanlinklerisil") & filters.private & CustomFilters.owner)
 async def calismayan_linkleri_sil(client: Client, message: Message):
 
-    status = await message.reply_text("🔍 Linkler kontrol ediliyor...")
+    status = await tg_call(client, message.reply_text, "🔍 Linkler kontrol ediliyor...")
 
     async def link_calismiyor_mu(url: str) -> bool:
         if not url.startswith(("http://", "https://")):
@@ -334,8 +345,11 @@ async def calismayan_linkleri_sil(client: Client, message: Message):
 
     # ---------------- TV ----------------
     async for tv in series_col.find({}):
+        # Split shows only keep season summaries, check their episodes instead.
+        tv = await media_db.hydrate_tv(1, tv)
         sezonlar = []
         dizi_bos = True
+        degisen_bolumler = []
 
         for season in tv.get("seasons", []):
             bolumler = []
@@ -351,6 +365,8 @@ async def calismayan_linkleri_sil(client: Client, message: Message):
                     else:
                         yeni_telegram.append(t)
 
+                if len(yeni_telegram) != len(telegramlar):
+                    degisen_bolumler.append((season["season_number"], ep["episode_number"], yeni_telegram))
                 if yeni_telegram:
                     ep["telegram"] = yeni_telegram
                     bolumler.append(ep)
@@ -364,7 +380,19 @@ async def calismayan_linkleri_sil(client: Client, message: Message):
 
         if dizi_bos:
             await series_col.delete_one({"_id": tv["_id"]})
+            if tv.get("episodes_split"):
+                await db["episodes"].delete_many({"show_id": tv["_id"]})
             silinen_dizi += 1
+        elif tv.get("episodes_split"):
+            if not degisen_bolumler:
+                continue
+            for season_number, episode_number, yeni_telegram in degisen_bolumler:
+                key = {"show_id": tv["_id"], "season_number": season_number, "episode_number": episode_number}
+                if yeni_telegram:
+                    await db["episodes"].update_one(key, {"$set": {"telegram": yeni_telegram}})
+                else:
+                    await db["episodes"].delete_one(key)
+            await media_db.refresh_season_summaries(1, [tv["_id"]])
         else:
             await series_col.update_one(
                 {"_id": tv["_id"]},
@@ -379,15 +407,15 @@ async def calismayan_linkleri_sil(client: Client, message: Message):
 
     if len(silinen_isimler) <= 15:
         detay = "\n".join(silinen_isimler)
-        await status.edit_text(header + detay)
+        await tg_call(client, status.edit_text, header + detay)
     else:
         txt_path = "/tmp/silinen_linkler.txt"
         with open(txt_path, "w", encoding="utf-8") as f:
             f.write("\n".join(silinen_isimler))
 
-        await client.send_document(
+        await tg_call(client, client.send_document,
             chat_id=message.chat.id,
             document=txt_path,
             caption=header + "\n📄 Silinen içerik listesi dosya olarak gönderildi."
         )
-        await status.delete()
+        await tg_call(client, status.delete)
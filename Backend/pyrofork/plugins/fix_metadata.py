@@ -6,7 +6,9 @@ from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from Backend import db
 from Backend.helper.custom_filter import CustomFilters
 from Backend.helper.metadata import fetch_tv_metadata, fetch_movie_metadata
+from Backend.helper.single_flight import SingleFlight
 from Backend.logger import LOGGER
+from Backend.helper.rate_limiter import tg_call
 
 CANCEL_REQUESTED = False
 
@@ -34,35 +36,38 @@ def format_eta(seconds):
 # CANCEL BUTTON HANDLER
 # -------------------------------
 @Client.on_callback_query(filters.regex("cancel_fix"))
-async def cancel_fix(_, query):
+async def cancel_fix(client, query):
     global CANCEL_REQUESTED
     CANCEL_REQUESTED = True
-    await query.message.edit_text("❌ Metadata fixing has been cancelled by the user.")
-    await query.answer("Cancelled")
+    await tg_call(client, query.message.edit_text, "❌ Metadata fixing has been cancelled by the user.")
+    await tg_call(client, query.answer, "Cancelled")
 
 # -------------------------------
 # MAIN COMMAND (REWRITTEN - Balanced)
 # -------------------------------
 @Client.on_message(filters.command("fixmetadata") & filters.private & CustomFilters.owner, group=10)
-async def fix_metadata_handler(_, message):
+async def fix_metadata_handler(client, message):
     global CANCEL_REQUESTED
     CANCEL_REQUESTED = False
 
     # -------------------------
     # Gather totals quickly (non-blocking)
     # -------------------------
-    total_movies = 0
-    total_tv = 0
-    for i in range(1, db.current_db_index + 1):
-        key = f"storage_{i}"
-        total_movies += await db.dbs[key]["movie"].count_documents({})
-        total_tv += await db.dbs[key]["tv"].count_documents({})
+    counts = await db.fan_out(
+        lambda i, storage: asyncio.gather(
+            storage["movie"].count_documents({}),
+            storage["tv"].count_documents({})
+        ),
+        range(1, db.current_db_index + 1)
+    )
+    total_movies = sum(movies for movies, _ in counts.values())
+    total_tv = sum(tv for _, tv in counts.values())
 
     TOTAL = total_movies + total_tv
     DONE = 0
     start_time = time.time()
 
-    status = await message.reply_text(
+    status = await tg_call(client, message.reply_text,
         "⏳ Initializing metadata fixing...",
         reply_markup=InlineKeyboardMarkup([
             [InlineKeyboardButton("❌ Cancel", callback_data="cancel_fix")]
@@ -78,6 +83,7 @@ async def fix_metadata_handler(_, message):
 
     semaphore = asyncio.Semaphore(CONCURRENCY)
     meta_cache = {}
+    meta_flights = SingleFlight()
     last_progress_edit = start_time
 
     async def cached_fetch_movie(title, year, default_id, encoded_string=None, quality=None):
@@ -89,15 +95,18 @@ async def fix_metadata_handler(_, message):
         if k in meta_cache:
             return meta_cache[k]
 
-        async with semaphore:
-            try:
-                meta = await fetch_movie_metadata(title=title, encoded_string=encoded_string, year=year, quality=quality, default_id=default_id)
-            except Exception as e:
-                LOGGER.exception(f"fetch_movie_metadata error for {title} ({default_id}): {e}")
-                meta = None
+        async def load():
+            async with semaphore:
+                try:
+                    meta = await fetch_movie_metadata(title=title, encoded_string=encoded_string, year=year, quality=quality, default_id=default_id)
+                except Exception as e:
+                    LOGGER.exception(f"fetch_movie_metadata error for {title} ({default_id}): {e}")
+                    meta = None
+
+            meta_cache[k] = meta
+            return meta
 
-        meta_cache[k] = meta
-        return meta
+        return await meta_flights.do(k, load)
 
     async def cached_fetch_tv(title, season, episode, year, default_id, encoded_string=None, quality=None):
         if default_id:
@@ -108,19 +117,22 @@ async def fix_metadata_handler(_, message):
         if k in meta_cache:
             return meta_cache[k]
 
-        async with semaphore:
-            try:
-                meta = await fetch_tv_metadata(title=title, season=season, episode=episode,
-                                               encoded_string=encoded_string, year=year, quality=quality, default_id=default_id)
-            except Exception as e:
-                LOGGER.exception(f"fetch_tv_metadata error for {title} S{season}E{episode} ({default_id}): {e}")
-                meta = None
+        async def load():
+            async with semaphore:
+                try:
+                    meta = await fetch_tv_metadata(title=title, season=season, episode=episode,
+                                                   encoded_string=encoded_string, year=year, quality=quality, default_id=default_id)
+                except Exception as e:
+                    LOGGER.exception(f"fetch_tv_metadata error for {title} S{season}E{episode} ({default_id}): {e}")
+                    meta = None
 
-        meta_cache[k] = meta
-        return meta
+            meta_cache[k] = meta
+            return meta
 
+        return await meta_flights.do(k, load)
 
-    async def _safe_update_movie(collection, movie_doc):
+
+    async def _safe_update_movie(db_index, movie_doc):
         nonlocal DONE, last_progress_edit
 
         if CANCEL_REQUESTED:
@@ -194,9 +206,9 @@ async def fix_metadata_handler(_, message):
 
 
             if update_query:
-                filter_q = {"_id": doc_id} if doc_id else {"imdb_id": imdb_id}
                 try:
-                    await collection.update_one(filter_q, {"$set": update_query})
+                    # Goes through db so a changed imdb/tmdb id moves its location entry along.
+                    await db.update_metadata("movie", db_index, doc_id, update_query)
                 except Exception as e:
                     LOGGER.exception(f"DB update failed for movie {title}: {e}")
 
@@ -206,7 +218,7 @@ async def fix_metadata_handler(_, message):
             if now - last_progress_edit > PROGRESS_INTERVAL:
                 last_progress_edit = now
                 try:
-                    await status.edit_text(
+                    await tg_call(client, status.edit_text,
                         f"⏳ Fixing metadata...\n{progress_bar(DONE, TOTAL)}\n⏱ Elapsed: {format_eta(now - start_time)}"
                     )
                 except Exception:
@@ -216,7 +228,7 @@ async def fix_metadata_handler(_, message):
             LOGGER.exception(f"Error updating movie {movie_doc.get('title')}: {e}")
             DONE += 1
 
-    async def _safe_update_tv(collection, tv_doc):
+    async def _safe_update_tv(db_index, tv_doc):
         nonlocal DONE, last_progress_edit
 
         if CANCEL_REQUESTED:
@@ -289,9 +301,8 @@ async def fix_metadata_handler(_, message):
 
 
             if update_query:
-                filter_q = {"_id": doc_id} if doc_id else {"imdb_id": imdb_id}
                 try:
-                    await collection.update_one(filter_q, {"$set": update_query})
+                    await db.update_metadata("tv", db_index, doc_id, update_query)
                 except Exception as e:
                     LOGGER.exception(f"DB update failed for TV {title}: {e}")
 
@@ -318,15 +329,21 @@ async def fix_metadata_handler(_, message):
 
                             ep_update = {}
                             if meta.get("episode_overview"):
-                                ep_update["seasons.$[s].episodes.$[e].overview"] = meta["episode_overview"]
+                                ep_update["overview"] = meta["episode_overview"]
                             if meta.get("episode_released"):
-                                ep_update["seasons.$[s].episodes.$[e].released"] = meta["episode_released"]
+                                ep_update["released"] = meta["episode_released"]
                             if meta.get("episode_backdrop"):
-                                ep_update["seasons.$[s].episodes.$[e].episode_backdrop"] = meta["episode_backdrop"]
+                                ep_update["episode_backdrop"] = meta["episode_backdrop"]
 
-                            if ep_update:
+                            if ep_update and tv_doc.get("episodes_split"):
+                                await db.dbs[f"storage_{db_index}"]["episodes"].update_one(
+                                    {"show_id": doc_id, "season_number": sn, "episode_number": en},
+                                    {"$set": ep_update}
+                                )
+                            elif ep_update:
+                                ep_update = {f"seasons.$[s].episodes.$[e].{k}": v for k, v in ep_update.items()}
                                 filt = {"_id": doc_id} if doc_id else {"imdb_id": final_imdb}
-                                await collection.update_one(
+                                await db.dbs[f"storage_{db_index}"]["tv"].update_one(
                                     filt,
                                     {"$set": ep_update},
                                     array_filters=[
@@ -352,7 +369,7 @@ async def fix_metadata_handler(_, message):
             if now - last_progress_edit > PROGRESS_INTERVAL:
                 last_progress_edit = now
                 try:
-                    await status.edit_text(
+                    await tg_call(client, status.edit_text,
                         f"⏳ Fixing metadata...\n{progress_bar(DONE, TOTAL)}\n⏱ Elapsed: {format_eta(now - start_time)}"
                     )
                 except Exception:
@@ -393,7 +410,7 @@ async def fix_metadata_handler(_, message):
             async for movie in cursor:
                 if CANCEL_REQUESTED:
                     break
-                tasks.append(_safe_update_movie(collection, movie))
+                tasks.append(_safe_update_movie(i, movie))
                 if len(tasks) >= TASK_BATCH:
                     await asyncio.gather(*tasks, return_exceptions=True)
                     tasks = []
@@ -410,7 +427,7 @@ async def fix_metadata_handler(_, message):
             async for tv in cursor:
                 if CANCEL_REQUESTED:
                     break
-                tasks.append(_safe_update_tv(collection, tv))
+                tasks.append(_safe_update_tv(i, await db.hydrate_tv(i, tv)))
                 if len(tasks) >= TASK_BATCH:
                     await asyncio.gather(*tasks, return_exceptions=True)
                     tasks = []
@@ -424,14 +441,14 @@ async def fix_metadata_handler(_, message):
 
     if CANCEL_REQUESTED:
         try:
-            await status.edit_text("❌ Metadata fixing cancelled by user.")
+            await tg_call(client, status.edit_text, "❌ Metadata fixing cancelled by user.")
         except Exception:
             pass
         return
 
     elapsed = time.time() - start_time
     try:
-        await status.edit_text(
+        await tg_call(client, status.edit_text,
             f"🎉 **Metadata Fix Completed!**\n"
             f"{progress_bar(DONE, TOTAL)}\n"
             f"⏱ Time Taken: {format_eta(elapsed)}"
@@ -8,6 +8,9 @@ from pyrogram import Client, filters, enums
 from pyrogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery
 from deep_translator import GoogleTranslator
 import os
+from Backend import db as media_db
+from Backend.helper.episode_store import delete_tv, hydrate_tv, save_tv_seasons
+from Backend.helper.rate_limiter import tg_call
 
 # ---------------- CONFIG ----------------
 OWNER_ID = int(os.getenv("OWNER_ID", 12345))
@@ -21,6 +24,8 @@ if not db_raw:
 
 db_urls = [u.strip() for u in db_raw.split(",") if u.strip()]
 MONGO_URL = db_urls[1] if len(db_urls) > 1 else db_urls[0]
+# The first storage DB, storage_1 in the document counters.
+STORAGE_INDEX = 1
 
 client_db = MongoClient(MONGO_URL)
 db_name = client_db.list_database_names()[0]
@@ -59,14 +64,14 @@ def format_time_custom(total_seconds):
     m, s = divmod(rem, 60)
     return f"{h}s{m}d{s:02}s"
 
-async def handle_stop(callback_query: CallbackQuery):
+async def handle_stop(client: Client, callback_query: CallbackQuery):
     stop_event.set()
     try:
-        await callback_query.message.edit_text(
+        await tg_call(client, callback_query.message.edit_text,
             "⛔ İşlem **iptal edildi**!",
             parse_mode=enums.ParseMode.MARKDOWN
         )
-        await callback_query.answer("Durdurma talimatı alındı.")
+        await tg_call(client, callback_query.answer, "Durdurma talimatı alındı.")
     except:
         pass
 
@@ -121,13 +126,13 @@ async def cevir(client: Client, message: Message):
     global stop_event, is_running
 
     if is_running:
-        await message.reply_text("⛔ Zaten devam eden bir işlem var.")
+        await tg_call(client, message.reply_text, "⛔ Zaten devam eden bir işlem var.")
         return
 
     is_running = True
     stop_event.clear()
 
-    start_msg = await message.reply_text(
+    start_msg = await tg_call(client, message.reply_text,
         "🇹🇷 Türkçe çeviri hazırlanıyor...\nİlerleme tek mesajda gösterilecektir.",
         parse_mode=enums.ParseMode.MARKDOWN,
         reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("❌ İptal Et", callback_data="stop")]]),
@@ -214,7 +219,7 @@ async def cevir(client: Client, message: Message):
                 if time.time() - last_update >= update_interval or idx >= len(ids):
                     last_update = time.time()
                     try:
-                        await start_msg.edit_text(
+                        await tg_call(client, start_msg.edit_text,
                             (
                                 f"🇹🇷 Türkçe çeviri yapılıyor.\n\n"
                                 f"Toplam: {total_to_translate} (Film {movies_to_translate} | Bölüm {episodes_to_translate})\n"
@@ -244,7 +249,7 @@ async def cevir(client: Client, message: Message):
     cpu = psutil.cpu_percent(interval=1)
     ram = psutil.virtual_memory().percent
 
-    await start_msg.edit_text(
+    await tg_call(client, start_msg.edit_text,
         (
             "📊 **Genel Özet**\n\n"
             f"Toplam: {total_to_translate} (Film {movies_to_translate} | Bölüm {episodes_to_translate})\n"
@@ -270,7 +275,7 @@ async def cevir(client: Client, message: Message):
         with open(log_path, "w", encoding="utf-8") as f:
             f.write("\n".join(hata_icerigi))
         try:
-            await client.send_document(
+            await tg_call(client, client.send_document,
                 chat_id=OWNER_ID,
                 document=log_path,
                 caption="⛔ Çeviri sırasında hatalar oluştu"
@@ -282,7 +287,7 @@ async def cevir(client: Client, message: Message):
 # ---------------- /cevirekle ----------------
 @Client.on_message(filters.command("cevirekle") & filters.private & filters.user(OWNER_ID))
 async def cevirekle(client: Client, message: Message):
-    status = await message.reply_text("🔄 'cevrildi' alanları ekleniyor...")
+    status = await tg_call(client, message.reply_text, "🔄 'cevrildi' alanları ekleniyor...")
     total_updated = 0
 
     for col in (movie_col, series_col):
@@ -305,11 +310,11 @@ async def cevirekle(client: Client, message: Message):
             res = col.bulk_write(bulk_ops)
             total_updated += res.modified_count
 
-    await status.edit_text(f"✅ 'cevrildi' alanları eklendi.\nToplam güncellenen kayıt: {total_updated}")
+    await tg_call(client, status.edit_text, f"✅ 'cevrildi' alanları eklendi.\nToplam güncellenen kayıt: {total_updated}")
 
 @Client.on_message(filters.command("cevirkaldir") & filters.private & filters.user(OWNER_ID))
 async def cevirkaldir(client: Client, message: Message):
-    status = await message.reply_text("🔄 'cevrildi' alanları kaldırılıyor...")
+    status = await tg_call(client, message.reply_text, "🔄 'cevrildi' alanları kaldırılıyor...")
     total_updated = 0
 
     for col in (movie_col, series_col):
@@ -332,12 +337,12 @@ async def cevirkaldir(client: Client, message: Message):
             res = col.bulk_write(bulk_ops)
             total_updated += res.modified_count
 
-    await status.edit_text(f"✅ 'cevrildi' alanları kaldırıldı.\nToplam güncellenen kayıt: {total_updated}")
+    await tg_call(client, status.edit_text, f"✅ 'cevrildi' alanları kaldırıldı.\nToplam güncellenen kayıt: {total_updated}")
 
 # ---------------- /TUR ----------------
 @Client.on_message(filters.command("tur") & filters.private & filters.user(OWNER_ID))
 async def tur_komutu(client: Client, message: Message):
-    start_msg = await message.reply_text("🔄 Tür güncellemesi başlatıldı…")
+    start_msg = await tg_call(client, message.reply_text, "🔄 Tür güncellemesi başlatıldı…")
 
     genre_map = {
         "Action": "Aksiyon", "Film-Noir": "Kara Film", "Game-Show": "Oyun Gösterisi", "Short": "Kısa",
@@ -372,12 +377,16 @@ async def tur_komutu(client: Client, message: Message):
         if bulk_ops:
             col.bulk_write(bulk_ops)
 
-    await start_msg.edit_text(f"✅ Tür güncellemesi tamamlandı.\nToplam değiştirilen kayıt: {total_fixed}")
+    if total_fixed:
+        # Renamed genres move between the per-genre counters, recount them.
+        await media_db.reconcile_counters()
+
+    await tg_call(client, start_msg.edit_text, f"✅ Tür güncellemesi tamamlandı.\nToplam değiştirilen kayıt: {total_fixed}")
 
 # ---------------- /PLATFORMEKLE ----------------
 @Client.on_message(filters.command("platformekle") & filters.private & filters.user(OWNER_ID))
 async def platform_ekle(client: Client, message: Message):
-    start_msg = await message.reply_text("🔄 Platform ekleme başlatıldı…")
+    start_msg = await tg_call(client, message.reply_text, "🔄 Platform ekleme başlatıldı…")
 
     platform_map = {
         "MAX": "Max", "Hbomax": "Max", "TABİİ": "Tabii", "NF": "Netflix", "DSNP": "Disney",
@@ -422,12 +431,12 @@ async def platform_ekle(client: Client, message: Message):
         if bulk_ops:
             col.bulk_write(bulk_ops)
 
-    await start_msg.edit_text(f"✅ Platform ekleme tamamlandı.\nToplam değiştirilen kayıt: {total_fixed}")
+    await tg_call(client, start_msg.edit_text, f"✅ Platform ekleme tamamlandı.\nToplam değiştirilen kayıt: {total_fixed}")
 
 # ---------------- /PLATFORMSIL ----------------
 @Client.on_message(filters.command("platformsil") & filters.private & filters.user(OWNER_ID))
 async def platform_sil(client: Client, message: Message):
-    start_msg = await message.reply_text("🔄 Platform kayıtları siliniyor…")
+    start_msg = await tg_call(client, message.reply_text, "🔄 Platform kayıtları siliniyor…")
     total_fixed = 0
 
     collections = [movie_col, series_col]
@@ -444,7 +453,7 @@ async def platform_sil(client: Client, message: Message):
         if bulk_ops:
             col.bulk_write(bulk_ops)
 
-    await start_msg.edit_text(f"✅ Platform kayıtları silindi.\nToplam değiştirilen kayıt: {total_fixed}")
+    await tg_call(client, start_msg.edit_text, f"✅ Platform kayıtları silindi.\nToplam değiştirilen kayıt: {total_fixed}")
 
 # ---------------- /ISTATISTIK ----------------
 @Client.on_message(filters.command("istatistik") & filters.private & filters.user(OWNER_ID))
@@ -552,17 +561,17 @@ async def istatistik(client: Client, message: Message):
         f"┖ RAM → {ram}% | Süre → {uptime_str}"
     )
 
-    await message.reply_text(text, parse_mode=enums.ParseMode.HTML)
+    await tg_call(client, message.reply_text, text, parse_mode=enums.ParseMode.HTML)
 
 # ---------------- CALLBACK QUERY ----------------
 @Client.on_callback_query()
 async def _cb(client: Client, query: CallbackQuery):
     if query.data=="stop":
-        await handle_stop(query)
+        await handle_stop(client, query)
 # ---------- benzerleri sil ----------
 @Client.on_message(filters.command("aynivideolarisil") & filters.private & filters.user(OWNER_ID))
 async def benzerleri_sil(client: Client, message: Message):
-    status = await message.reply_text("🔍 Arşiv taranıyor...")
+    status = await tg_call(client, message.reply_text, "🔍 Arşiv taranıyor...")
 
     total_docs = 0
     total_removed = 0
@@ -574,10 +583,12 @@ async def benzerleri_sil(client: Client, message: Message):
     ]
 
     for col, col_name in collections:
-        cursor = col.find({}, {"telegram": 1, "seasons": 1, "title": 1, "tmdb_id": 1, "imdb_id": 1})
+        cursor = col.find({}, {"telegram": 1, "seasons": 1, "title": 1, "tmdb_id": 1, "imdb_id": 1, "episodes_split": 1})
 
         for doc in cursor:
             doc_updated = False
+            if col_name == "tv":
+                doc = hydrate_tv(db, doc)
 
             # ---------- FILM ----------
             if col_name == "movie" and "telegram" in doc:
@@ -683,10 +694,7 @@ async def benzerleri_sil(client: Client, message: Message):
                             ep["telegram"] = new_telegram
 
                 if doc_updated:
-                    col.update_one(
-                        {"_id": doc["_id"]},
-                        {"$set": {"seasons": seasons}}
-                    )
+                    save_tv_seasons(db, doc)
                     total_docs += 1
 
     # ---------- LOG DOSYASI ----------
@@ -695,13 +703,13 @@ async def benzerleri_sil(client: Client, message: Message):
         with open(log_path, "w", encoding="utf-8") as f:
             f.write("\n".join(log_lines))
 
-        await client.send_document(
+        await tg_call(client, client.send_document,
             chat_id=OWNER_ID,
             document=log_path,
             caption="🗑️ Silinen videolar"
         )
 
-    await status.edit_text(
+    await tg_call(client, status.edit_text,
         f"✅ İşlem tamamlandı\n\n"
         f"📄 Etkilenen kayıt: {total_docs}\n"
         f"🗑️ Silinen videolar: {total_removed}"
@@ -711,7 +719,7 @@ async def benzerleri_sil(client: Client, message: Message):
 # ---------- linkleri sil ----------
 @Client.on_message(filters.command("linklerisil") & filters.private & filters.user(OWNER_ID))
 async def linklerisil(client: Client, message: Message):
-    status = await message.reply_text("🔄 Link kayıtları temizleniyor...")
+    status = await tg_call(client, message.reply_text, "🔄 Link kayıtları temizleniyor...")
     total_removed = 0
     total_docs = 0
 
@@ -719,7 +727,7 @@ async def linklerisil(client: Client, message: Message):
         return not (str(tid).startswith("http://") or str(tid).startswith("https://"))
 
     # ---------- FILMLER ----------
-    for doc in movie_col.find({}, {"_id": 1, "telegram": 1, "title": 1, "tmdb_id":1}):
+    for doc in movie_col.find({}, {"_id": 1, "telegram": 1, "title": 1, "tmdb_id":1, "genres": 1}):
         telegram = doc.get("telegram", [])
         new_telegram = [t for t in telegram if is_valid_id(t.get("id", ""))]
         removed_count = len(telegram) - len(new_telegram)
@@ -729,10 +737,12 @@ async def linklerisil(client: Client, message: Message):
                 movie_col.update_one({"_id": doc["_id"]}, {"$set": {"telegram": new_telegram}})
             else:
                 movie_col.delete_one({"_id": doc["_id"]})
+                await media_db.adjust_counters("movie", doc, STORAGE_INDEX, -1)
             total_docs += 1
 
     # ---------- DİZİLER ----------
-    for doc in series_col.find({}, {"_id": 1, "seasons": 1, "title":1, "imdb_id":1}):
+    for doc in series_col.find({}, {"_id": 1, "seasons": 1, "title":1, "imdb_id":1, "episodes_split": 1, "genres": 1}):
+        doc = hydrate_tv(db, doc)
         seasons = doc.get("seasons", [])
         doc_updated = False
         for season in seasons:
@@ -753,11 +763,12 @@ async def linklerisil(client: Client, message: Message):
         # Sezonlar güncellendikten sonra hiçbir bölüm kalmamışsa dizi silinecek
         remaining_eps = sum(len(s.get("episodes", [])) for s in seasons)
         if remaining_eps > 0:
-            series_col.update_one({"_id": doc["_id"]}, {"$set": {"seasons": seasons}})
             if doc_updated:
+                save_tv_seasons(db, doc)
                 total_docs += 1
         else:
-            series_col.delete_one({"_id": doc["_id"]})
+            delete_tv(db, doc)
+            await media_db.adjust_counters("tv", doc, STORAGE_INDEX, -1)
             total_docs += 1
 
-    await status.edit_text(f"✅ İşlem tamamlandı\n\n📄 Etkilenen kayıt: {total_docs}\n🗑️ Silinen tekrar: {total_removed}")
+    await tg_call(client, status.edit_text, f"✅ İşlem tamamlandı\n\n📄 Etkilenen kayıt: {total_docs}\n🗑️ Silinen tekrar: {total_removed}")
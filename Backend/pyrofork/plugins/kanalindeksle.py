@@ -0,0 +1,190 @@
+import time
+import asyncio
+from pyrogram import Client, filters
+from pyrogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
+
+import Backend
+from Backend import db
+from Backend.config import Telegram
+from Backend.helper.custom_filter import CustomFilters
+from Backend.helper.metadata import parse_filename, resolve_metadata_batch
+from Backend.helper.providers import ProviderUnavailable
+from Backend.helper.pyro import clean_filename, get_readable_file_size, iter_messages_batched, remove_urls
+from Backend.helper.rate_limiter import tg_call
+from Backend.logger import LOGGER
+from Backend.helper.ingest import title_lock
+
+CANCEL_REQUESTED = False
+
+# -------------------------------
+# Tunables
+# -------------------------------
+BATCH_SIZE = 200
+PROGRESS_INTERVAL = 5.0
+
+
+def checkpoint_key(channel: str) -> str:
+    return f"backfill:{channel}"
+
+
+async def latest_message_id(client: Client, chat_id: int) -> int:
+    # Bots can't read channel history, a throwaway post tells us the newest id.
+    probe = await tg_call(client, client.send_message, chat_id, "🗂️ Kanal indeksleniyor...")
+    await tg_call(client, probe.delete)
+    return probe.id - 1
+
+
+async def parse(message: Message):
+    if message.empty or not (message.video or (message.document and (message.document.mime_type or "").startswith("video/"))):
+        return None
+
+    file = message.video or message.document
+    title = message.caption or file.file_name
+    if not title:
+        return None
+    channel = int(str(message.chat.id).replace("-100", ""))
+    if await db.is_claimed(file.file_unique_id):
+        return None
+
+    parsed = await parse_filename(clean_filename(title), channel, message.id, Backend.USE_DEFAULT_ID)
+    if not parsed:
+        LOGGER.warning(f"Metadata failed for file: {title} (ID: {message.id})")
+        return None
+    return parsed, channel, message.id, get_readable_file_size(file.file_size), title, file.file_unique_id
+
+
+async def resolve(messages):
+    # Resolved as one batch, so episodes of the same show share a single show lookup.
+    candidates = [c for c in await asyncio.gather(*(parse(m) for m in messages)) if c]
+    results = await resolve_metadata_batch([parsed for parsed, *_ in candidates])
+    # An outage isn't a failed file, stop before the checkpoint moves past this batch.
+    outage = next((r for r in results if isinstance(r, ProviderUnavailable)), None)
+    if outage:
+        raise outage
+
+    records = []
+    for (_, channel, msg_id, size, title, file_unique_id), metadata_info in zip(candidates, results):
+        if isinstance(metadata_info, Exception):
+            LOGGER.error(f"Metadata failed for file: {title} (ID: {msg_id}): {metadata_info}")
+        elif metadata_info is None:
+            LOGGER.warning(f"Metadata failed for file: {title} (ID: {msg_id})")
+        else:
+            title = remove_urls(title)
+            if not title.endswith(('.mkv', '.mp4')):
+                title += '.mkv'
+            records.append(((metadata_info, channel, msg_id, size, title), file_unique_id))
+    return records
+
+
+async def store(records):
+    # Claimed only here, so a batch that never gets written leaves no claims behind.
+    claimed = []
+    for record, file_unique_id in records:
+        if await db.claim_file(file_unique_id, record[1], record[2]):
+            claimed.append(record)
+    if not claimed:
+        return 0, 0
+
+    stored = [False] * len(claimed)
+    try:
+        stored = await db.bulk_ingest(claimed)
+    finally:
+        for (_, channel, msg_id, _, _), ok in zip(claimed, stored):
+            if not ok:
+                await db.release_file(channel, msg_id)
+    # Records claimed meanwhile by the live receiver are neither stored nor failed here.
+    return sum(stored), len(claimed)
+
+
+@Client.on_callback_query(filters.regex("cancel_backfill"))
+async def cancel_backfill(client, query):
+    global CANCEL_REQUESTED
+    CANCEL_REQUESTED = True
+    await tg_call(client, query.answer, "İptal ediliyor")
+
+
+@Client.on_message(filters.command("kanalindeksle") & filters.private & CustomFilters.owner, group=10)
+async def kanal_indeksle(client: Client, message: Message):
+    global CANCEL_REQUESTED
+    CANCEL_REQUESTED = False
+
+    if len(message.command) < 2:
+        return await tg_call(client, message.reply_text,
+            "Kullanım:\n/kanalindeksle kanal_id [başlangıç_id] [bitiş_id]\n\n"
+            "Başlangıç verilmezse kaldığı yerden devam eder."
+        )
+
+    channel = message.command[1]
+    if channel not in Telegram.AUTH_CHANNEL:
+        return await tg_call(client, message.reply_text, "> Channel is not in AUTH_CHANNEL")
+    chat_id = int(channel)
+
+    checkpoint = await db.get_state(checkpoint_key(channel)) or {}
+    try:
+        start_id = int(message.command[2]) if len(message.command) > 2 else checkpoint.get("last_msg_id", 0) + 1
+        end_id = int(message.command[3]) if len(message.command) > 3 else checkpoint.get("end_id") or await latest_message_id(client, chat_id)
+    except ValueError:
+        return await tg_call(client, message.reply_text, "⚠️ Mesaj id'leri sayı olmalı.")
+    except Exception as e:
+        LOGGER.error(f"Could not determine latest message id of {channel}: {e}")
+        return await tg_call(client, message.reply_text, "⚠️ Son mesaj id'si alınamadı, bitiş id'sini elle verin.")
+
+    if start_id > end_id:
+        await db.clear_state(checkpoint_key(channel))
+        return await tg_call(client, message.reply_text, "✅ Kanal zaten indekslenmiş.")
+
+    await db.set_state(checkpoint_key(channel), end_id=end_id, last_msg_id=start_id - 1)
+
+    status = await tg_call(client, message.reply_text,
+        f"⏳ {start_id} → {end_id} arası indeksleniyor...",
+        reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("❌ İptal", callback_data="cancel_backfill")]])
+    )
+
+    total = end_id - start_id + 1
+    scanned = indexed = failed = 0
+    start_time = last_progress = time.time()
+
+    try:
+        async for messages in iter_messages_batched(chat_id, list(range(start_id, end_id + 1)), BATCH_SIZE):
+            if CANCEL_REQUESTED:
+                break
+
+            records = await resolve(messages)
+
+            if records:
+                async with title_lock([record for record, _ in records]):
+                    stored, attempted = await store(records)
+                indexed += stored
+                failed += attempted - stored
+
+            scanned += len(messages)
+            last_id = max((m.id for m in messages), default=start_id - 1)
+            await db.set_state(checkpoint_key(channel), last_msg_id=last_id)
+
+            now = time.time()
+            if now - last_progress > PROGRESS_INTERVAL:
+                last_progress = now
+                try:
+                    await tg_call(client, status.edit_text,
+                        f"⏳ İndeksleniyor... {scanned}/{total}\n"
+                        f"✅ Eklenen: {indexed} | ❌ Hatalı: {failed}\n"
+                        f"⏱ {int(now - start_time)}s",
+                        reply_markup=status.reply_markup
+                    )
+                except Exception:
+                    pass
+    except Exception as e:
+        LOGGER.exception(f"Backfill of {channel} stopped: {e}")
+        return await tg_call(client, status.edit_text, f"❌ İndeksleme durdu: {e}\nTekrar çalıştırınca kaldığı yerden devam eder.")
+
+    if CANCEL_REQUESTED:
+        return await tg_call(client, status.edit_text, f"❌ İptal edildi. {scanned}/{total} tarandı, kaldığı yerden devam edilebilir.")
+
+    await db.clear_state(checkpoint_key(channel))
+    await tg_call(client, status.edit_text,
+        f"🎉 İndeksleme tamamlandı\n\n"
+        f"📨 Taranan mesaj: {scanned}\n"
+        f"✅ Eklenen: {indexed}\n"
+        f"❌ Hatalı: {failed}\n"
+        f"⏱ Süre: {int(time.time() - start_time)}s"
+    )
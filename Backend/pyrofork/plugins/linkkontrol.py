@@ -0,0 +1,72 @@
+import time
+from pyrogram import Client, filters
+from pyrogram.types import Message
+
+from Backend.helper import link_checker
+from Backend.helper.custom_filter import CustomFilters
+from Backend.helper.link_checker import find_dead_entries, remove_dead_entries
+from Backend.helper.rate_limiter import tg_call
+from Backend.logger import LOGGER
+
+PROGRESS_INTERVAL = 5.0
+
+
+async def run_check(client: Client, message: Message, remove: bool):
+    if link_checker.check_running:
+        return await tg_call(client, message.reply_text, "⛔ Zaten devam eden bir kontrol var.")
+    link_checker.check_running = True
+
+    status = await tg_call(client, message.reply_text, "🔍 Telegram linkleri kontrol ediliyor...")
+    start_time = time.time()
+    last_progress = start_time
+
+    async def progress(checked, total):
+        nonlocal last_progress
+        now = time.time()
+        if now - last_progress > PROGRESS_INTERVAL:
+            last_progress = now
+            try:
+                await tg_call(client, status.edit_text, f"🔍 Kontrol ediliyor... {checked}/{total}")
+            except Exception:
+                pass
+
+    try:
+        dead, total = await find_dead_entries(progress)
+        header = (
+            f"✅ Kontrol tamamlandı\n\n"
+            f"🔗 Kontrol edilen: {total}\n"
+            f"💀 Çalışmayan: {len(dead)}\n"
+        )
+        if dead and remove:
+            removed = await remove_dead_entries(dead)
+            header += f"🗑️ Silinen film: {removed['movie']} | Silinen dizi: {removed['tv']}\n"
+        header += f"⏱ Süre: {int(time.time() - start_time)}s"
+
+        labels = [label for _, _, label in dead]
+        if len(labels) <= 15:
+            await tg_call(client, status.edit_text, header + ("\n\n" + "\n".join(labels) if labels else ""))
+        else:
+            txt_path = "/tmp/calismayan_telegram_linkleri.txt"
+            with open(txt_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(labels))
+            await tg_call(client, client.send_document,
+                chat_id=message.chat.id,
+                document=txt_path,
+                caption=header
+            )
+            await tg_call(client, status.delete)
+    except Exception as e:
+        LOGGER.exception(f"Telegram link check failed: {e}")
+        await tg_call(client, status.edit_text, f"❌ Kontrol sırasında hata oluştu: {e}")
+    finally:
+        link_checker.check_running = False
+
+
+@Client.on_message(filters.command("telegramlinkkontrol") & filters.private & CustomFilters.owner)
+async def telegram_link_kontrol(client: Client, message: Message):
+    await run_check(client, message, remove=False)
+
+
+@Client.on_message(filters.command("telegramlinklerisil") & filters.private & CustomFilters.owner)
+async def telegram_linkleri_sil(client: Client, message: Message):
+    await run_check(client, message, remove=True)
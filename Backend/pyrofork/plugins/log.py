@@ -3,19 +3,20 @@ from pyrogram.types import Message
 from os import path as ospath
 
 from Backend.helper.custom_filter import CustomFilters
+from Backend.helper.rate_limiter import tg_call
 
 @Client.on_message(filters.command('log') & filters.private & CustomFilters.owner, group=10)
 async def log(client: Client, message: Message):
     try:
         path = ospath.abspath('log.txt')
         if not ospath.exists(path):
-            return await message.reply_text("> ❌ Log file not found.")
+            return await tg_call(client, message.reply_text, "> ❌ Log file not found.")
         
-        await message.reply_document(
+        await tg_call(client, message.reply_document,
             document=path,
             quote=True,
             disable_notification=True
         )
     except Exception as e:
-        await message.reply_text(f"⚠️ Error: {e}")
+        await tg_call(client, message.reply_text, f"⚠️ Error: {e}")
         print(f"Error in /log: {e}")
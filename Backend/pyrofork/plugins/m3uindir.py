@@ -1,6 +1,8 @@
 from pyrogram import Client, filters
 from pyrogram.types import Message
 from Backend.helper.custom_filter import CustomFilters
+from Backend.helper.episode_store import hydrate_tv
+from Backend.helper.rate_limiter import tg_call
 from pymongo import MongoClient
 import os
 import re
@@ -32,7 +34,7 @@ def build_url(file_id: str) -> str:
 # ------------ /m3uindir KOMUTU ------------
 @Client.on_message(filters.command("m3uindir") & filters.private & CustomFilters.owner)
 async def send_m3u_file(client, message: Message):
-    start_msg = await message.reply_text("📝 filmlervediziler.m3u dosyası hazırlanıyor, lütfen bekleyin...")
+    start_msg = await tg_call(client, message.reply_text, "📝 filmlervediziler.m3u dosyası hazırlanıyor, lütfen bekleyin...")
 
     file_path = "filmlervediziler.m3u"
 
@@ -100,6 +102,7 @@ async def send_m3u_file(client, message: Message):
             # DİZİLER
             # -----------------------------
             for tv in db["tv"].find({}):
+                tv = hydrate_tv(db, tv)
                 logo_tv = tv.get("poster", "")
                 seasons = tv.get("seasons", [])
 
@@ -144,20 +147,20 @@ async def send_m3u_file(client, message: Message):
                             )
                             m3u.write(f"{url}\n")
 
-        await client.send_document(
+        await tg_call(client, client.send_document,
             chat_id=message.chat.id,
             document=file_path,
             caption="📂 filmlervediziler.m3u dosyanız hazır!"
         )
-        await start_msg.delete()
+        await tg_call(client, start_msg.delete)
 
     except Exception as e:
-        await start_msg.edit_text(f"❌ Dosya oluşturulamadı.\nHata: {e}")
+        await tg_call(client, start_msg.edit_text, f"❌ Dosya oluşturulamadı.\nHata: {e}")
         
 # -------------------------- gizlikomutlar ----------------------
 @Client.on_message(filters.command("gizlikomutlar") & filters.private & CustomFilters.owner)
 async def gizli_komutlar(client, message: Message):
-    await message.reply_text(
+    await tg_call(client, message.reply_text,
         "/pixeldrain 📊 Pixeldrain istatistiklerini gösterir.\n"
         "/pixeldrainsil 🗑️ Pixeldrain videolarını siler.\n"
         "/cevir 🇹🇷 Açıklamaları Türkçeye çevirir.\n"
@@ -3,6 +3,7 @@ from Backend.helper.custom_filter import CustomFilters
 from pyrogram import filters, Client, enums
 from pyrogram.types import Message
 from Backend.logger import LOGGER
+from Backend.helper.rate_limiter import tg_call
 
 
 @Client.on_message(filters.command('set') & filters.private & CustomFilters.owner, group=10)
@@ -14,7 +15,7 @@ async def manual(client: Client, message: Message):
             url = command[1].strip()
             Backend.USE_DEFAULT_ID = url
 
-            await message.reply_text(
+            await tg_call(client, message.reply_text,
                 f"✅ <b>Default IMDB/TMDB URL Set!</b>\n\n"
                 f"Now the bot will use this URL for any files you send:\n"
                 f"<code>{Backend.USE_DEFAULT_ID}</code>\n\n"
@@ -26,7 +27,7 @@ async def manual(client: Client, message: Message):
             )
         else:
             Backend.USE_DEFAULT_ID = None
-            await message.reply_text(
+            await tg_call(client, message.reply_text,
                 "✅ <b>Default IMDB/TMDB URL Removed!</b>\n\n"
                 "You can now manually upload files without linking to a default IMDB URL.",
                 quote=True,
@@ -35,5 +36,5 @@ async def manual(client: Client, message: Message):
 
     except Exception as e:
         LOGGER.error(f"Error in /set handler: {e}")
-        await message.reply_text(f"⚠️ An error occurred: {e}")
+        await tg_call(client, message.reply_text, f"⚠️ An error occurred: {e}")
         
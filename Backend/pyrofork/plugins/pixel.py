@@ -6,10 +6,10 @@ from time import time
 
 from pyrogram import Client, filters
 from pyrogram.types import Message
-from pyrogram.errors import FloodWait
 
 from dotenv import load_dotenv
 from Backend.helper.custom_filter import CustomFilters
+from Backend.helper.rate_limiter import tg_call
 
 # ===================== CONFIG =====================
 
@@ -22,18 +22,10 @@ UPDATE_INTERVAL = 15
 # ===================== SAFE TELEGRAM =====================
 
 async def safe_reply(message: Message, text: str):
-    try:
-        return await message.reply_text(text)
-    except FloodWait as e:
-        await asyncio.sleep(e.value)
-        return await message.reply_text(text)
+    return await tg_call(message._client, message.reply_text, text)
 
 async def safe_edit(message: Message, text: str):
-    try:
-        return await message.edit_text(text)
-    except FloodWait as e:
-        await asyncio.sleep(e.value)
-        return await message.edit_text(text)
+    return await tg_call(message._client, message.edit_text, text)
 
 # ===================== UTIL =====================
 
@@ -181,7 +173,7 @@ async def pixeldrain_delete_all(client: Client, message: Message):
             with open(path, "w", encoding="utf-8") as f:
                 f.write(format_file_list(deleted_files))
 
-            await client.send_document(
+            await tg_call(client, client.send_document,
                 message.chat.id,
                 path,
                 caption=(
@@ -190,7 +182,7 @@ async def pixeldrain_delete_all(client: Client, message: Message):
                     f"⏱️ Geçen Süre   : {format_duration(elapsed)}"
                 )
             )
-            await status.delete()
+            await tg_call(client, status.delete)
             os.remove(path)
 
     except Exception as e:
@@ -244,7 +236,7 @@ async def pixeldrain_list(client: Client, message: Message):
             with open(path, "w", encoding="utf-8") as f:
                 f.write(format_file_list(file_data))
 
-            await client.send_document(
+            await tg_call(client, client.send_document,
                 message.chat.id,
                 path,
                 caption=(
@@ -254,7 +246,7 @@ async def pixeldrain_list(client: Client, message: Message):
                     f"⏱️ Geçen Süre  : {format_duration(elapsed)}"
                 )
             )
-            await status.delete()
+            await tg_call(client, status.delete)
             os.remove(path)
 
     except Exception as e:
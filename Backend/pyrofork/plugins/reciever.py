@@ -1,33 +1,18 @@
-from asyncio import create_task, sleep as asleep, Queue, Lock
+from asyncio import create_task
 import Backend
-from Backend.helper.task_manager import edit_message
 from Backend.logger import LOGGER
 from Backend import db
 from Backend.config import Telegram
-from Backend.helper.pyro import clean_filename, get_readable_file_size, remove_urls
-from Backend.helper.metadata import metadata
+from Backend.helper.ingest import replay_journal, start_pipeline, submit
+from Backend.helper.pyro import get_readable_file_size
+from Backend.helper.rate_limiter import tg_call
 from pyrogram import filters, Client
 from pyrogram.types import Message
 from pyrogram.errors import FloodWait
-from pyrogram.enums.parse_mode import ParseMode
 
 
-file_queue = Queue()
-db_lock = Lock()
-
-async def process_file():
-    while True:
-        metadata_info, channel, msg_id, size, title = await file_queue.get()
-        async with db_lock:
-            updated_id = await db.insert_media(metadata_info, channel=channel, msg_id=msg_id, size=size, name=title)
-            if updated_id:
-                LOGGER.info(f"{metadata_info['media_type']} updated with ID: {updated_id}")
-            else:
-                LOGGER.info("Update failed due to validation errors.")
-        file_queue.task_done()
-
-for _ in range(1):
-    create_task(process_file())
+start_pipeline()
+create_task(replay_journal())
 
 
 @Client.on_message(filters.channel & (filters.document | filters.video))
@@ -39,36 +24,24 @@ async def file_receive_handler(client: Client, message: Message):
                 title = message.caption or file.file_name
                 msg_id = message.id
                 size = get_readable_file_size(file.file_size)
-                channel = str(message.chat.id).replace("-100", "")
+                channel = int(str(message.chat.id).replace("-100", ""))
 
-                metadata_info = await metadata(clean_filename(title), int(channel), msg_id)
-                if metadata_info is None:
-                    LOGGER.warning(f"Metadata failed for file: {title} (ID: {msg_id})")
+                if not await db.claim_file(file.file_unique_id, channel, msg_id):
+                    LOGGER.info(f"Skipping already indexed file: {title} (ID: {msg_id})")
                     return
 
-                title = remove_urls(title)
-                if not title.endswith(('.mkv', '.mp4')):
-                    title += '.mkv'
-
-                if Backend.USE_DEFAULT_ID:
-                    new_caption = (message.caption + "\n\n" + Backend.USE_DEFAULT_ID) if message.caption else Backend.USE_DEFAULT_ID
-                    create_task(edit_message(
-                        chat_id=message.chat.id,
-                        msg_id=message.id,
-                        new_caption=new_caption
-                    ))
+                # /set can change before the pipeline gets to this file, pin it now.
+                default_source = Backend.USE_DEFAULT_ID
+                new_caption = None
+                if default_source:
+                    new_caption = (message.caption + "\n\n" + default_source) if message.caption else default_source
 
-                await file_queue.put((metadata_info, int(channel), msg_id, size, title))
+                await db.journal_file(channel, msg_id, title, size, default_source)
+                await submit(channel, msg_id, title, size, default_source, new_caption)
             else:
-                await message.reply_text("> Not supported")
+                await tg_call(client, message.reply_text, "> Not supported")
         except FloodWait as e:
-            LOGGER.info(f"Sleeping for {str(e.value)}s")
-            await asleep(e.value)
-            await message.reply_text(
-                text=f"Got Floodwait of {str(e.value)}s",
-                disable_web_page_preview=True,
-                parse_mode=ParseMode.MARKDOWN
-            )
+            # The limiter has already paused this client, don't block the handler worker as well.
+            LOGGER.warning(f"Got FloodWait of {e.value}s while handling message {message.id}")
     else:
-        await message.reply_text("> Channel is not in AUTH_CHANNEL")
-        
+        await tg_call(client, message.reply_text, "> Channel is not in AUTH_CHANNEL")
@@ -2,6 +2,7 @@ from pyrogram import filters, Client, enums
 from pyrogram.types import Message
 from Backend.helper.custom_filter import CustomFilters
 from Backend.logger import LOGGER
+from Backend.helper.rate_limiter import tg_call
 from asyncio import create_subprocess_exec, gather
 from aiofiles import open as aiopen
 from os import execl as osexecl
@@ -10,7 +11,7 @@ import shutil
 @Client.on_message(filters.command('restart') & filters.private & CustomFilters.owner, group=10)
 async def restart(client: Client, message: Message):
     try:
-        restart_message = await message.reply_text(
+        restart_message = await tg_call(client, message.reply_text,
             '<blockquote>⚙️ Bot başlatılıyor. \n\n✨ Lütfen bekleyiniz. 🚀</blockquote>',
             quote=True,
             parse_mode=enums.ParseMode.HTML
@@ -32,5 +33,5 @@ async def restart(client: Client, message: Message):
 
     except Exception as e:
         LOGGER.error(f"Error during restart: {e}")
-        await message.reply_text("**❌ Failed to restart. Check logs for details.**")
+        await tg_call(client, message.reply_text, "**❌ Failed to restart. Check logs for details.**")
         
@@ -2,6 +2,7 @@ from pyrogram import filters, Client, enums
 from Backend.helper.custom_filter import CustomFilters
 from pyrogram.types import Message
 from Backend.config import Telegram
+from Backend.helper.rate_limiter import tg_call
 
 @Client.on_message(filters.command('start') & filters.private & CustomFilters.owner, group=10)
 async def send_start_message(client: Client, message: Message):
@@ -9,7 +10,7 @@ async def send_start_message(client: Client, message: Message):
         base_url = Telegram.BASE_URL
         addon_url = f"{base_url}/stremio/manifest.json"
 
-        await message.reply_text(
+        await tg_call(client, message.reply_text,
             'Eklentiyi Stremio’ya yüklemek için aşağıdaki adresi kopyalayın ve Eklentiler bölümüne ekleyin.\n\n'
             f'<b>Eklenti adresin:</b>\n<code>{addon_url}</code>\n\n',
             quote=True,
@@ -17,5 +18,5 @@ async def send_start_message(client: Client, message: Message):
         )
 
     except Exception as e:
-        await message.reply_text(f"⚠️ Error: {e}")
+        await tg_call(client, message.reply_text, f"⚠️ Error: {e}")
         print(f"Error in /start handler: {e}")
@@ -1,6 +1,8 @@
 from pyrogram import Client, filters
 from pyrogram.types import Message
 from Backend.helper.custom_filter import CustomFilters
+from Backend.helper.episode_store import hydrate_tv
+from Backend.helper.rate_limiter import tg_call
 from pymongo import MongoClient
 import os
 import json
@@ -23,7 +25,13 @@ def export_collections_to_json(url):
     db = client[db_name_list[0]]
 
     movie_data = list(db["movie"].find({}, {"_id": 0}))
-    tv_data = list(db["tv"].find({}, {"_id": 0}))
+    # Split shows are exported with their episodes, the backup looks the same for both layouts.
+    tv_data = []
+    for tv in db["tv"].find({}):
+        tv = hydrate_tv(db, tv)
+        tv.pop("_id", None)
+        tv.pop("episodes_split", None)
+        tv_data.append(tv)
 
     return {"movie": movie_data, "tv": tv_data}
 
@@ -35,18 +43,18 @@ async def download_collections(client: Client, message: Message):
 
     # Flood kontrolü
     if user_id in last_command_time and now - last_command_time[user_id] < flood_wait:
-        await message.reply_text(f"⚠️ Lütfen {flood_wait} saniye bekleyin.", quote=True)
+        await tg_call(client, message.reply_text, f"⚠️ Lütfen {flood_wait} saniye bekleyin.", quote=True)
         return
     last_command_time[user_id] = now
 
     try:
         if not db_urls or len(db_urls) < 2:
-            await message.reply_text("⚠️ İkinci veritabanı bulunamadı.")
+            await tg_call(client, message.reply_text, "⚠️ İkinci veritabanı bulunamadı.")
             return
 
         combined_data = export_collections_to_json(db_urls[1])
         if combined_data is None:
-            await message.reply_text("⚠️ Koleksiyonlar boş veya bulunamadı.")
+            await tg_call(client, message.reply_text, "⚠️ Koleksiyonlar boş veya bulunamadı.")
             return
 
         file_path = "/tmp/dizi_ve_film_veritabanı.json"
@@ -54,12 +62,12 @@ async def download_collections(client: Client, message: Message):
         with open(file_path, "w", encoding="utf-8") as f:
             json.dump(combined_data, f, ensure_ascii=False, indent=2, default=str)
 
-        await client.send_document(
+        await tg_call(client, client.send_document,
             chat_id=message.chat.id,
             document=file_path,
             caption="📁 Film ve Dizi Koleksiyonları"
         )
 
     except Exception as e:
-        await message.reply_text(f"⚠️ Hata: {e}")
+        await tg_call(client, message.reply_text, f"⚠️ Hata: {e}")
         print("vindir hata:", e)
@@ -1,6 +1,9 @@
 from pyrogram import Client, filters
 from pyrogram.types import Message
+from Backend import db as media_db
 from Backend.helper.custom_filter import CustomFilters
+from Backend.helper.episode_store import delete_tv, hydrate_tv, save_tv_seasons
+from Backend.helper.rate_limiter import tg_call
 from pymongo import MongoClient
 import os, re
 from time import time
@@ -8,6 +11,8 @@ from time import time
 # ---------------- SADECE ENV'DEN DATABASE AL ----------------
 DATABASE_URLS = os.getenv("DATABASE", "")
 db_urls = [u.strip() for u in DATABASE_URLS.split(",") if u.strip()]
+# db_urls[1] is the first storage DB, storage_1 in the document counters.
+STORAGE_INDEX = 1
 
 
 # ------------------------------------------------------------------
@@ -42,10 +47,25 @@ def extract_id(raw):
 # ------------------------------------------------------------------
 
 def process_delete(db, id_type, val, imdb_fallback=None, test=False,
-                   category="all", season=None, episodes=None):
+                   category="all", season=None, episodes=None, removed_ids=None, removed_docs=None):
 
     deleted = []
 
+    def remove(collection_name, doc):
+        if collection_name == "movie":
+            db["movie"].delete_one({"_id": doc["_id"]})
+        else:
+            delete_tv(db, doc)
+        # Deleted titles are taken off the document counters by the caller.
+        if removed_docs is not None:
+            removed_docs.append((collection_name, doc))
+
+    def drop(t):
+        deleted.append(t.get("name"))
+        # Telegram ids of removed files, so the received file index can forget them.
+        if removed_ids is not None and not test and t.get("id"):
+            removed_ids.append(t["id"])
+
     def allow(cat):
         return category == "all" or category == cat
 
@@ -53,18 +73,18 @@ def process_delete(db, id_type, val, imdb_fallback=None, test=False,
     if id_type == "tmdb":
         tmdb_id = int(val)
         movie_docs = list(db["movie"].find({"tmdb_id": tmdb_id})) if allow("movie") else []
-        tv_docs = list(db["tv"].find({"tmdb_id": tmdb_id})) if allow("tv") else []
+        tv_docs = [hydrate_tv(db, doc) for doc in db["tv"].find({"tmdb_id": tmdb_id})] if allow("tv") else []
 
         if not movie_docs and not tv_docs and imdb_fallback:
             return process_delete(db, "imdb", imdb_fallback, None,
-                                  test, category, season, episodes)
+                                  test, category, season, episodes, removed_ids, removed_docs)
 
         # MOVIE
         for doc in movie_docs:
             for t in doc.get("telegram", []):
-                deleted.append(t.get("name"))
+                drop(t)
             if not test:
-                db["movie"].delete_one({"_id": doc["_id"]})
+                remove("movie", doc)
 
         # TV
         for doc in tv_docs:
@@ -76,12 +96,12 @@ def process_delete(db, id_type, val, imdb_fallback=None, test=False,
                             if episodes:
                                 if ep.get("episode_number") in episodes:
                                     for t in ep.get("telegram", []):
-                                        deleted.append(t.get("name"))
+                                        drop(t)
                                     if not test:
                                         s["episodes"].remove(ep)
                             else:
                                 for t in ep.get("telegram", []):
-                                    deleted.append(t.get("name"))
+                                    drop(t)
                                 if not test:
                                     remove_eps.append(ep)
 
@@ -91,18 +111,18 @@ def process_delete(db, id_type, val, imdb_fallback=None, test=False,
                 if not test:
                     doc_seasons = [s for s in doc.get("seasons", []) if s.get("episodes")]
                     if not doc_seasons:
-                        db["tv"].delete_one({"_id": doc["_id"]})
+                        remove("tv", doc)
                     else:
                         doc["seasons"] = doc_seasons
-                        db["tv"].replace_one({"_id": doc["_id"]}, doc)
+                        save_tv_seasons(db, doc)
 
             else:
                 for s in doc.get("seasons", []):
                     for e in s.get("episodes", []):
                         for t in e.get("telegram", []):
-                            deleted.append(t.get("name"))
+                            drop(t)
                 if not test:
-                    db["tv"].delete_one({"_id": doc["_id"]})
+                    remove("tv", doc)
 
         return deleted
 
@@ -111,21 +131,21 @@ def process_delete(db, id_type, val, imdb_fallback=None, test=False,
         imdb_id = val
 
         movie_docs = list(db["movie"].find({"imdb_id": imdb_id})) if allow("movie") else []
-        tv_docs = list(db["tv"].find({"imdb_id": imdb_id})) if allow("tv") else []
+        tv_docs = [hydrate_tv(db, doc) for doc in db["tv"].find({"imdb_id": imdb_id})] if allow("tv") else []
 
         for doc in movie_docs:
             for t in doc.get("telegram", []):
-                deleted.append(t.get("name"))
+                drop(t)
             if not test:
-                db["movie"].delete_one({"_id": doc["_id"]})
+                remove("movie", doc)
 
         for doc in tv_docs:
             for s in doc.get("seasons", []):
                 for e in s.get("episodes", []):
                     for t in e.get("telegram", []):
-                        deleted.append(t.get("name"))
+                        drop(t)
             if not test:
-                db["tv"].delete_one({"_id": doc["_id"]})
+                remove("tv", doc)
 
         return deleted
 
@@ -136,17 +156,18 @@ def process_delete(db, id_type, val, imdb_fallback=None, test=False,
         for doc in list(db["movie"].find({})):
             old = doc.get("telegram", [])
             new = [t for t in old if t.get("id") != target and t.get("name") != target]
-            removed = [t.get("name") for t in old if t not in new]
-            deleted.extend(removed)
+            removed = [t for t in old if t not in new]
+            for t in removed:
+                drop(t)
             if removed and not test:
                 if not new:
-                    db["movie"].delete_one({"_id": doc["_id"]})
+                    remove("movie", doc)
                 else:
                     doc["telegram"] = new
                     db["movie"].replace_one({"_id": doc["_id"]}, doc)
 
     if allow("tv"):
-        for doc in list(db["tv"].find({})):
+        for doc in [hydrate_tv(db, doc) for doc in db["tv"].find({})]:
             changed = False
             remove_seasons = []
 
@@ -159,7 +180,7 @@ def process_delete(db, id_type, val, imdb_fallback=None, test=False,
                     if episodes and ep.get("episode_number") not in episodes:
                         continue
                     for t in ep.get("telegram", []):
-                        deleted.append(t.get("name"))
+                        drop(t)
                     if not test:
                         remove_eps.append(ep)
                         changed = True
@@ -175,20 +196,25 @@ def process_delete(db, id_type, val, imdb_fallback=None, test=False,
 
             if changed and not test:
                 if not doc["seasons"]:
-                    db["tv"].delete_one({"_id": doc["_id"]})
+                    remove("tv", doc)
                 else:
-                    db["tv"].replace_one({"_id": doc["_id"]}, doc)
+                    save_tv_seasons(db, doc)
 
     return deleted
 
 
+async def uncount(removed_docs):
+    for collection_name, doc in removed_docs:
+        await media_db.adjust_counters(collection_name, doc, STORAGE_INDEX, -1)
+
+
 # ------------------------------------------------------------------
 #  FORMATTED OUTPUT
 # ------------------------------------------------------------------
 
-async def send_output(message, data, prefix, is_tv=False, is_test=False):
+async def send_output(client, message, data, prefix, is_tv=False, is_test=False):
     if not data:
-        return await message.reply_text("⚠️ Dosya bulunamadı.")
+        return await tg_call(client, message.reply_text, "⚠️ Dosya bulunamadı.")
 
     title = "Silinecek Diziler:" if (is_tv and is_test) else \
             "Silinen Diziler:" if is_tv else \
@@ -201,9 +227,9 @@ async def send_output(message, data, prefix, is_tv=False, is_test=False):
         path = f"/tmp/{prefix}_{int(time())}.txt"
         with open(path, "w", encoding="utf-8") as f:
             f.write(text)
-        await message.reply_document(path, caption=f"{len(data)} dosya listelendi.")
+        await tg_call(client, message.reply_document, path, caption=f"{len(data)} dosya listelendi.")
     else:
-        await message.reply_text(text)
+        await tg_call(client, message.reply_text, text)
 
 
 # ------------------------------------------------------------------
@@ -213,7 +239,7 @@ async def send_output(message, data, prefix, is_tv=False, is_test=False):
 @Client.on_message(filters.command("dizisil") & filters.private & CustomFilters.owner)
 async def dizisil(client, message):
     if len(message.command) < 2:
-        return await message.reply_text("Kullanım:\n/dizisil id\n/dizisil id s3\n/dizisil id s3e5e6")
+        return await tg_call(client, message.reply_text, "Kullanım:\n/dizisil id\n/dizisil id s3\n/dizisil id s3e5e6")
 
     mongo = MongoClient(db_urls[1])
     db = mongo[mongo.list_database_names()[0]]
@@ -232,10 +258,14 @@ async def dizisil(client, message):
             if eps_raw:
                 episodes = [int(x[1:]) for x in re.findall(r"e\d+", eps_raw)]
 
-    data = process_delete(db, idt, val, fb, test=False,
-                          category="tv", season=season, episodes=episodes)
+    removed_ids = []
+    removed_docs = []
+    data = process_delete(db, idt, val, fb, test=False, category="tv", season=season,
+                          episodes=episodes, removed_ids=removed_ids, removed_docs=removed_docs)
+    await media_db.forget_files(removed_ids)
+    await uncount(removed_docs)
 
-    await send_output(message, data, "dizisil", is_tv=True, is_test=False)
+    await send_output(client, message, data, "dizisil", is_tv=True, is_test=False)
 
 
 # ------------------------------------------------------------------
@@ -245,7 +275,7 @@ async def dizisil(client, message):
 @Client.on_message(filters.command("dizisiltest") & filters.private & CustomFilters.owner)
 async def dizisiltest(client, message):
     if len(message.command) < 2:
-        return await message.reply_text("Kullanım:\n/dizisiltest id\n/dizisiltest id s3\n/dizisiltest id s3e5e6")
+        return await tg_call(client, message.reply_text, "Kullanım:\n/dizisiltest id\n/dizisiltest id s3\n/dizisiltest id s3e5e6")
 
     mongo = MongoClient(db_urls[1])
     db = mongo[mongo.list_database_names()[0]]
@@ -267,7 +297,7 @@ async def dizisiltest(client, message):
     data = process_delete(db, idt, val, fb, test=True,
                           category="tv", season=season, episodes=episodes)
 
-    await send_output(message, data, "dizisiltest", is_tv=True, is_test=True)
+    await send_output(client, message, data, "dizisiltest", is_tv=True, is_test=True)
 
 
 # ------------------------------------------------------------------
@@ -277,16 +307,21 @@ async def dizisiltest(client, message):
 @Client.on_message(filters.command("filmsil") & filters.private & CustomFilters.owner)
 async def filmsil(client, message):
     if len(message.command) < 2:
-        return await message.reply_text("Kullanım: /filmsil id")
+        return await tg_call(client, message.reply_text, "Kullanım: /filmsil id")
 
     mongo = MongoClient(db_urls[1])
     db = mongo[mongo.list_database_names()[0]]
 
     idt, val, fb = extract_id(message.command[1])
 
-    data = process_delete(db, idt, val, fb, test=False, category="movie")
+    removed_ids = []
+    removed_docs = []
+    data = process_delete(db, idt, val, fb, test=False, category="movie",
+                          removed_ids=removed_ids, removed_docs=removed_docs)
+    await media_db.forget_files(removed_ids)
+    await uncount(removed_docs)
 
-    await send_output(message, data, "filmsil", is_tv=False, is_test=False)
+    await send_output(client, message, data, "filmsil", is_tv=False, is_test=False)
 
 
 # ------------------------------------------------------------------
@@ -296,7 +331,7 @@ async def filmsil(client, message):
 @Client.on_message(filters.command("filmsiltest") & filters.private & CustomFilters.owner)
 async def filmsiltest(client, message):
     if len(message.command) < 2:
-        return await message.reply_text("Kullanım: /filmsiltest id")
+        return await tg_call(client, message.reply_text, "Kullanım: /filmsiltest id")
 
     mongo = MongoClient(db_urls[1])
     db = mongo[mongo.list_database_names()[0]]
@@ -305,4 +340,4 @@ async def filmsiltest(client, message):
 
     data = process_delete(db, idt, val, fb, test=True, category="movie")
 
-    await send_output(message, data, "filmsiltest", is_tv=False, is_test=True)
+    await send_output(client, message, data, "filmsiltest", is_tv=False, is_test=True)